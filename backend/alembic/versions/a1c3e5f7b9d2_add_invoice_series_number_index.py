@@ -0,0 +1,27 @@
+"""Add descending (invoice_series, invoice_number) index for next-number lookups.
+
+Revision ID: a1c3e5f7b9d2
+Revises: a4c6e8f0b2d4
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b9d2'
+down_revision = 'a4c6e8f0b2d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_invoice_series_number_desc',
+        'invoices',
+        ['invoice_series', sa.text('invoice_number DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_invoice_series_number_desc', table_name='invoices')
@@ -0,0 +1,27 @@
+"""Add covering index for the per-user audit summary.
+
+Revision ID: a2d4f6b8c0e3
+Revises: f0b2d4e6a8c1
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a2d4f6b8c0e3'
+down_revision = 'f0b2d4e6a8c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_audit_summary',
+        'audit_logs',
+        ['user_id', 'timestamp', 'success'],
+        postgresql_include=['user_email', 'user_role'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_audit_summary', table_name='audit_logs')
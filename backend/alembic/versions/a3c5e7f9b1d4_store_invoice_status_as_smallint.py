@@ -0,0 +1,64 @@
+"""Store invoices.status as a SMALLINT code instead of the invoice_status enum.
+
+Revision ID: a3c5e7f9b1d4
+Revises: f2b4d6e8a0c3
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'a3c5e7f9b1d4'
+down_revision = 'f2b4d6e8a0c3'
+branch_labels = None
+depends_on = None
+
+# Debe coincidir con INVOICE_STATUS_CODES en app/models/invoice.py
+STATUS_CODES = {'draft': 0, 'issued': 1, 'cancelled': 2, 'paid': 3}
+
+
+def upgrade() -> None:
+    # El predicado del índice parcial compara contra el tipo anterior
+    op.drop_index('idx_invoice_overdue', table_name='invoices')
+    op.alter_column('invoices', 'status', server_default=None)
+
+    cases = ' '.join(f"WHEN '{name}' THEN {code}" for name, code in STATUS_CODES.items())
+    op.alter_column(
+        'invoices',
+        'status',
+        type_=sa.SmallInteger(),
+        existing_nullable=False,
+        postgresql_using=f'(CASE status::text {cases} END)::smallint',
+    )
+    op.execute("DROP TYPE IF EXISTS invoice_status")
+
+    op.create_index(
+        'idx_invoice_overdue',
+        'invoices',
+        ['due_date'],
+        postgresql_where=sa.text("status = 1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_invoice_overdue', table_name='invoices')
+
+    invoice_status = postgresql.ENUM(*STATUS_CODES, name='invoice_status')
+    invoice_status.create(op.get_bind(), checkfirst=True)
+    cases = ' '.join(f"WHEN {code} THEN '{name}'" for name, code in STATUS_CODES.items())
+    op.alter_column(
+        'invoices',
+        'status',
+        type_=invoice_status,
+        existing_nullable=False,
+        postgresql_using=f'(CASE status {cases} END)::invoice_status',
+    )
+
+    op.create_index(
+        'idx_invoice_overdue',
+        'invoices',
+        ['due_date'],
+        postgresql_where=sa.text("status = 'issued'"),
+    )
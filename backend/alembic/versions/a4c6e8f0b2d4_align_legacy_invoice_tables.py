@@ -0,0 +1,301 @@
+"""Align legacy phase1 invoice tables with the canonical SQLAlchemy models.
+
+Revision ID: a4c6e8f0b2d4
+Revises: 01884bd090e7
+Create Date: 2026-10-16
+
+La migración phase1 es la única que crea las tablas de facturas y lo hace con un
+diseño anterior (issue_date, número de factura de texto, invoice_line_items,
+estados que el modelo ya no tiene, ...). Esta revisión va justo después de
+01884bd090e7 para que las migraciones de la serie siguiente (índice por serie,
+NUMERIC, BIGINT, estado SMALLINT, ...) encuentren las columnas del modelo.
+
+No se borra nada: las columnas y tablas anteriores se conservan (solo dejan de ser
+obligatorias), el número de texto queda en legacy_invoice_number y los estados
+que el modelo no tiene quedan en legacy_status, así que downgrade() los restaura.
+Las columnas de dinero se crean como FLOAT; e5a7c9d1f3b6 las pasa a NUMERIC.
+En modo --sql no se puede inspeccionar la base: se emite la alineación completa,
+ya que toda base en 01884bd090e7 viene de phase1.
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'a4c6e8f0b2d4'
+down_revision = '01884bd090e7'
+branch_labels = None
+depends_on = None
+
+invoice_type = postgresql.ENUM('factura', 'nota_credito', 'nota_debito', name='invoice_type')
+invoice_payment_status = postgresql.ENUM('pending', 'partial', 'completed', name='invoice_payment_status')
+
+LEGACY_STATUSES = (
+    'draft', 'issued', 'sent', 'viewed', 'pending', 'partially_paid',
+    'paid', 'overdue', 'cancelled', 'refunded',
+)
+# Estados del diseño anterior que el modelo no tiene (a3c5e7f9b1d4 solo convierte los cuatro suyos)
+LEGACY_STATUS_MAP = {
+    'sent': 'issued',
+    'viewed': 'issued',
+    'pending': 'issued',
+    'partially_paid': 'issued',
+    'overdue': 'issued',
+    'refunded': 'cancelled',
+}
+
+INVOICE_COLUMNS = [
+    sa.Column('invoice_type', invoice_type, nullable=False, server_default='factura'),
+    sa.Column('control_number', sa.String(20), nullable=True),
+    sa.Column('invoice_series', sa.String(10), nullable=False, server_default='A'),
+    sa.Column('client_name', sa.String(255), nullable=True),
+    sa.Column('client_rif', sa.String(50), nullable=True),
+    sa.Column('client_email', sa.String(255), nullable=True),
+    sa.Column('client_phone', sa.String(50), nullable=True),
+    sa.Column('currency', sa.String(3), nullable=False, server_default='VES'),
+    sa.Column('exchange_rate', sa.Float(), nullable=False, server_default='1.0'),
+    sa.Column('taxable_amount', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('tax_percentage', sa.Float(), nullable=False, server_default='16.0'),
+    sa.Column('iva_retention_percentage', sa.Float(), nullable=False, server_default='0.0'),
+    sa.Column('iva_retention_amount', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('islr_retention_percentage', sa.Float(), nullable=False, server_default='0.0'),
+    sa.Column('islr_retention_amount', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('payment_status', invoice_payment_status, nullable=False, server_default='pending'),
+    sa.Column('internal_reference', sa.String(50), nullable=True),
+    sa.Column('invoice_date', sa.Date(), nullable=True),
+    sa.Column('issued_at', sa.DateTime(), nullable=True),
+    sa.Column('legacy_invoice_number', sa.String(50), nullable=True),
+    sa.Column('legacy_status', sa.String(20), nullable=True),
+]
+PAYMENT_COLUMNS = [
+    sa.Column('amount', sa.Float(), nullable=True),
+    sa.Column('exchange_rate', sa.Float(), nullable=False, server_default='1.0'),
+    sa.Column('payment_reference', sa.String(100), nullable=True),
+]
+CONTROL_NUMBER_COLUMNS = [
+    sa.Column('is_used', sa.Boolean(), nullable=False, server_default='false'),
+    sa.Column('used_at', sa.DateTime(), nullable=True),
+    sa.Column('generated_at', sa.DateTime(), nullable=True),
+]
+
+# Columnas del diseño anterior que el modelo no escribe: dejan de ser obligatorias
+LEGACY_REQUIRED = {
+    'invoices': ['issue_date', 'due_date', 'guest_id'],
+    'invoice_payments': ['amount_paid'],
+    'invoice_control_numbers': ['series', 'random_digits', 'check_digit'],
+}
+
+
+def _has_legacy_design() -> bool:
+    if context.is_offline_mode():
+        return True
+    inspector = sa.inspect(op.get_bind())
+    return 'issue_date' in {column['name'] for column in inspector.get_columns('invoices')}
+
+
+def _existing_columns(table: str) -> set:
+    if context.is_offline_mode():
+        return set()
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _add_missing(table: str, columns: list) -> None:
+    existing = _existing_columns(table)
+    for column in columns:
+        if column.name not in existing:
+            op.add_column(table, column.copy())
+
+
+def _restored_status() -> str:
+    """Expresión que devuelve el estado anterior si la factura no cambió desde la migración."""
+    cases = ' '.join(
+        f"WHEN legacy_status = '{legacy}' AND status::text = '{current}' THEN legacy_status"
+        for legacy, current in LEGACY_STATUS_MAP.items()
+    )
+    return f"CASE {cases} ELSE status::text END"
+
+
+def upgrade() -> None:
+    if not _has_legacy_design():
+        return
+
+    bind = op.get_bind()
+    checkfirst = not context.is_offline_mode()
+    invoice_type.create(bind, checkfirst=checkfirst)
+    invoice_payment_status.create(bind, checkfirst=checkfirst)
+
+    _add_missing('invoices', INVOICE_COLUMNS)
+
+    # Se compara el estado anterior antes de tocarlo: status sigue siendo invoice_status
+    op.execute(
+        """
+        UPDATE invoices SET
+            control_number = COALESCE(control_number, 'L' || lpad(id::text, 9, '0')),
+            client_name = COALESCE(
+                client_name,
+                (SELECT full_name FROM guests WHERE guests.id = invoices.guest_id),
+                ''
+            ),
+            taxable_amount = subtotal,
+            legacy_invoice_number = invoice_number,
+            internal_reference = COALESCE(internal_reference, left(invoice_number, 50)),
+            invoice_date = COALESCE(invoice_date, issue_date::date),
+            issued_at = CASE WHEN status::text = 'draft' THEN issued_at ELSE COALESCE(issued_at, issue_date) END,
+            payment_status = CASE status::text
+                WHEN 'paid' THEN 'completed'::invoice_payment_status
+                WHEN 'partially_paid' THEN 'partial'::invoice_payment_status
+                ELSE payment_status
+            END
+        """
+    )
+    for legacy, current in LEGACY_STATUS_MAP.items():
+        op.execute(
+            f"UPDATE invoices SET legacy_status = status::text, status = '{current}' "
+            f"WHERE status = '{legacy}'"
+        )
+
+    op.alter_column('invoices', 'control_number', existing_type=sa.String(20), nullable=False)
+    op.alter_column('invoices', 'client_name', existing_type=sa.String(255), nullable=False)
+    op.alter_column('invoices', 'invoice_date', existing_type=sa.Date(), nullable=False)
+    op.create_index('ix_invoices_control_number', 'invoices', ['control_number'], unique=True)
+    op.drop_index('idx_invoice_status_date', table_name='invoices')
+    op.create_index('idx_invoice_status_date', 'invoices', ['status', 'invoice_date'])
+
+    # El número pasa a ser numérico y único por serie (b8d0f2a4c6e9 lo lleva a BIGINT)
+    op.drop_index('idx_invoice_invoice_number', table_name='invoices')
+    op.drop_constraint('invoices_invoice_number_key', 'invoices', type_='unique')
+    op.alter_column(
+        'invoices',
+        'invoice_number',
+        type_=sa.Integer(),
+        existing_type=sa.String(50),
+        existing_nullable=False,
+        postgresql_using='id',
+    )
+
+    # Líneas: se copian a invoice_lines; invoice_line_items se conserva
+    op.create_table(
+        'invoice_lines',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('invoice_id', sa.Integer(), nullable=False),
+        sa.Column('description', sa.String(255), nullable=False),
+        sa.Column('code', sa.String(50), nullable=True),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('unit_price', sa.Float(), nullable=False),
+        sa.Column('line_total', sa.Float(), nullable=False),
+        sa.Column('is_taxable', sa.Boolean(), nullable=False, server_default='true'),
+        sa.Column('tax_percentage', sa.Float(), nullable=False, server_default='16.0'),
+        sa.Column('tax_amount', sa.Float(), nullable=False),
+        sa.Column('line_order', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_invoice_lines_invoice_id', 'invoice_lines', ['invoice_id'])
+    op.execute(
+        """
+        INSERT INTO invoice_lines (
+            invoice_id, description, code, quantity, unit_price, line_total,
+            is_taxable, tax_percentage, tax_amount, line_order, created_at
+        )
+        SELECT
+            invoice_id, left(description, 255), NULL, quantity, unit_price, total_price,
+            item_type <> 'tax', 0.0, 0.0,
+            row_number() OVER (PARTITION BY invoice_id ORDER BY id) - 1, created_at
+        FROM invoice_line_items
+        """
+    )
+
+    # Pagos y números de control: columnas nuevas junto a las anteriores
+    _add_missing('invoice_payments', PAYMENT_COLUMNS)
+    op.execute(
+        """
+        UPDATE invoice_payments SET
+            amount = COALESCE(amount, amount_paid),
+            payment_reference = COALESCE(payment_reference, left(transaction_id, 100))
+        """
+    )
+    op.alter_column('invoice_payments', 'amount', existing_type=sa.Float(), nullable=False)
+
+    _add_missing('invoice_control_numbers', CONTROL_NUMBER_COLUMNS)
+    op.execute(
+        """
+        UPDATE invoice_control_numbers SET
+            is_used = (status = 'used' OR invoice_id IS NOT NULL),
+            used_at = COALESCE(used_at, assigned_at),
+            generated_at = COALESCE(generated_at, created_at)
+        """
+    )
+
+    for table, columns in LEGACY_REQUIRED.items():
+        for column in columns:
+            op.alter_column(table, column, nullable=True)
+
+
+def downgrade() -> None:
+    if not _has_legacy_design():
+        return
+
+    # Las filas creadas con el modelo actual no tienen los campos del diseño anterior
+    op.execute("UPDATE invoices SET issue_date = COALESCE(issue_date, invoice_date::timestamp)")
+    op.execute("UPDATE invoices SET due_date = COALESCE(due_date, issue_date)")
+    op.execute("UPDATE invoice_payments SET amount_paid = COALESCE(amount_paid, amount)")
+    op.execute(
+        """
+        UPDATE invoice_control_numbers SET
+            series = COALESCE(series, left(control_number, 1)),
+            random_digits = COALESCE(random_digits, substr(control_number, 2, 8)),
+            check_digit = COALESCE(check_digit, 0)
+        """
+    )
+    for table, columns in LEGACY_REQUIRED.items():
+        for column in columns:
+            if (table, column) != ('invoices', 'guest_id'):
+                op.alter_column(table, column, nullable=False)
+
+    # d4f6b8c0e2a5 borra el saldo al bajar; el diseño anterior lo exige
+    if 'remaining_balance' not in _existing_columns('invoices'):
+        op.add_column('invoices', sa.Column('remaining_balance', sa.Float(), nullable=True))
+        op.execute("UPDATE invoices SET remaining_balance = total - paid_amount")
+        op.alter_column('invoices', 'remaining_balance', existing_type=sa.Float(), nullable=False)
+
+    # Estado: se vuelve al tipo de diez valores con los estados guardados
+    op.drop_index('idx_invoice_status_date', table_name='invoices')
+    op.alter_column('invoices', 'status', server_default=None)
+    op.alter_column('invoices', 'status', type_=sa.Text(), postgresql_using=_restored_status())
+    op.execute("DROP TYPE IF EXISTS invoice_status")
+    legacy_status_type = postgresql.ENUM(*LEGACY_STATUSES, name='invoice_status')
+    legacy_status_type.create(op.get_bind(), checkfirst=False)
+    op.alter_column(
+        'invoices',
+        'status',
+        type_=legacy_status_type,
+        postgresql_using='status::invoice_status',
+        server_default='draft',
+    )
+    op.create_index('idx_invoice_status_date', 'invoices', ['status', 'issue_date'])
+
+    op.drop_index('ix_invoices_control_number', table_name='invoices')
+    op.alter_column(
+        'invoices',
+        'invoice_number',
+        type_=sa.String(50),
+        existing_type=sa.Integer(),
+        existing_nullable=False,
+        postgresql_using="COALESCE(legacy_invoice_number, invoice_number::text)",
+    )
+    op.create_unique_constraint('invoices_invoice_number_key', 'invoices', ['invoice_number'])
+    op.create_index('idx_invoice_invoice_number', 'invoices', ['invoice_number'])
+
+    op.drop_index('ix_invoice_lines_invoice_id', table_name='invoice_lines')
+    op.drop_table('invoice_lines')
+
+    for column in CONTROL_NUMBER_COLUMNS:
+        op.drop_column('invoice_control_numbers', column.name)
+    for column in PAYMENT_COLUMNS:
+        op.drop_column('invoice_payments', column.name)
+    for column in INVOICE_COLUMNS:
+        op.drop_column('invoices', column.name)
+    invoice_payment_status.drop(op.get_bind(), checkfirst=False)
+    invoice_type.drop(op.get_bind(), checkfirst=False)
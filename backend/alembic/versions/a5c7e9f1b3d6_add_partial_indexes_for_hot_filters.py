@@ -0,0 +1,51 @@
+"""Add partial indexes for active devices, pending payments and open occupancies.
+
+Revision ID: a5c7e9f1b3d6
+Revises: f4b6d8e0a2c5
+Create Date: 2026-10-16
+
+Cada índice guarda solo el subconjunto que filtran las consultas frecuentes:
+- ix_open_occupancies: ocupaciones sin check-out por habitación (conflicto de
+  check-in y "¿está ocupada?" en routers/occupancy.py), sin recorrer el histórico.
+- ix_payments_pending: pagos pendientes ordenados por fecha (cola de cobro).
+- ix_active_devices: dispositivos de red activos y conectados por IP. Se mantiene
+  ix_nd_active_status, que sirve a los listados que filtran cualquier estado.
+Los predicados repiten literalmente los filtros (check_out IS NULL, status =
+'pending') para que PostgreSQL pueda elegir el índice parcial.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a5c7e9f1b3d6'
+down_revision = 'f4b6d8e0a2c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_active_devices',
+        'network_devices',
+        ['ip_address'],
+        postgresql_where=sa.text("is_active AND connection_status = 'connected'"),
+    )
+    op.create_index(
+        'ix_payments_pending',
+        'payments',
+        ['payment_date'],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        'ix_open_occupancies',
+        'occupancies',
+        ['room_id'],
+        postgresql_where=sa.text('check_out IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_open_occupancies', table_name='occupancies')
+    op.drop_index('ix_payments_pending', table_name='payments')
+    op.drop_index('ix_active_devices', table_name='network_devices')
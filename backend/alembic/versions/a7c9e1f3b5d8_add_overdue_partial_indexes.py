@@ -0,0 +1,35 @@
+"""Add partial indexes backing the overdue maintenance and invoice queries.
+
+Revision ID: a7c9e1f3b5d8
+Revises: f6b8d0e2a4c7
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a7c9e1f3b5d8'
+down_revision = 'f6b8d0e2a4c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_maint_overdue',
+        'maintenances',
+        ['reported_at'],
+        postgresql_where=sa.text("status IN ('pending', 'in_progress')"),
+    )
+    op.create_index(
+        'idx_invoice_overdue',
+        'invoices',
+        ['due_date'],
+        postgresql_where=sa.text("status = 'issued'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_invoice_overdue', table_name='invoices')
+    op.drop_index('idx_maint_overdue', table_name='maintenances')
@@ -0,0 +1,53 @@
+"""Add daily revenue and occupancy rollup materialized views.
+
+Revision ID: a9c1e3f5b7d0
+Revises: f8b0d2e4a6c9
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a9c1e3f5b7d0'
+down_revision = 'f8b0d2e4a6c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_daily_revenue AS
+        SELECT
+            date_trunc('day', payment_date)::date AS day,
+            currency::text AS currency,
+            count(*) AS payment_count,
+            sum(amount) AS total_amount,
+            sum(amount_usd) AS total_usd
+        FROM payments
+        WHERE status = 'completed'
+        GROUP BY 1, 2
+        """
+    )
+    # El índice único permite REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("CREATE UNIQUE INDEX ux_mv_daily_revenue ON mv_daily_revenue (day, currency)")
+
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_daily_occupancy AS
+        SELECT
+            date_trunc('day', check_in)::date AS day,
+            count(*) AS check_ins,
+            count(DISTINCT room_id) AS rooms_occupied,
+            sum(amount_paid_bs) AS total_paid_bs,
+            sum(amount_paid_usd) AS total_paid_usd
+        FROM occupancies
+        GROUP BY 1
+        """
+    )
+    op.execute("CREATE UNIQUE INDEX ux_mv_daily_occupancy ON mv_daily_occupancy (day)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_daily_occupancy")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_daily_revenue")
@@ -0,0 +1,39 @@
+"""Consolidate network device and activity indexes.
+
+Revision ID: b0d2f4a6c8e1
+Revises: a9c1e3f5b7d0
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b0d2f4a6c8e1'
+down_revision = 'a9c1e3f5b7d0'
+branch_labels = None
+depends_on = None
+
+DROPPED_DEVICE_INDEXES = ['name', 'brand', 'device_type', 'is_active']
+
+
+def upgrade() -> None:
+    for column in DROPPED_DEVICE_INDEXES:
+        op.drop_index(f'ix_network_devices_{column}', table_name='network_devices', if_exists=True)
+    op.create_index('ix_nd_active_status', 'network_devices', ['is_active', 'connection_status'])
+
+    op.drop_index('ix_network_activities_guest_id', table_name='network_activities', if_exists=True)
+    op.create_index(
+        'ix_na_guest_timestamp',
+        'network_activities',
+        ['guest_id', sa.text('timestamp DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_na_guest_timestamp', table_name='network_activities')
+    op.create_index('ix_network_activities_guest_id', 'network_activities', ['guest_id'])
+
+    op.drop_index('ix_nd_active_status', table_name='network_devices')
+    for column in DROPPED_DEVICE_INDEXES:
+        op.create_index(f'ix_network_devices_{column}', 'network_devices', [column])
@@ -0,0 +1,28 @@
+"""Add partial index on unused SENIAT control numbers.
+
+Revision ID: b2d4f6a8c0e3
+Revises: a1c3e5f7b9d2
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b2d4f6a8c0e3'
+down_revision = 'a1c3e5f7b9d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_control_numbers_unused',
+        'invoice_control_numbers',
+        ['generated_at'],
+        postgresql_where=sa.text('is_used = false'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_control_numbers_unused', table_name='invoice_control_numbers')
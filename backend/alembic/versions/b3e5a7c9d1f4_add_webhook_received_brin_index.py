@@ -0,0 +1,27 @@
+"""Add a BRIN index on stripe_webhook_events.received_at.
+
+Revision ID: b3e5a7c9d1f4
+Revises: a2d4f6b8c0e3
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b3e5a7c9d1f4'
+down_revision = 'a2d4f6b8c0e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_webhook_received_brin',
+        'stripe_webhook_events',
+        ['received_at'],
+        postgresql_using='brin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_webhook_received_brin', table_name='stripe_webhook_events')
@@ -0,0 +1,54 @@
+"""Use NUMERIC for payment, occupancy and room price columns.
+
+Revision ID: b4d6f8a0c2e5
+Revises: a3c5e7f9b1d4
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b4d6f8a0c2e5'
+down_revision = 'a3c5e7f9b1d4'
+branch_labels = None
+depends_on = None
+
+# (tabla, columna, nullable)
+MONEY_COLUMNS = [
+    ('payments', 'amount', False),
+    ('payments', 'amount_eur', True),
+    ('payments', 'amount_usd', True),
+    ('payments', 'amount_ves', True),
+    ('occupancies', 'amount_paid_bs', True),
+    ('occupancies', 'amount_paid_usd', True),
+    ('rooms', 'price_bs', True),
+    ('reservations', 'price_bs', False),
+    ('room_rates', 'price_bs', False),
+]
+RATE_COLUMNS = [
+    ('payments', 'exchange_rate_eur', True),
+    ('payments', 'exchange_rate_usd', True),
+    ('payments', 'exchange_rate_ves', True),
+]
+
+
+def _alter_columns(columns, column_type, using: str) -> None:
+    for table, column, nullable in columns:
+        op.alter_column(
+            table,
+            column,
+            type_=column_type,
+            existing_nullable=nullable,
+            postgresql_using=f'{column}::{using}',
+        )
+
+
+def upgrade() -> None:
+    _alter_columns(MONEY_COLUMNS, sa.Numeric(14, 2), 'numeric(14,2)')
+    _alter_columns(RATE_COLUMNS, sa.Numeric(18, 8), 'numeric(18,8)')
+
+
+def downgrade() -> None:
+    _alter_columns(RATE_COLUMNS, sa.Float(), 'double precision')
+    _alter_columns(MONEY_COLUMNS, sa.Float(), 'double precision')
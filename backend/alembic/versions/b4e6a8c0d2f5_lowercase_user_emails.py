@@ -0,0 +1,27 @@
+"""Store user emails in lowercase.
+
+Revision ID: b4e6a8c0d2f5
+Revises: a3d5f7b9c1e4
+Create Date: 2026-10-16
+
+Las búsquedas por email comparan contra el valor en minúsculas. Si dos cuentas
+solo difieren en mayúsculas, el UPDATE falla por el índice único y deben
+unificarse a mano antes de migrar.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b4e6a8c0d2f5'
+down_revision = 'a3d5f7b9c1e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+
+
+def downgrade() -> None:
+    # Las mayúsculas originales no se conservan
+    pass
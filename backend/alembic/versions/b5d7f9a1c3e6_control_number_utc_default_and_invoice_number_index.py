@@ -0,0 +1,30 @@
+"""Default control number generated_at on the database and drop the invoice_number index.
+
+Revision ID: b5d7f9a1c3e6
+Revises: f0d2b4c6e8a1
+Create Date: 2026-10-16
+
+generated_at pasa a TIMEZONE('utc', CURRENT_TIMESTAMP) como el resto de timestamps
+(ver e3a5c7d9f1b4). ix_invoices_invoice_number solo existe en bases creadas con
+create_all y sobra: el número se consulta por serie con idx_invoice_series_number_desc.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b5d7f9a1c3e6'
+down_revision = 'f0d2b4c6e8a1'
+branch_labels = None
+depends_on = None
+
+UTC_NOW = "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+def upgrade() -> None:
+    op.execute(f'ALTER TABLE invoice_control_numbers ALTER COLUMN generated_at SET DEFAULT {UTC_NOW}')
+    op.drop_index('ix_invoices_invoice_number', table_name='invoices', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_invoices_invoice_number', 'invoices', ['invoice_number'], if_not_exists=True)
+    op.execute('ALTER TABLE invoice_control_numbers ALTER COLUMN generated_at DROP DEFAULT')
@@ -0,0 +1,59 @@
+"""Store staff role/status and period as VARCHAR with CHECK constraints.
+
+Revision ID: b6d8f0a2c4e7
+Revises: a5c7e9f1b3d6
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b6d8f0a2c4e7'
+down_revision = 'a5c7e9f1b3d6'
+branch_labels = None
+depends_on = None
+
+STAFF_ROLES = ('recepcionista', 'limpieza', 'mantenimiento', 'gerente', 'seguridad')
+STAFF_STATUSES = ('active', 'inactive', 'on_leave', 'terminated')
+PERIODS = ('day', 'week', 'fortnight', 'month')
+
+# (tabla, columna, tipo ENUM anterior, valores, default)
+COLUMNS = [
+    ('staff', 'role', 'staff_role', STAFF_ROLES, None),
+    ('staff', 'status', 'staff_status', STAFF_STATUSES, 'active'),
+    ('reservations', 'period', 'period', PERIODS, None),
+    ('room_rates', 'period', 'period', PERIODS, None),
+]
+ENUM_TYPES = {'staff_role': STAFF_ROLES, 'staff_status': STAFF_STATUSES, 'period': PERIODS}
+
+
+def _in_list(values) -> str:
+    return ", ".join(f"'{value}'" for value in values)
+
+
+def upgrade() -> None:
+    for table, column, type_name, values, default in COLUMNS:
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(32) USING {column}::text")
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'")
+        # Mismo nombre que el tipo: es el que emite el modelo (Enum con native_enum=False)
+        op.create_check_constraint(type_name, table, sa.text(f"{column} IN ({_in_list(values)})"))
+
+    for type_name in ENUM_TYPES:
+        op.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+
+def downgrade() -> None:
+    for type_name, values in ENUM_TYPES.items():
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({_in_list(values)})")
+
+    for table, column, type_name, values, default in COLUMNS:
+        op.drop_constraint(type_name, table, type_='check')
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}")
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'")
@@ -0,0 +1,68 @@
+"""Generate invoice numbers from a PostgreSQL sequence.
+
+Revision ID: b8d0f2a4c6e9
+Revises: a7c9e1f3b5d8
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b8d0f2a4c6e9'
+down_revision = 'a7c9e1f3b5d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'invoices',
+        'invoice_number',
+        type_=sa.BigInteger(),
+        existing_type=sa.Integer(),
+        existing_nullable=False,
+    )
+
+    # La secuencia continúa desde el último número emitido o el configurado
+    op.execute("CREATE SEQUENCE IF NOT EXISTS invoice_number_seq AS BIGINT")
+    op.execute(
+        """
+        SELECT setval(
+            'invoice_number_seq',
+            GREATEST(
+                (SELECT COALESCE(MAX(invoice_number), 0) + 1 FROM invoices),
+                (SELECT COALESCE(MAX(next_invoice_number), 1) FROM invoice_configurations)
+            ),
+            false
+        )
+        """
+    )
+
+    # Un número no puede repetirse dentro de la misma serie
+    op.drop_index('idx_invoice_series_number_desc', table_name='invoices')
+    op.create_index(
+        'idx_invoice_series_number_desc',
+        'invoices',
+        ['invoice_series', sa.text('invoice_number DESC')],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_invoice_series_number_desc', table_name='invoices')
+    op.create_index(
+        'idx_invoice_series_number_desc',
+        'invoices',
+        ['invoice_series', sa.text('invoice_number DESC')],
+    )
+
+    op.execute("DROP SEQUENCE IF EXISTS invoice_number_seq")
+
+    op.alter_column(
+        'invoices',
+        'invoice_number',
+        type_=sa.Integer(),
+        existing_type=sa.BigInteger(),
+        existing_nullable=False,
+    )
@@ -0,0 +1,44 @@
+"""Use JSONB with a GIN index for payments.stripe_metadata.
+
+Revision ID: c1e3a5b7d9f2
+Revises: b0d2f4a6c8e1
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c1e3a5b7d9f2'
+down_revision = 'b0d2f4a6c8e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'payments',
+        'stripe_metadata',
+        type_=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='stripe_metadata::jsonb',
+    )
+    op.create_index(
+        'ix_payment_stripe_meta',
+        'payments',
+        ['stripe_metadata'],
+        postgresql_using='gin',
+        postgresql_ops={'stripe_metadata': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payment_stripe_meta', table_name='payments')
+    op.alter_column(
+        'payments',
+        'stripe_metadata',
+        type_=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='stripe_metadata::json',
+    )
@@ -0,0 +1,32 @@
+"""Add (invoice_id, payment_date DESC) index on invoice payments.
+
+Replaces the standalone payment_date index, which the per-invoice
+payment history never uses.
+
+Revision ID: c3e5a7b9d1f4
+Revises: b2d4f6a8c0e3
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c3e5a7b9d1f4'
+down_revision = 'b2d4f6a8c0e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_invoice_payment_invoice_date',
+        'invoice_payments',
+        ['invoice_id', sa.text('payment_date DESC')],
+    )
+    op.drop_index('idx_invoice_payment_date', table_name='invoice_payments', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('idx_invoice_payment_date', 'invoice_payments', ['payment_date'])
+    op.drop_index('idx_invoice_payment_invoice_date', table_name='invoice_payments')
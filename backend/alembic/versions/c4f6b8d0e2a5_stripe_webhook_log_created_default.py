@@ -0,0 +1,24 @@
+"""Default stripe_webhook_logs.created_at on the database side.
+
+Revision ID: c4f6b8d0e2a5
+Revises: b3e5a7c9d1f4
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c4f6b8d0e2a5'
+down_revision = 'b3e5a7c9d1f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE stripe_webhook_logs ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE stripe_webhook_logs ALTER COLUMN created_at DROP DEFAULT")
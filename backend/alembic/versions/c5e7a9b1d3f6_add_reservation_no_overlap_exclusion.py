@@ -0,0 +1,31 @@
+"""Add GiST exclusion constraint against overlapping reservations.
+
+Revision ID: c5e7a9b1d3f6
+Revises: b4d6f8a0c2e5
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c5e7a9b1d3f6'
+down_revision = 'b4d6f8a0c2e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # btree_gist permite combinar room_id (=) con el rango de fechas (&&) en un índice GiST
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        """
+        ALTER TABLE reservations ADD CONSTRAINT res_no_overlap EXCLUDE USING gist (
+            room_id WITH =,
+            daterange(start_date, end_date, '[)') WITH &&
+        ) WHERE (status IN ('pending', 'active'))
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('res_no_overlap', 'reservations', type_='exclude')
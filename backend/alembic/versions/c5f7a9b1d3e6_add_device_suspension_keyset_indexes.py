@@ -0,0 +1,31 @@
+"""Add (flag, id) indexes for paginated suspended-device listings.
+
+Revision ID: c5f7a9b1d3e6
+Revises: b4e6a8c0d2f5
+Create Date: 2026-10-16
+
+Los índices de una sola columna booleana quedan cubiertos por el prefijo de los
+compuestos y se eliminan.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c5f7a9b1d3e6'
+down_revision = 'b4e6a8c0d2f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_devices_suspended_id', 'devices', ['suspended', 'id'])
+    op.create_index('ix_devices_auto_suspended_id', 'devices', ['auto_suspended', 'id'])
+    op.drop_index('ix_devices_suspended', table_name='devices', if_exists=True)
+    op.drop_index('ix_devices_auto_suspended', table_name='devices', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_devices_auto_suspended', 'devices', ['auto_suspended'])
+    op.create_index('ix_devices_suspended', 'devices', ['suspended'])
+    op.drop_index('ix_devices_auto_suspended_id', table_name='devices')
+    op.drop_index('ix_devices_suspended_id', table_name='devices')
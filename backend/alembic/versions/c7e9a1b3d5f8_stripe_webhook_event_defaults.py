@@ -0,0 +1,30 @@
+"""Default stripe_webhook_events timestamps and drop the duplicate event_id index.
+
+Revision ID: c7e9a1b3d5f8
+Revises: b6d8f0a2c4e7
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c7e9a1b3d5f8'
+down_revision = 'b6d8f0a2c4e7'
+branch_labels = None
+depends_on = None
+
+UTC_NOW = "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+TIMESTAMP_COLUMNS = ['received_at', 'created_at', 'updated_at']
+
+
+def upgrade() -> None:
+    for column in TIMESTAMP_COLUMNS:
+        op.execute(f"ALTER TABLE stripe_webhook_events ALTER COLUMN {column} SET DEFAULT {UTC_NOW}")
+    # La restricción UNIQUE de event_id ya crea su índice: este era redundante
+    op.drop_index('idx_webhook_event_id', table_name='stripe_webhook_events', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('idx_webhook_event_id', 'stripe_webhook_events', ['event_id'])
+    for column in TIMESTAMP_COLUMNS:
+        op.execute(f"ALTER TABLE stripe_webhook_events ALTER COLUMN {column} DROP DEFAULT")
@@ -0,0 +1,42 @@
+"""Use BRIN indexes for append-ordered date columns.
+
+Revision ID: c9e1a3b5d7f0
+Revises: b8d0f2a4c6e9
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c9e1a3b5d7f0'
+down_revision = 'b8d0f2a4c6e9'
+branch_labels = None
+depends_on = None
+
+BRIN_INDEXES = [
+    ('idx_invoice_date_brin', 'invoices', 'invoice_date'),
+    ('idx_media_uploaded_at_brin', 'media', 'uploaded_at'),
+    ('idx_maint_reported_at_brin', 'maintenances', 'reported_at'),
+]
+
+
+def upgrade() -> None:
+    op.drop_index('ix_invoices_invoice_date', table_name='invoices', if_exists=True)
+    op.drop_index('ix_media_uploaded_at', table_name='media', if_exists=True)
+
+    for name, table, column in BRIN_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        )
+
+
+def downgrade() -> None:
+    for name, table, _column in BRIN_INDEXES:
+        op.drop_index(name, table_name=table)
+
+    op.create_index('ix_media_uploaded_at', 'media', ['uploaded_at'])
+    op.create_index('ix_invoices_invoice_date', 'invoices', ['invoice_date'])
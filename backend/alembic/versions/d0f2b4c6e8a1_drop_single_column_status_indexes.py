@@ -0,0 +1,25 @@
+"""Drop single-column status indexes on invoices and maintenances.
+
+Revision ID: d0f2b4c6e8a1
+Revises: c9e1a3b5d7f0
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd0f2b4c6e8a1'
+down_revision = 'c9e1a3b5d7f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Pocos valores distintos: las consultas usan los índices parciales/compuestos
+    op.drop_index('ix_invoices_status', table_name='invoices', if_exists=True)
+    op.drop_index('ix_maintenances_status', table_name='maintenances', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_maintenances_status', 'maintenances', ['status'])
+    op.create_index('ix_invoices_status', 'invoices', ['status'])
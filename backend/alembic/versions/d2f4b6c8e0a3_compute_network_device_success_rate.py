@@ -0,0 +1,39 @@
+"""Compute network_devices.success_rate from the operation counters.
+
+Revision ID: d2f4b6c8e0a3
+Revises: c1e3a5b7d9f2
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd2f4b6c8e0a3'
+down_revision = 'c1e3a5b7d9f2'
+branch_labels = None
+depends_on = None
+
+SUCCESS_RATE_EXPRESSION = (
+    "CASE WHEN total_operations = 0 THEN 100.0 "
+    "ELSE 100.0 * (total_operations - failed_operations) / total_operations END"
+)
+
+
+def upgrade() -> None:
+    op.drop_column('network_devices', 'success_rate')
+    op.add_column(
+        'network_devices',
+        sa.Column('success_rate', sa.Float(), sa.Computed(SUCCESS_RATE_EXPRESSION, persisted=True)),
+    )
+    op.create_index('ix_network_devices_success_rate', 'network_devices', ['success_rate'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_network_devices_success_rate', table_name='network_devices')
+    op.drop_column('network_devices', 'success_rate')
+    op.add_column(
+        'network_devices',
+        sa.Column('success_rate', sa.Float(), nullable=False, server_default='100.0'),
+    )
+    op.execute(f"UPDATE network_devices SET success_rate = {SUCCESS_RATE_EXPRESSION}")
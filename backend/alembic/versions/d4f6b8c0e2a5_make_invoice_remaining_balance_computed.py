@@ -0,0 +1,38 @@
+"""Make invoices.remaining_balance a stored generated column.
+
+The balance is computed by the database as total - paid_amount, so
+recording a payment no longer needs to write it back.
+
+Revision ID: d4f6b8c0e2a5
+Revises: c3e5a7b9d1f4
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6b8c0e2a5'
+down_revision = 'c3e5a7b9d1f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # La migración de fase 1 creó remaining_balance como columna normal
+    op.execute("ALTER TABLE invoices DROP COLUMN IF EXISTS remaining_balance")
+    op.add_column(
+        'invoices',
+        sa.Column('remaining_balance', sa.Float(), sa.Computed('total - paid_amount', persisted=True)),
+    )
+    op.create_index(
+        'idx_invoice_outstanding',
+        'invoices',
+        ['remaining_balance'],
+        postgresql_where=sa.text('remaining_balance > 0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_invoice_outstanding', table_name='invoices')
+    op.drop_column('invoices', 'remaining_balance')
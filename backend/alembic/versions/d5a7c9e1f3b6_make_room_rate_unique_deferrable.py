@@ -0,0 +1,31 @@
+"""Make the room_rates (room_id, period) unique constraint deferrable.
+
+Revision ID: d5a7c9e1f3b6
+Revises: c4f6b8d0e2a5
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd5a7c9e1f3b6'
+down_revision = 'c4f6b8d0e2a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Además se alinea el nombre con el del modelo (uq_room_rate_room_period)
+    op.drop_constraint('uq_room_period', 'room_rates', type_='unique')
+    op.create_unique_constraint(
+        'uq_room_rate_room_period',
+        'room_rates',
+        ['room_id', 'period'],
+        deferrable=True,
+        initially='IMMEDIATE',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_room_rate_room_period', 'room_rates', type_='unique')
+    op.create_unique_constraint('uq_room_period', 'room_rates', ['room_id', 'period'])
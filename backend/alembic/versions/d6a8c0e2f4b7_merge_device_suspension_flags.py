@@ -0,0 +1,52 @@
+"""Merge devices.suspended and devices.auto_suspended into suspension_flags.
+
+Revision ID: d6a8c0e2f4b7
+Revises: c5f7a9b1d3e6
+Create Date: 2026-10-16
+
+Bit 0: suspensión manual; bit 1: suspensión automática. Los índices por flag se
+reemplazan por un índice parcial sobre los dispositivos suspendidos.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd6a8c0e2f4b7'
+down_revision = 'c5f7a9b1d3e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'devices',
+        sa.Column('suspension_flags', sa.SmallInteger(), nullable=False, server_default='0'),
+    )
+    op.execute(
+        "UPDATE devices SET suspension_flags = "
+        "CASE WHEN suspended THEN 1 ELSE 0 END + CASE WHEN auto_suspended THEN 2 ELSE 0 END"
+    )
+    op.drop_index('ix_devices_suspended_id', table_name='devices')
+    op.drop_index('ix_devices_auto_suspended_id', table_name='devices')
+    op.drop_column('devices', 'suspended')
+    op.drop_column('devices', 'auto_suspended')
+    op.create_index(
+        'ix_devices_suspended',
+        'devices',
+        ['id'],
+        postgresql_where=sa.text('suspension_flags <> 0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_devices_suspended', table_name='devices')
+    op.add_column('devices', sa.Column('suspended', sa.Boolean(), nullable=False, server_default='false'))
+    op.add_column('devices', sa.Column('auto_suspended', sa.Boolean(), nullable=False, server_default='false'))
+    op.execute(
+        "UPDATE devices SET suspended = (suspension_flags & 1) <> 0, "
+        "auto_suspended = (suspension_flags & 2) <> 0"
+    )
+    op.create_index('ix_devices_suspended_id', 'devices', ['suspended', 'id'])
+    op.create_index('ix_devices_auto_suspended_id', 'devices', ['auto_suspended', 'id'])
+    op.drop_column('devices', 'suspension_flags')
@@ -0,0 +1,32 @@
+"""Add generated total_bytes column to network_activities.
+
+Revision ID: d6f8b0c2e4a7
+Revises: c5e7a9b1d3f6
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd6f8b0c2e4a7'
+down_revision = 'c5e7a9b1d3f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'network_activities',
+        sa.Column(
+            'total_bytes',
+            sa.BigInteger(),
+            sa.Computed('COALESCE(bytes_downloaded, 0) + COALESCE(bytes_uploaded, 0)', persisted=True),
+        ),
+    )
+    op.create_index('ix_network_activities_total_bytes', 'network_activities', ['total_bytes'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_network_activities_total_bytes', table_name='network_activities')
+    op.drop_column('network_activities', 'total_bytes')
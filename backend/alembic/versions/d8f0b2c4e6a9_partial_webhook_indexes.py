@@ -0,0 +1,48 @@
+"""Make the webhook status and retry indexes partial.
+
+Revision ID: d8f0b2c4e6a9
+Revises: c7e9a1b3d5f8
+Create Date: 2026-10-16
+
+- idx_webhook_event_status_timestamp: cola de procesamiento, eventos 'pending'
+  por event_timestamp (los más antiguos primero). La ruta de Stripe los guarda
+  como pendientes y salen del índice cuando se procesan.
+- idx_webhook_retry: el reintento busca eventos 'retry' o 'failed' con
+  next_retry_at vencido, ordenados por next_retry_at. Un fallo sin próximo
+  intento es definitivo y no entra en el índice.
+Los eventos ya procesados (la gran mayoría) no se indexan ni se mantienen al insertar.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd8f0b2c4e6a9'
+down_revision = 'c7e9a1b3d5f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('idx_webhook_event_status_timestamp', table_name='stripe_webhook_events')
+    op.drop_index('idx_webhook_retry', table_name='stripe_webhook_events')
+    op.create_index(
+        'idx_webhook_event_status_timestamp',
+        'stripe_webhook_events',
+        ['event_timestamp'],
+        postgresql_where=sa.text("processing_status = 'pending'"),
+    )
+    op.create_index(
+        'idx_webhook_retry',
+        'stripe_webhook_events',
+        ['next_retry_at'],
+        postgresql_where=sa.text("processing_status IN ('retry', 'failed') AND next_retry_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_webhook_retry', table_name='stripe_webhook_events')
+    op.drop_index('idx_webhook_event_status_timestamp', table_name='stripe_webhook_events')
+    op.create_index('idx_webhook_event_status_timestamp', 'stripe_webhook_events',
+                    ['processing_status', 'event_timestamp'])
+    op.create_index('idx_webhook_retry', 'stripe_webhook_events', ['processing_status', 'next_retry_at'])
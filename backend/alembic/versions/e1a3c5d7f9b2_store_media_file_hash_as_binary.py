@@ -0,0 +1,37 @@
+"""Store media.file_hash as 32-byte binary instead of hex text.
+
+Revision ID: e1a3c5d7f9b2
+Revises: d0f2b4c6e8a1
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e1a3c5d7f9b2'
+down_revision = 'd0f2b4c6e8a1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'media',
+        'file_hash',
+        type_=sa.LargeBinary(32),
+        existing_type=sa.String(64),
+        existing_nullable=True,
+        postgresql_using="decode(file_hash, 'hex')",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'media',
+        'file_hash',
+        type_=sa.String(64),
+        existing_type=sa.LargeBinary(32),
+        existing_nullable=True,
+        postgresql_using="encode(file_hash, 'hex')",
+    )
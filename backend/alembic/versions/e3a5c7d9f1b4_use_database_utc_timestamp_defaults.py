@@ -0,0 +1,49 @@
+"""Use database-side UTC timestamp defaults.
+
+Revision ID: e3a5c7d9f1b4
+Revises: d2f4b6c8e0a3
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e3a5c7d9f1b4'
+down_revision = 'd2f4b6c8e0a3'
+branch_labels = None
+depends_on = None
+
+UTC_NOW = "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+# inventory_items/inventory_transactions no tienen migración propia (se crean con create_all)
+
+TIMESTAMP_COLUMNS = {
+    'audit_logs': ['timestamp'],
+    'exchange_rates': ['created_at'],
+    'exchange_rate_snapshots': ['created_at'],
+    'financial_transactions': ['created_at', 'updated_at'],
+    'invoices': ['created_at', 'updated_at'],
+    'invoice_configurations': ['created_at', 'updated_at'],
+    'invoice_lines': ['created_at'],
+    'invoice_payments': ['created_at'],
+    'network_activities': ['timestamp'],
+    'network_devices': ['created_at', 'updated_at'],
+    'occupancies': ['check_in'],
+    'payments': ['payment_date', 'created_at', 'updated_at'],
+    'staff': ['created_at', 'updated_at'],
+    'users': ['created_at'],
+}
+
+
+def upgrade() -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN "{column}" SET DEFAULT {UTC_NOW}')
+
+
+def downgrade() -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            # staff ya tenía now() como default antes de esta revisión
+            default = "SET DEFAULT now()" if table == 'staff' else "DROP DEFAULT"
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN "{column}" {default}')
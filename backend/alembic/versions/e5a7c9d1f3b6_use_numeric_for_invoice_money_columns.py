@@ -0,0 +1,59 @@
+"""Use NUMERIC(12, 2) for invoice money columns.
+
+Revision ID: e5a7c9d1f3b6
+Revises: d4f6b8c0e2a5
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c9d1f3b6'
+down_revision = 'd4f6b8c0e2a5'
+branch_labels = None
+depends_on = None
+
+MONEY_COLUMNS = {
+    'invoices': [
+        'subtotal', 'taxable_amount', 'tax_amount', 'iva_retention_amount',
+        'islr_retention_amount', 'total', 'paid_amount',
+    ],
+    'invoice_lines': ['unit_price', 'line_total', 'tax_amount'],
+    'invoice_payments': ['amount'],
+}
+
+
+def _alter_money_columns(column_type, using: str) -> None:
+    # remaining_balance depende de total y paid_amount: se elimina y se recrea
+    op.drop_index('idx_invoice_outstanding', table_name='invoices')
+    op.drop_column('invoices', 'remaining_balance')
+
+    for table, columns in MONEY_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=column_type,
+                existing_nullable=False,
+                postgresql_using=f'{column}::{using}',
+            )
+
+    op.add_column(
+        'invoices',
+        sa.Column('remaining_balance', column_type, sa.Computed('total - paid_amount', persisted=True)),
+    )
+    op.create_index(
+        'idx_invoice_outstanding',
+        'invoices',
+        ['remaining_balance'],
+        postgresql_where=sa.text('remaining_balance > 0'),
+    )
+
+
+def upgrade() -> None:
+    _alter_money_columns(sa.Numeric(12, 2), 'numeric(12,2)')
+
+
+def downgrade() -> None:
+    _alter_money_columns(sa.Float(), 'double precision')
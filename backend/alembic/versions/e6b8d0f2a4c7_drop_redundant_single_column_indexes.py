@@ -0,0 +1,33 @@
+"""Drop single-column indexes already covered by composite or unique indexes.
+
+Revision ID: e6b8d0f2a4c7
+Revises: d5a7c9e1f3b6
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e6b8d0f2a4c7'
+down_revision = 'd5a7c9e1f3b6'
+branch_labels = None
+depends_on = None
+
+# (índice, tabla, columna); cada uno es prefijo de otro índice o duplica una restricción UNIQUE
+REDUNDANT_INDEXES = [
+    ('ix_payments_guest_id', 'payments', 'guest_id'),
+    ('idx_payment_stripe_intent', 'payments', 'stripe_payment_intent_id'),
+    ('idx_payment_stripe_charge', 'payments', 'stripe_charge_id'),
+    ('ix_invoice_payments_invoice_id', 'invoice_payments', 'invoice_id'),
+    ('ix_audit_logs_user_id', 'audit_logs', 'user_id'),
+]
+
+
+def upgrade() -> None:
+    for index, table, _column in REDUNDANT_INDEXES:
+        op.drop_index(index, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    for index, table, column in REDUNDANT_INDEXES:
+        op.create_index(index, table, [column])
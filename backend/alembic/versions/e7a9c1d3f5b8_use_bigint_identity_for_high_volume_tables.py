@@ -0,0 +1,65 @@
+"""Use BIGINT identity primary keys on payments, occupancies and network_activities.
+
+Revision ID: e7a9c1d3f5b8
+Revises: d6f8b0c2e4a7
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e7a9c1d3f5b8'
+down_revision = 'd6f8b0c2e4a7'
+branch_labels = None
+depends_on = None
+
+HIGH_VOLUME_TABLES = ['payments', 'occupancies', 'network_activities']
+
+# Columnas FK que apuntan a esas tablas (tabla, columna)
+REFERENCING_COLUMNS = [
+    ('payments', 'occupancy_id'),
+    ('financial_transactions', 'payment_id'),
+    ('media', 'payment_id'),
+]
+
+
+def upgrade() -> None:
+    # Las FK se amplían primero para que admitan los nuevos valores de id
+    for table, column in REFERENCING_COLUMNS:
+        op.alter_column(table, column, type_=sa.BigInteger(), existing_type=sa.Integer())
+
+    for table in HIGH_VOLUME_TABLES:
+        # SERIAL -> IDENTITY: se reemplaza la secuencia propia y se continúa desde max(id)
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
+        op.execute(f"DROP SEQUENCE IF EXISTS {table}_id_seq")
+        op.alter_column(table, 'id', type_=sa.BigInteger(), existing_type=sa.Integer(), existing_nullable=False)
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+        op.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+        )
+
+    op.drop_index('idx_payment_guest_date', table_name='payments')
+    op.create_index(
+        'idx_payment_guest_date',
+        'payments',
+        ['guest_id', 'payment_date'],
+        postgresql_include=['amount', 'currency', 'status'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_payment_guest_date', table_name='payments')
+    op.create_index('idx_payment_guest_date', 'payments', ['guest_id', 'payment_date'])
+
+    for table in HIGH_VOLUME_TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+        op.alter_column(table, 'id', type_=sa.Integer(), existing_type=sa.BigInteger(), existing_nullable=False)
+        op.execute(f"CREATE SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.execute(
+            f"SELECT setval('{table}_id_seq', COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+        )
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+
+    for table, column in REFERENCING_COLUMNS:
+        op.alter_column(table, column, type_=sa.Integer(), existing_type=sa.BigInteger())
@@ -0,0 +1,43 @@
+"""Use JSONB with a GIN index for stripe_webhook_events.payload.
+
+Revision ID: e9a1c3d5f7b0
+Revises: d8f0b2c4e6a9
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'e9a1c3d5f7b0'
+down_revision = 'd8f0b2c4e6a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'stripe_webhook_events',
+        'payload',
+        type_=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using='payload::jsonb',
+    )
+    op.create_index(
+        'idx_webhook_payload_gin',
+        'stripe_webhook_events',
+        ['payload'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_webhook_payload_gin', table_name='stripe_webhook_events')
+    op.alter_column(
+        'stripe_webhook_events',
+        'payload',
+        type_=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using='payload::json',
+    )
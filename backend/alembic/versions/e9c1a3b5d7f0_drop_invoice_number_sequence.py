@@ -0,0 +1,46 @@
+"""Number invoices from the locked configuration row instead of a global sequence.
+
+Revision ID: e9c1a3b5d7f0
+Revises: d6a8c0e2f4b7
+Create Date: 2026-10-16
+
+invoice_number_seq era única para todas las series e ignoraba next_invoice_number.
+El contador de la configuración retoma desde el último número emitido en su serie.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e9c1a3b5d7f0'
+down_revision = 'd6a8c0e2f4b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE invoice_configurations SET next_invoice_number = GREATEST(
+            next_invoice_number,
+            (SELECT COALESCE(MAX(invoice_number), 0) + 1 FROM invoices
+             WHERE invoices.invoice_series = invoice_configurations.invoice_series)
+        )
+        """
+    )
+    op.execute("DROP SEQUENCE IF EXISTS invoice_number_seq")
+
+
+def downgrade() -> None:
+    op.execute("CREATE SEQUENCE IF NOT EXISTS invoice_number_seq AS BIGINT")
+    op.execute(
+        """
+        SELECT setval(
+            'invoice_number_seq',
+            GREATEST(
+                (SELECT COALESCE(MAX(invoice_number), 0) + 1 FROM invoices),
+                (SELECT COALESCE(MAX(next_invoice_number), 1) FROM invoice_configurations)
+            ),
+            false
+        )
+        """
+    )
@@ -0,0 +1,43 @@
+"""Use NUMERIC for salary, maintenance cost and financial transaction amounts.
+
+Revision ID: f0b2d4e6a8c1
+Revises: e9a1c3d5f7b0
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f0b2d4e6a8c1'
+down_revision = 'e9a1c3d5f7b0'
+branch_labels = None
+depends_on = None
+
+# (tabla, columna, nullable)
+MONEY_COLUMNS = [
+    ('staff', 'salary', True),
+    ('maintenances', 'estimated_cost', True),
+    ('maintenances', 'actual_cost', True),
+    ('financial_transactions', 'amount', False),
+    ('financial_transactions', 'amount_ves', False),
+]
+
+
+def _alter_columns(column_type, using: str) -> None:
+    for table, column, nullable in MONEY_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=column_type,
+            existing_nullable=nullable,
+            postgresql_using=f'{column}::{using}',
+        )
+
+
+def upgrade() -> None:
+    _alter_columns(sa.Numeric(14, 2), 'numeric(14,2)')
+
+
+def downgrade() -> None:
+    _alter_columns(sa.Float(), 'double precision')
@@ -0,0 +1,35 @@
+"""Clear email_outbox bodies once delivered and index sent rows for purging.
+
+Revision ID: f0d2b4c6e8a1
+Revises: e9c1a3b5d7f0
+Create Date: 2026-10-16
+
+Los correos de recuperación llevan el enlace con el token en claro: el cuerpo se
+borra al enviar o descartar el correo y las filas enviadas se purgan.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f0d2b4c6e8a1'
+down_revision = 'e9c1a3b5d7f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column('email_outbox', 'text_body', existing_type=sa.Text(), nullable=True)
+    op.execute("UPDATE email_outbox SET text_body = NULL, html_body = NULL WHERE status <> 'pending'")
+    op.create_index(
+        'ix_email_outbox_sent',
+        'email_outbox',
+        ['sent_at'],
+        postgresql_where=sa.text("status = 'sent'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_sent', table_name='email_outbox')
+    op.execute("UPDATE email_outbox SET text_body = '' WHERE text_body IS NULL")
+    op.alter_column('email_outbox', 'text_body', existing_type=sa.Text(), nullable=False)
@@ -0,0 +1,28 @@
+"""Add partial index for users pending approval.
+
+Revision ID: f1c3e5a7b9d2
+Revises: e6b8d0f2a4c7
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f1c3e5a7b9d2'
+down_revision = 'e6b8d0f2a4c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_user_pending',
+        'users',
+        ['id'],
+        postgresql_where=sa.text('NOT approved'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_pending', table_name='users')
@@ -0,0 +1,28 @@
+"""Add partial (room_id, priority) index for open maintenance tasks.
+
+Revision ID: f2b4d6e8a0c3
+Revises: e1a3c5d7f9b2
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f2b4d6e8a0c3'
+down_revision = 'e1a3c5d7f9b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_maint_room_open',
+        'maintenances',
+        ['room_id', 'priority'],
+        postgresql_where=sa.text("status IN ('pending', 'in_progress')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_maint_room_open', table_name='maintenances')
@@ -0,0 +1,134 @@
+"""Partition network_activities by month on timestamp.
+
+Revision ID: f4b6d8e0a2c5
+Revises: e3a5c7d9f1b4
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f4b6d8e0a2c5'
+down_revision = 'e3a5c7d9f1b4'
+branch_labels = None
+depends_on = None
+
+COPY_COLUMNS = (
+    "id, device_id, guest_id, activity_type, timestamp, ip_address, bytes_downloaded, "
+    "bytes_uploaded, session_duration_seconds, initiated_by_system, notes"
+)
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_network_activities_device_id', 'network_activities', ['device_id'])
+    op.create_index('ix_network_activities_timestamp', 'network_activities', ['timestamp'])
+    op.create_index('ix_network_activities_activity_type', 'network_activities', ['activity_type'])
+    op.create_index('ix_network_activities_total_bytes', 'network_activities', ['total_bytes'])
+    op.execute("CREATE INDEX ix_na_guest_timestamp ON network_activities (guest_id, timestamp DESC)")
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE network_activities RENAME TO network_activities_old")
+    op.execute("ALTER INDEX network_activities_pkey RENAME TO network_activities_old_pkey")
+    # Las tablas particionadas no admiten IDENTITY en PostgreSQL 16: se usa una secuencia
+    op.execute("ALTER TABLE network_activities_old ALTER COLUMN id DROP IDENTITY IF EXISTS")
+    for index in ('ix_network_activities_device_id', 'ix_network_activities_timestamp',
+                  'ix_network_activities_activity_type', 'ix_network_activities_total_bytes',
+                  'ix_na_guest_timestamp'):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.execute(
+        """
+        CREATE TABLE network_activities (
+            LIKE network_activities_old INCLUDING DEFAULTS INCLUDING GENERATED
+        ) PARTITION BY RANGE (timestamp)
+        """
+    )
+    op.execute("CREATE SEQUENCE network_activities_id_seq OWNED BY network_activities.id")
+    op.execute("ALTER TABLE network_activities ALTER COLUMN id SET DEFAULT nextval('network_activities_id_seq')")
+    # La clave primaria de una tabla particionada debe incluir la columna de partición
+    op.execute("ALTER TABLE network_activities ADD PRIMARY KEY (id, timestamp)")
+    op.execute(
+        """
+        ALTER TABLE network_activities
+            ADD CONSTRAINT fk_network_activities_device_id_devices
+                FOREIGN KEY (device_id) REFERENCES devices (id) ON DELETE CASCADE,
+            ADD CONSTRAINT fk_network_activities_guest_id_guests
+                FOREIGN KEY (guest_id) REFERENCES guests (id) ON DELETE CASCADE
+        """
+    )
+
+    # Particiones mensuales desde el dato más antiguo hasta tres meses adelante;
+    # la partición DEFAULT recibe filas fuera de rango (p. ej. fechas antiguas cargadas a mano)
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month_start date := date_trunc('month', COALESCE(
+                (SELECT min(timestamp) FROM network_activities_old), now()))::date;
+            last_month date := (date_trunc('month', now()) + interval '3 months')::date;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                EXECUTE 'CREATE TABLE '
+                    || quote_ident('network_activities_' || to_char(month_start, 'YYYY_MM'))
+                    || ' PARTITION OF network_activities FOR VALUES FROM ('
+                    || quote_literal(month_start) || ') TO ('
+                    || quote_literal((month_start + interval '1 month')::date) || ')';
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END
+        $$
+        """
+    )
+    op.execute("CREATE TABLE network_activities_default PARTITION OF network_activities DEFAULT")
+
+    op.execute(
+        f"INSERT INTO network_activities ({COPY_COLUMNS}) "
+        f"SELECT {COPY_COLUMNS} FROM network_activities_old"
+    )
+    op.execute(
+        "SELECT setval('network_activities_id_seq', COALESCE(MAX(id), 0) + 1, false) FROM network_activities"
+    )
+    op.execute("DROP TABLE network_activities_old")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE network_activities RENAME TO network_activities_partitioned")
+    op.execute("ALTER INDEX network_activities_pkey RENAME TO network_activities_partitioned_pkey")
+    op.execute("ALTER SEQUENCE network_activities_id_seq OWNED BY NONE")
+    for index in ('ix_network_activities_device_id', 'ix_network_activities_timestamp',
+                  'ix_network_activities_activity_type', 'ix_network_activities_total_bytes',
+                  'ix_na_guest_timestamp'):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.execute(
+        """
+        CREATE TABLE network_activities (
+            LIKE network_activities_partitioned INCLUDING DEFAULTS INCLUDING GENERATED
+        )
+        """
+    )
+    op.execute("ALTER TABLE network_activities ALTER COLUMN id DROP DEFAULT")
+    op.execute("ALTER TABLE network_activities ADD PRIMARY KEY (id)")
+    op.execute(
+        """
+        ALTER TABLE network_activities
+            ADD CONSTRAINT fk_network_activities_device_id_devices
+                FOREIGN KEY (device_id) REFERENCES devices (id) ON DELETE CASCADE,
+            ADD CONSTRAINT fk_network_activities_guest_id_guests
+                FOREIGN KEY (guest_id) REFERENCES guests (id) ON DELETE CASCADE
+        """
+    )
+    op.execute(
+        f"INSERT INTO network_activities ({COPY_COLUMNS}) "
+        f"SELECT {COPY_COLUMNS} FROM network_activities_partitioned"
+    )
+    op.execute("DROP TABLE network_activities_partitioned CASCADE")
+    op.execute("DROP SEQUENCE IF EXISTS network_activities_id_seq")
+    op.execute("ALTER TABLE network_activities ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('network_activities', 'id'), COALESCE(MAX(id), 0) + 1, false) "
+        "FROM network_activities"
+    )
+    _create_indexes()
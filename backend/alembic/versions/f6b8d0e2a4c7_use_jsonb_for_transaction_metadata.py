@@ -0,0 +1,44 @@
+"""Use JSONB with a GIN index for financial_transactions.transaction_metadata.
+
+Revision ID: f6b8d0e2a4c7
+Revises: e5a7c9d1f3b6
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'f6b8d0e2a4c7'
+down_revision = 'e5a7c9d1f3b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'financial_transactions',
+        'transaction_metadata',
+        type_=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='transaction_metadata::jsonb',
+    )
+    op.create_index(
+        'idx_transaction_metadata_gin',
+        'financial_transactions',
+        ['transaction_metadata'],
+        postgresql_using='gin',
+        postgresql_ops={'transaction_metadata': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transaction_metadata_gin', table_name='financial_transactions')
+    op.alter_column(
+        'financial_transactions',
+        'transaction_metadata',
+        type_=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='transaction_metadata::json',
+    )
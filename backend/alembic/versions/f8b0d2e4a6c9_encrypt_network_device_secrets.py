@@ -0,0 +1,46 @@
+"""Encrypt network device credentials with pgcrypto.
+
+Revision ID: f8b0d2e4a6c9
+Revises: e7a9c1d3f5b8
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f8b0d2e4a6c9'
+down_revision = 'e7a9c1d3f5b8'
+branch_labels = None
+depends_on = None
+
+SECRET_COLUMNS = [('password', 255), ('api_key', 500), ('api_secret', 500)]
+
+# La clave no se escribe en la migración: env.py la fija en la sesión con
+# install_encryption_key (en modo --sql hay que ejecutar antes SET app.encryption_key)
+KEY = "current_setting('app.encryption_key')"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    for column, length in SECRET_COLUMNS:
+        op.alter_column(
+            'network_devices',
+            column,
+            type_=sa.LargeBinary(),
+            existing_type=sa.String(length),
+            existing_nullable=True,
+            postgresql_using=f"pgp_sym_encrypt({column}, {KEY})",
+        )
+
+
+def downgrade() -> None:
+    for column, length in SECRET_COLUMNS:
+        op.alter_column(
+            'network_devices',
+            column,
+            type_=sa.String(length),
+            existing_type=sa.LargeBinary(),
+            existing_nullable=True,
+            postgresql_using=f"pgp_sym_decrypt({column}, {KEY})",
+        )
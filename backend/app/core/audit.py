@@ -3,24 +3,95 @@
 Sistema de auditoría para registrar operaciones críticas.
 Utiliza structlog para logs estructurados y base de datos para consultas por admin.
 """
+import asyncio
 import json
+import queue
 import structlog
 from typing import Any, Optional
 from datetime import datetime
 
+from sqlalchemy import insert
+
 from ..models.user import User
 
 # Logger específico para auditoría
 audit_log = structlog.get_logger("audit")
 
-# Variable global para la sesión de BD (se inyecta desde los endpoints)
-_db_session = None
+# Los registros sin sesión del llamador se encolan y un único escritor los inserta
+# por lotes (un INSERT de múltiples VALUES) fuera del camino del request.
+# SimpleQueue porque log_action también se llama desde el threadpool de las rutas síncronas.
+# La cola vive en memoria: lo que no se haya escrito se pierde si el proceso cae, por eso
+# los eventos de seguridad (logins, aprobaciones, cambios de rol) se guardan con db=.
+AUDIT_FLUSH_INTERVAL_SECONDS = 0.1
+AUDIT_BATCH_SIZE = 500
+AUDIT_BATCH_RETRIES = 1
+
+_pending: "queue.SimpleQueue[dict[str, Any]]" = queue.SimpleQueue()
+_writer_task: Optional[asyncio.Task] = None
+
 
+def _insert_rows(rows: list[dict[str, Any]]) -> None:
+    from ..core.db import SessionLocal
+    from ..models.audit_log import AuditLog
 
-def set_audit_db_session(db):
-    """Establece la sesión de BD para auditoría"""
-    global _db_session
-    _db_session = db
+    with SessionLocal() as session:
+        session.execute(insert(AuditLog), rows)
+        session.commit()
+
+
+def _write_batch(rows: list[dict[str, Any]]) -> None:
+    """
+    Inserta el lote; si falla se reintenta y después se inserta fila por fila,
+    para que un registro inválido o un corte breve de la BD no descarte el resto.
+    """
+    for _ in range(1 + AUDIT_BATCH_RETRIES):
+        try:
+            _insert_rows(rows)
+            return
+        except Exception as e:
+            error = e
+    audit_log.warning("Audit batch insert failed, writing rows one by one", error=str(error), rows=len(rows))
+    for row in rows:
+        try:
+            _insert_rows([row])
+        except Exception as e:
+            # El evento ya quedó en structlog
+            audit_log.error("Failed to save audit log to database", error=str(e), row=row)
+
+
+async def flush_audit_queue() -> None:
+    """Inserta todos los registros encolados, en lotes de AUDIT_BATCH_SIZE."""
+    while not _pending.empty():
+        rows = []
+        while len(rows) < AUDIT_BATCH_SIZE and not _pending.empty():
+            rows.append(_pending.get_nowait())
+        await asyncio.to_thread(_write_batch, rows)
+
+
+async def _audit_writer() -> None:
+    while True:
+        await asyncio.sleep(AUDIT_FLUSH_INTERVAL_SECONDS)
+        await flush_audit_queue()
+
+
+def start_audit_writer() -> None:
+    """Arranca el escritor de auditoría (desde el startup de la app)."""
+    global _writer_task
+    if _writer_task is None:
+        _writer_task = asyncio.create_task(_audit_writer())
+
+
+async def stop_audit_writer() -> None:
+    """Detiene el escritor y guarda lo que quede en cola."""
+    global _writer_task
+    if _writer_task is not None:
+        _writer_task.cancel()
+        try:
+            await _writer_task
+        except asyncio.CancelledError:
+            pass
+        _writer_task = None
+    await flush_audit_queue()
 
 
 def log_action(
@@ -31,6 +102,7 @@ def log_action(
     details: Optional[dict[str, Any]] = None,
     success: bool = True,
     ip_address: Optional[str] = None,
+    db=None,
 ):
     """
     Registra una acción de auditoría en structlog y base de datos.
@@ -43,6 +115,9 @@ def log_action(
         details: Detalles adicionales de la operación
         success: Si la operación fue exitosa
         ip_address: IP del cliente
+        db: Sesión del request. Si se indica, el registro solo se agrega a esa sesión y se
+            guarda con el commit del llamador, en la misma transacción que el cambio auditado.
+            Si no, se encola para el escritor de auditoría (sin escritor activo se escribe en el momento)
     """
     log_data = {
         "action": action,
@@ -69,24 +144,28 @@ def log_action(
 
     # Guardar en base de datos (para consultas por admin)
     try:
-        if _db_session:
+        row = {
+            "timestamp": datetime.utcnow(),
+            "user_id": user.id if user else None,
+            "user_email": user.email if user else None,
+            "user_role": user.role if user else None,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "description": f"{action} on {resource_type}" + (f"/{resource_id}" if resource_id else ""),
+            "details": json.dumps(details) if details else None,
+            "success": success,
+            "ip_address": ip_address,
+        }
+        if db is None and _writer_task is None:
+            # Sin escritor activo (scripts, tests, tareas fuera de la app) se escribe en el momento
+            _write_batch([row])
+        elif db is None:
+            _pending.put(row)
+        else:
             from ..models.audit_log import AuditLog
 
-            audit_record = AuditLog(
-                timestamp=datetime.utcnow(),
-                user_id=user.id if user else None,
-                user_email=user.email if user else None,
-                user_role=user.role if user else None,
-                action=action,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                description=f"{action} on {resource_type}" + (f"/{resource_id}" if resource_id else ""),
-                details=json.dumps(details) if details else None,
-                success=success,
-                ip_address=ip_address,
-            )
-            _db_session.add(audit_record)
-            _db_session.commit()
+            db.add(AuditLog(**row))
     except Exception as e:
         # No fallar la operación principal si hay error en auditoría
         audit_log.error("Failed to save audit log to database", error=str(e))
@@ -103,14 +182,16 @@ def log_update(resource_type: str, resource_id: int, user: User, details: Option
     log_action("update", resource_type, resource_id, user, details)
 
 
-def log_delete(resource_type: str, resource_id: int, user: User, details: Optional[dict] = None):
+def log_delete(resource_type: str, resource_id: int, user: User, details: Optional[dict] = None, db=None):
     """Log de eliminación de recurso."""
-    log_action("delete", resource_type, resource_id, user, details)
+    log_action("delete", resource_type, resource_id, user, details, db=db)
 
 
-def log_login(user_email: str, success: bool, details: Optional[dict] = None):
+def log_login(user_email: str, success: bool, details: Optional[dict] = None, db=None):
     """Log de intento de login."""
-    log_action("login", "user", user=None, details={"email": user_email, **(details or {})}, success=success)
+    log_action(
+        "login", "user", user=None, details={"email": user_email, **(details or {})}, success=success, db=db
+    )
 
 
 def log_status_change(
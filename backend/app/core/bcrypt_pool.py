@@ -0,0 +1,29 @@
+# app/core/bcrypt_pool.py
+"""
+Pool dedicado para el hash de contraseñas (bcrypt).
+
+bcrypt consume ~100 ms de CPU por llamada. Ejecutarlo en un pool propio, del tamaño
+de los núcleos disponibles, evita ocupar el threadpool compartido de Starlette
+(donde también corren las rutas síncronas y el acceso a la BD) durante ráfagas de logins.
+Se usan hilos y no procesos: la extensión de bcrypt libera el GIL mientras calcula,
+así que los hilos aprovechan todos los núcleos sin forks ni serialización de argumentos.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .security import hash_password, verify_password
+
+_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
+
+async def averify(plain_password: str, hashed_password: str) -> bool:
+    """verify_password sin bloquear el event loop."""
+    return await asyncio.get_running_loop().run_in_executor(
+        _POOL, verify_password, plain_password, hashed_password
+    )
+
+
+async def ahash(password: str) -> str:
+    """hash_password sin bloquear el event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_POOL, hash_password, password)
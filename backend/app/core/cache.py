@@ -0,0 +1,99 @@
+# app/core/cache.py
+"""
+Caché de valores pequeños con expiración (TTL).
+Usa Redis cuando REDIS_URL está configurado, de modo que todos los workers comparten
+los valores; si no, o si Redis no responde, usa un diccionario en memoria del proceso.
+Los valores deben ser serializables a JSON.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Callable
+
+import structlog
+
+from .config import settings
+
+log = structlog.get_logger()
+
+KEY_PREFIX = "hostal:"
+
+
+class TTLCache:
+    """Caché clave/valor con TTL respaldada por Redis o por memoria local."""
+
+    def __init__(self, redis_url: str | None = None):
+        self._local: dict[str, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._redis = None
+
+        if redis_url:
+            try:
+                import redis
+
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            except ImportError:
+                log.warning("redis no está instalado; se usa caché en memoria")
+
+    def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int,
+        shared_only: bool = False,
+        local_ttl: int | None = None,
+    ) -> Any:
+        """
+        Devuelve el valor en caché o lo calcula con loader() y lo guarda por ttl segundos.
+        Con shared_only=True solo se usa Redis: sin él (o si falla) se llama siempre a
+        loader(), para valores que una invalidación en un solo worker no puede dejar obsoletos.
+        local_ttl acota la copia en memoria del proceso (por defecto ttl): la invalidación
+        de otro worker no la alcanza, así que solo puede quedar obsoleta ese tiempo.
+        """
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(KEY_PREFIX + key)
+            except Exception as e:  # Redis caído: seguir con la caché local
+                log.warning("Redis no disponible para caché", error=str(e))
+            else:
+                if raw is not None:
+                    return json.loads(raw)
+                value = loader()
+                try:
+                    self._redis.set(KEY_PREFIX + key, json.dumps(value), ex=ttl)
+                except Exception as e:
+                    log.warning("Redis no disponible para caché", error=str(e))
+                return value
+
+        if shared_only:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        value = loader()
+        with self._lock:
+            self._local[key] = (now + (ttl if local_ttl is None else local_ttl), value)
+        return value
+
+    def invalidate(self, prefix: str) -> None:
+        """Elimina todas las claves que comienzan con prefix."""
+        if self._redis is not None:
+            try:
+                keys = list(self._redis.scan_iter(match=f"{KEY_PREFIX}{prefix}*"))
+                if keys:
+                    self._redis.delete(*keys)
+            except Exception as e:
+                log.warning("Redis no disponible para invalidar caché", error=str(e))
+
+        with self._lock:
+            for key in [k for k in self._local if k.startswith(prefix)]:
+                del self._local[key]
+
+
+cache = TTLCache(settings.REDIS_URL)
@@ -14,6 +14,8 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field(default="HS256", alias="ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=120, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = Field(default=60, alias="PASSWORD_RESET_TOKEN_EXPIRE_MINUTES")
+    # Costo de bcrypt (2^rounds iteraciones); los hashes con otro costo se recalculan al iniciar sesión
+    BCRYPT_ROUNDS: int = Field(default=10, ge=4, le=31, alias="BCRYPT_ROUNDS")
 
     # --- Server Settings ---
     API_URL: str = Field(
@@ -60,6 +62,23 @@ class Settings(BaseSettings):
     POSTGRES_DB: Optional[str] = None
     POSTGRES_HOST: Optional[str] = None
     POSTGRES_PORT: Optional[int] = None
+    DB_POOL_SIZE: int = Field(default=20, alias="DB_POOL_SIZE")  # Conexiones persistentes por proceso
+    DB_MAX_OVERFLOW: int = Field(default=0, alias="DB_MAX_OVERFLOW")  # Conexiones extra temporales
+    DB_POOL_TIMEOUT: int = Field(default=30, alias="DB_POOL_TIMEOUT")  # Segundos de espera por una conexión libre
+    DB_POOL_RECYCLE: int = Field(default=-1, alias="DB_POOL_RECYCLE")  # Reciclar conexiones tras N segundos (-1: nunca)
+    DB_POOL_PRE_PING: bool = Field(default=True, alias="DB_POOL_PRE_PING")  # SELECT 1 antes de usar cada conexión
+    # Clave de pgp_sym_encrypt para credenciales de dispositivos de red (sin valor: SECRET_KEY)
+    DB_ENCRYPTION_KEY: Optional[str] = Field(default=None, alias="DB_ENCRYPTION_KEY")
+
+    # Meses de actividad de red a conservar (particiones mensuales); sin valor no se purga
+    NETWORK_ACTIVITY_RETENTION_MONTHS: Optional[int] = Field(default=None, alias="NETWORK_ACTIVITY_RETENTION_MONTHS")
+
+    # --- Stripe ---
+    # Secreto de firma del endpoint de webhooks (whsec_...); sin valor el endpoint responde 501
+    STRIPE_WEBHOOK_SECRET: Optional[str] = Field(default=None, alias="STRIPE_WEBHOOK_SECRET")
+
+    # --- Cache Settings ---
+    REDIS_URL: Optional[str] = Field(default=None, alias="REDIS_URL")  # Sin valor: caché y rate limit en memoria
 
     # --- SMTP / Email Settings ---
     SMTP_HOST: Optional[str] = Field(default=None, alias="SMTP_HOST")
@@ -1,10 +1,53 @@
 import logging
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import BigInteger, DateTime, Integer, create_engine, event, inspect, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from .config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+
+def _engine_options(url: str) -> dict:
+    """Opciones del pool; SQLite usa su propio pool y no acepta estos parámetros."""
+    if url.startswith("sqlite"):
+        return {"pool_pre_ping": True}
+    # Las rutas síncronas corren en el threadpool de FastAPI: un pool fijo evita
+    # abrir y cerrar conexiones extra en picos y acota las conexiones por worker.
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+# Variable de PostgreSQL con la clave de pgcrypto (ver PgpEncryptedString): las
+# consultas usan current_setting() y la clave no aparece en el SQL ni en los logs
+ENCRYPTION_KEY_SETTING = "app.encryption_key"
+
+
+def install_encryption_key(bind) -> None:
+    """
+    Fija la clave de cifrado al comenzar cada transacción del engine (solo PostgreSQL).
+    Es local a la transacción (set_config(..., true)): con PgBouncer en modo transacción
+    la conexión del servidor cambia entre transacciones y una variable de sesión se
+    perdería o quedaría en la conexión de otro cliente.
+    """
+    if bind.dialect.name != "postgresql":
+        return
+    key = settings.DB_ENCRYPTION_KEY or settings.SECRET_KEY
+
+    @event.listens_for(bind, "begin")
+    def _set_encryption_key(conn):
+        conn.exec_driver_sql(
+            "SELECT set_config(%(name)s, %(key)s, true)",
+            {"name": ENCRYPTION_KEY_SETTING, "key": key},
+        )
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+install_encryption_key(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -12,6 +55,32 @@ class Base(DeclarativeBase):
     pass
 
 
+# Clave primaria BIGINT para tablas de alto volumen. SQLite solo autoincrementa
+# columnas INTEGER PRIMARY KEY, por eso allí se mantiene INTEGER.
+BigIntPK = BigInteger().with_variant(Integer, "sqlite")
+
+
+class utcnow(FunctionElement):
+    """
+    Fecha y hora actual en UTC calculada por la base de datos (timestamp sin zona),
+    para server_default/onupdate en lugar de datetime.utcnow en Python.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    # SQLite: CURRENT_TIMESTAMP ya está en UTC
+    return "CURRENT_TIMESTAMP"
+
+
 def get_db():
     db = SessionLocal()
     try:
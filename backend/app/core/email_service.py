@@ -7,8 +7,8 @@ from app.core.config import settings
 log = structlog.get_logger()
 
 
-def send_email(subject: str, to_email: str, text_body: str, html_body: str | None = None) -> None:
-    """Envía un correo usando la configuración SMTP. Si no hay SMTP configurado, se registra en logs."""
+def deliver_email(subject: str, to_email: str, text_body: str, html_body: str | None = None) -> None:
+    """Envía un correo usando la configuración SMTP; los errores de SMTP se propagan al llamador."""
     if not settings.SMTP_HOST:
         log.warning(
             "smtp_not_configured", subject=subject, to=to_email, preview=text_body[:120]
@@ -23,18 +23,23 @@ def send_email(subject: str, to_email: str, text_body: str, html_body: str | Non
     if html_body:
         message.add_alternative(html_body, subtype="html")
 
+    if settings.SMTP_TLS:
+        server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT or 587)
+        server.starttls()
+    else:
+        server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT or 25)
+
+    if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
+        server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+
+    server.send_message(message)
+    server.quit()
+    log.info("email_sent", to=to_email, subject=subject)
+
+
+def send_email(subject: str, to_email: str, text_body: str, html_body: str | None = None) -> None:
+    """Envía un correo usando la configuración SMTP. Si no hay SMTP configurado, se registra en logs."""
     try:
-        if settings.SMTP_TLS:
-            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT or 587)
-            server.starttls()
-        else:
-            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT or 25)
-
-        if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
-            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-
-        server.send_message(message)
-        server.quit()
-        log.info("email_sent", to=to_email, subject=subject)
+        deliver_email(subject, to_email, text_body, html_body)
     except Exception as exc:
         log.error("email_send_failed", error=str(exc), to=to_email)
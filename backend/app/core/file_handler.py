@@ -20,6 +20,7 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5 MB para imágenes
 MAX_DOCUMENT_SIZE = 10 * 1024 * 1024  # 10 MB para documentos
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB por lectura al recibir archivos
 
 # Compresión de imágenes
 MAX_IMAGE_DIMENSION = 2048  # px
@@ -139,13 +140,11 @@ class SecureFileHandler:
             )
 
     @staticmethod
-    def calculate_file_hash(file_path: Path) -> str:
-        """Calcula hash SHA256 del archivo."""
-        sha256_hash = hashlib.sha256()
+    def calculate_file_hash(file_path: Path) -> bytes:
+        """Calcula hash SHA256 del archivo (32 bytes binarios)."""
+        # file_digest lee en bloques grandes directo al hash (OpenSSL usa SHA-NI si está disponible)
         with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+            return hashlib.file_digest(f, "sha256").digest()
 
     @staticmethod
     async def save_upload_file_secure(
@@ -177,7 +176,7 @@ class SecureFileHandler:
         # 5. Guardar archivo en streaming (seguro para archivos grandes)
         file_size = 0
         with open(file_path, "wb") as f:
-            while chunk := await upload_file.read(8192):  # 8KB chunks
+            while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
                 file_size += len(chunk)
                 if file_size > max_allowed_size:
                     # Limpiar archivo parcial
@@ -1,6 +1,33 @@
 # app/core/limiter.py
+from limits import parse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-# Creamos una instancia única del limitador que será compartida por toda la app
-limiter = Limiter(key_func=get_remote_address)
+from app.core.config import settings
+
+# Creamos una instancia única del limitador que será compartida por toda la app.
+# Con REDIS_URL los contadores viven en Redis y el límite se aplica entre todos los
+# workers (ventana deslizante con scripts Lua atómicos); sin Redis, o si Redis no
+# responde, se cuenta en la memoria de cada proceso.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.REDIS_URL or "memory://",
+    strategy="moving-window",
+    key_prefix="hostal:ratelimit",
+    in_memory_fallback_enabled=True,
+)
+
+# Límite por cuenta para los flujos de recuperación de contraseña: el límite por IP no
+# impide que muchas IPs apunten al mismo email (correos masivos, hashes bcrypt)
+EMAIL_LIMIT = parse("5/hour")
+
+
+def hit_email_limit(scope: str, email: str) -> bool:
+    """Consume un intento de EMAIL_LIMIT para el email. False si ya se agotó."""
+    if not limiter.enabled:
+        return True
+    try:
+        return limiter.limiter.hit(EMAIL_LIMIT, "hostal:ratelimit", scope, email.lower())
+    except Exception:
+        # Sin almacenamiento de límites no se bloquea la recuperación de cuentas
+        return True
@@ -24,7 +24,7 @@ from typing import Optional
 
 from ..core.db import SessionLocal
 from ..models.network_device import NetworkDevice, DeviceBrand
-from ..services.network_integrations import MikrotikIntegration, OpenWrtIntegration
+from ..services import network_integrations
 
 log = structlog.get_logger()
 
@@ -42,10 +42,13 @@ class RouterIntegrationError(Exception):
     pass
 
 
-def notify_whitelist_add(mac: str, guest, device) -> None:
+def notify_whitelist_add(mac: str, guest_id: Optional[int], device_id: int) -> None:
     """
     Agrega MAC a la whitelist del router para permitir acceso a internet.
 
+    Se ejecuta como tarea en segundo plano después de responder: recibe ids (no objetos
+    ORM, cuya sesión ya está cerrada) y registra los errores del router en lugar de propagarlos.
+
     Ejemplos de integración:
       - pfSense: POST /api/v1/captiveportal/allowedmacs
       - UniFi: POST /api/s/default/cmd/stamgr {"cmd": "authorize-guest", "mac": "..."}
@@ -53,33 +56,39 @@ def notify_whitelist_add(mac: str, guest, device) -> None:
       - Omada: POST /api/v2/sites/{siteId}/clients/{mac}/block
     """
     if NETWORK_DEBUG:
-        log.info("network_whitelist_add", mac=mac, guest_id=guest.id, device_id=device.id)
+        log.info("network_whitelist_add", mac=mac, guest_id=guest_id, device_id=device_id)
 
     if ROUTER_TYPE == "debug":
         # Modo debug: solo loggear
         return
 
     # Implementación real depende del router
-    # Ejemplo para UniFi Controller:
-    if ROUTER_TYPE == "unifi":
-        _unifi_authorize_mac(mac)
-    elif ROUTER_TYPE == "pfsense":
-        _pfsense_allow_mac(mac)
-    # Agregar otros routers según necesidad
+    try:
+        # Ejemplo para UniFi Controller:
+        if ROUTER_TYPE == "unifi":
+            _unifi_authorize_mac(mac)
+        elif ROUTER_TYPE == "pfsense":
+            _pfsense_allow_mac(mac)
+        # Agregar otros routers según necesidad
+    except Exception as e:
+        log.error("network_whitelist_add_failed", mac=mac, error=str(e))
 
 
 def notify_whitelist_remove(mac: str) -> None:
-    """Quita MAC de la whitelist del router."""
+    """Quita MAC de la whitelist del router (tarea en segundo plano, no propaga errores)."""
     if NETWORK_DEBUG:
         log.info("network_whitelist_remove", mac=mac)
 
     if ROUTER_TYPE == "debug":
         return
 
-    if ROUTER_TYPE == "unifi":
-        _unifi_deauthorize_mac(mac)
-    elif ROUTER_TYPE == "pfsense":
-        _pfsense_block_mac(mac)
+    try:
+        if ROUTER_TYPE == "unifi":
+            _unifi_deauthorize_mac(mac)
+        elif ROUTER_TYPE == "pfsense":
+            _pfsense_block_mac(mac)
+    except Exception as e:
+        log.error("network_whitelist_remove_failed", mac=mac, error=str(e))
 
 
 def notify_router_block(mac: str) -> None:
@@ -246,7 +255,7 @@ def _get_mikrotik_integration():
         if not device:
             session.close()
             return None
-        return MikrotikIntegration(device, session), session
+        return network_integrations.MikrotikIntegration(device, session), session
     except Exception:
         session.close()
         raise
@@ -300,7 +309,7 @@ def _get_openwrt_integration():
         if not device:
             session.close()
             return None
-        return OpenWrtIntegration(device, session), session
+        return network_integrations.OpenWrtIntegration(device, session), session
     except Exception:
         session.close()
         raise
@@ -87,6 +87,47 @@ async def auto_suspend_devices_task():
             log.warning("Some errors occurred during auto-suspend", errors=stats['errors'])
 
 
+async def refresh_rollups_task():
+    """
+    Tarea para refrescar las vistas materializadas de reportes diarios.
+    Se ejecuta cada 5 minutos.
+    """
+    from ..services.rollups import refresh_daily_rollups
+
+    with get_db_for_task() as db:
+        refresh_daily_rollups(db)
+
+
+async def network_activity_partitions_task():
+    """
+    Tarea diaria: crea las particiones mensuales siguientes de network_activities
+    y purga las anteriores al período de retención configurado.
+    """
+    from ..core.config import settings
+    from ..services.network_activity_partitions import drop_expired_partitions, ensure_partitions
+
+    with get_db_for_task() as db:
+        ensure_partitions(db)
+        if settings.NETWORK_ACTIVITY_RETENTION_MONTHS:
+            drop_expired_partitions(db, settings.NETWORK_ACTIVITY_RETENTION_MONTHS)
+
+
+async def email_outbox_task():
+    """
+    Tarea para enviar los correos pendientes de la bandeja de salida y purgar
+    los ya enviados. Se ejecuta cada minuto.
+    """
+    from ..services.email_outbox import deliver_pending_emails, purge_sent_emails
+
+    with get_db_for_task() as db:
+        sent = await deliver_pending_emails(db)
+        if sent:
+            log.info("Email outbox delivered", sent=sent)
+        purged = purge_sent_emails(db)
+        if purged:
+            log.info("Email outbox purged", purged=purged)
+
+
 async def start_background_tasks():
     """
     Inicia todas las tareas de background.
@@ -118,6 +159,36 @@ async def start_background_tasks():
     )
     _active_tasks.append(("scheduled_backups", backup_task))
 
+    # Tarea 3: Refrescar agregados diarios de ingresos y ocupación cada 5 minutos
+    rollups_task = asyncio.create_task(
+        run_periodically(
+            interval_seconds=300,  # 5 minutos
+            task_name="refresh_daily_rollups",
+            func=refresh_rollups_task,
+        )
+    )
+    _active_tasks.append(("refresh_daily_rollups", rollups_task))
+
+    # Tarea 4: Particiones de actividad de red una vez al día
+    partitions_task = asyncio.create_task(
+        run_periodically(
+            interval_seconds=86400,  # 24 horas
+            task_name="network_activity_partitions",
+            func=network_activity_partitions_task,
+        )
+    )
+    _active_tasks.append(("network_activity_partitions", partitions_task))
+
+    # Tarea 5: Enviar correos de la bandeja de salida cada minuto
+    email_task = asyncio.create_task(
+        run_periodically(
+            interval_seconds=60,
+            task_name="email_outbox",
+            func=email_outbox_task,
+        )
+    )
+    _active_tasks.append(("email_outbox", email_task))
+
     log.info("Background scheduler tasks started", tasks_count=len(_active_tasks))
 
 
@@ -1,4 +1,5 @@
 # app/core/security.py
+import hashlib
 from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, HTTPException, status
@@ -14,10 +15,18 @@ from app.models.user import User
 pwd_context = CryptContext(
     schemes=["bcrypt", "pbkdf2_sha256"],
     deprecated="auto",
-    bcrypt__rounds=12
+    # default_rounds y no rounds (que también fija el máximo): needs_update solo marca
+    # hashes más débiles que BCRYPT_ROUNDS y nunca baja el costo de uno más fuerte
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
 )
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Roles que se pueden asignar a cuentas desde la API (alta, edición y aprobación)
+_ASSIGNABLE_ROLE_NAMES = ("admin", "gerente", "recepcionista", "mantenimiento", "staff")
+ASSIGNABLE_ROLES = frozenset(_ASSIGNABLE_ROLE_NAMES)
+ASSIGNABLE_ROLES_TEXT = ", ".join(_ASSIGNABLE_ROLE_NAMES)
+
 ROLE_HIERARCHY = {
     "admin": 4,
     "gerente": 3,
@@ -65,6 +74,19 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(truncated_password)
 
 
+def hash_reset_token(token: str) -> str:
+    """
+    SHA-256 del token de recuperación. El token es aleatorio (token_urlsafe, 288 bits),
+    así que no necesita el costo de bcrypt, pensado para contraseñas de baja entropía.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True si el hash usa un esquema obsoleto o un costo menor que BCRYPT_ROUNDS."""
+    return pwd_context.needs_update(hashed_password)
+
+
 # Alias para compatibilidad
 get_password_hash = hash_password
 
@@ -100,10 +122,14 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         if user_id is None:
             log.warning("No user_id in token payload")
             raise credentials_exception
-    except JWTError as e:
+        # "sub" llega como texto: con la clave entera db.get resuelve desde el identity map
+        user_id = int(user_id)
+    except (JWTError, ValueError) as e:
         log.error("JWT decode error", error=str(e))
         raise credentials_exception from None
 
+    # Sin caché entre requests: un usuario borrado, degradado o sin aprobación deja de
+    # autenticarse de inmediato en todos los workers
     user = db.get(User, user_id)
     if user is None:
         log.warning("User not found in database", user_id=user_id)
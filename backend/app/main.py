@@ -3,6 +3,7 @@ from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -13,8 +14,8 @@ from app.core.config import settings
 from app.core.limiter import limiter  # <--- Importar desde el nuevo archivo
 from app.core.logging import setup_logging
 from app.core.middleware import LoggingMiddleware
-from app.core.db import ensure_minimum_schema, SessionLocal
-from app.core.audit import set_audit_db_session
+from app.core.db import ensure_minimum_schema
+from app.core.audit import start_audit_writer, stop_audit_writer
 from app.core.scheduler import start_background_tasks, stop_background_tasks
 from app.routers import reservations
 from app.routers.api import api_router
@@ -24,6 +25,8 @@ app = FastAPI(
     description="API REST para gestión de hostal con reservaciones, huéspedes y habitaciones",
     version="1.0.0",
     debug=settings.DEBUG,
+    # orjson serializa las respuestas JSON bastante más rápido que json de la stdlib
+    default_response_class=ORJSONResponse,
 )
 
 # Configurar directorio de uploads para servir archivos estáticos
@@ -55,10 +58,9 @@ async def startup_event():
         if "*" in settings.get_cors_origins():
             log.warning("WARNING: CORS allows all origins in production - security risk!")
 
-    # Inicializar sesión de auditoría
-    db = SessionLocal()
-    set_audit_db_session(db)
-    log.info("Audit database session initialized")
+    # Escritor por lotes de los registros de auditoría
+    start_audit_writer()
+    log.info("Audit writer started")
 
     # Iniciar tareas de background
     await start_background_tasks()
@@ -76,6 +78,7 @@ async def shutdown_event():
 
     # Detener tareas de background
     await stop_background_tasks()
+    await stop_audit_writer()
 
     log.info("Hostal API shutdown complete")
 
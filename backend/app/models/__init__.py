@@ -6,6 +6,7 @@ Modelos de base de datos del sistema Hostal.
 # Modelos principales
 from .audit_log import AuditLog
 from .device import Device
+from .email_outbox import EmailOutbox, EmailOutboxStatus
 from .exchange_rate import ExchangeRate
 from .guest import Guest
 from .maintenance import Maintenance, MaintenancePriority, MaintenanceStatus, MaintenanceType
@@ -33,8 +34,9 @@ from .room_rate import RoomRate
 from .staff import Staff, StaffRole, StaffStatus
 from .user import User
 # NEW: Invoice and payment gateway models
-from .invoice import Invoice, InvoiceStatus, InvoiceLine, InvoicePayment
+from .invoice import Invoice, InvoiceStatus, InvoiceLine, InvoicePayment, InvoicePaymentStatus
 from .financial_transaction import FinancialTransaction, TransactionType, TransactionStatus, PaymentGateway, ExchangeRateSnapshot
+from .stripe_webhook_event import StripeWebhookEvent, StripeWebhookLog, WebhookEventType, WebhookProcessingStatus
 
 __all__ = [
     # Audit and logging
@@ -50,6 +52,8 @@ __all__ = [
     "ReservationStatus",
     "Period",
     "Device",
+    "EmailOutbox",
+    "EmailOutboxStatus",
     # Staff and operations
     "Staff",
     "StaffRole",
@@ -84,11 +88,16 @@ __all__ = [
     "InvoiceStatus",
     "InvoiceLine",
     "InvoicePayment",
+    "InvoicePaymentStatus",
     "FinancialTransaction",
     "TransactionType",
     "TransactionStatus",
     "PaymentGateway",
     "ExchangeRateSnapshot",
+    "StripeWebhookEvent",
+    "StripeWebhookLog",
+    "WebhookEventType",
+    "WebhookProcessingStatus",
     # Media
     "Media",
     "MediaType",
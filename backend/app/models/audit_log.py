@@ -4,11 +4,11 @@ Modelo de registro de auditoría para consultas desde la base de datos.
 Permite al admin ver toda la traza de acciones por usuario.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from typing import Optional
 
-from ..core.db import Base
+from ..core.db import Base, utcnow
 
 
 class AuditLog(Base):
@@ -16,10 +16,10 @@ class AuditLog(Base):
     __tablename__ = "audit_logs"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    timestamp: Mapped[datetime] = mapped_column(DateTime, index=True, default=datetime.utcnow)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, index=True, server_default=utcnow())
 
     # Usuario que realizó la acción
-    user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
+    user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True)  # Cubierto por idx_audit_summary
     user_email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
     user_role: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
@@ -38,9 +38,15 @@ class AuditLog(Base):
 
     # Índices para búsquedas comunes
     __table_args__ = (
-        # Índice compuesto para consultas por usuario y fecha
-        # Ya existe en el archivo de índices automático de SQLAlchemy
+        # Resumen por usuario (GET /audit/summary) resuelto solo con el índice
+        Index(
+            "idx_audit_summary",
+            "user_id",
+            "timestamp",
+            "success",
+            postgresql_include=["user_email", "user_role"],
+        ),
     )
 
     def __repr__(self):
-        return f"<AuditLog {self.id}: {self.action} {self.resource_type}/{self.resource_id} by {self.user_email} at {self.timestamp}>"
+        return f"<AuditLog id={self.__dict__.get('id')}>"
@@ -1,7 +1,9 @@
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, SmallInteger, String, Text, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
 from ..core.db import Base
 
@@ -10,6 +12,10 @@ class Device(Base):
     """Dispositivo de un huésped o personal con control de internet."""
     __tablename__ = "devices"
 
+    # Bits de suspension_flags
+    SUSPENDED_MANUAL = 1
+    SUSPENDED_AUTO = 2
+
     id: Mapped[int] = mapped_column(primary_key=True)
     guest_id: Mapped[int | None] = mapped_column(ForeignKey("guests.id", ondelete="CASCADE"), index=True, nullable=True)
     staff_id: Mapped[int | None] = mapped_column(ForeignKey("staff.id", ondelete="CASCADE"), index=True, nullable=True)
@@ -21,11 +27,10 @@ class Device(Base):
 
     # Control de acceso a internet
     allowed: Mapped[bool] = mapped_column(Boolean, default=True, index=True)  # whitelist flag
-    suspended: Mapped[bool] = mapped_column(Boolean, default=False, index=True)  # Suspendido manualmente
+    # Suspensión manual (bit 0) y automática por mora o sin ocupancia (bit 1) en una sola
+    # columna; se leen y escriben con las propiedades suspended / auto_suspended
+    suspension_flags: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0, server_default="0")
     suspension_reason: Mapped[str | None] = mapped_column(Text, nullable=True)  # Razón de suspensión
-
-    # Suspensión automática por mora o sin ocupancia
-    auto_suspended: Mapped[bool] = mapped_column(Boolean, default=False, index=True)  # Suspendido automáticamente
     auto_suspension_reason: Mapped[str | None] = mapped_column(Text, nullable=True)  # Razón de suspensión automática
     auto_suspension_date: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)  # Fecha de suspensión automática
 
@@ -46,6 +51,57 @@ class Device(Base):
     guest = relationship("Guest", back_populates="devices")
     staff = relationship("Staff", back_populates="devices")
 
+    __table_args__ = (
+        # Índice parcial: solo los dispositivos suspendidos, recorridos por id al paginar
+        Index("ix_devices_suspended", id, postgresql_where=text("suspension_flags <> 0")),
+    )
+
+    def _set_suspension_flag(self, flag: int, value: bool) -> None:
+        flags = self.suspension_flags or 0
+        self.suspension_flags = flags | flag if value else flags & ~flag
+
+    @hybrid_property
+    def suspended(self) -> bool:
+        """Suspendido manualmente."""
+        return bool((self.suspension_flags or 0) & self.SUSPENDED_MANUAL)
+
+    @suspended.setter
+    def suspended(self, value: bool) -> None:
+        self._set_suspension_flag(self.SUSPENDED_MANUAL, value)
+
+    @suspended.expression
+    def suspended(cls):
+        return cls.suspension_flags.op("&")(cls.SUSPENDED_MANUAL) != 0
+
+    @hybrid_property
+    def auto_suspended(self) -> bool:
+        """Suspendido automáticamente."""
+        return bool((self.suspension_flags or 0) & self.SUSPENDED_AUTO)
+
+    @auto_suspended.setter
+    def auto_suspended(self, value: bool) -> None:
+        self._set_suspension_flag(self.SUSPENDED_AUTO, value)
+
+    @auto_suspended.expression
+    def auto_suspended(cls):
+        return cls.suspension_flags.op("&")(cls.SUSPENDED_AUTO) != 0
+
+    @classmethod
+    def try_insert(cls, db: Session, mac: str, **fields) -> "Device | None":
+        """
+        Registra el dispositivo con INSERT ... ON CONFLICT (mac) DO NOTHING RETURNING.
+        Devuelve el dispositivo creado, o None si la MAC ya estaba registrada: la
+        unicidad la resuelve el índice único de mac sin un SELECT previo.
+        """
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = (
+            dialect.insert(cls)
+            .values(mac=mac, **fields)
+            .on_conflict_do_nothing(index_elements=["mac"])
+            .returning(cls)
+        )
+        return db.scalars(stmt).one_or_none()
+
     @property
     def is_online(self) -> bool:
         """Verifica si el dispositivo está online (visto en los últimos 5 minutos)."""
@@ -0,0 +1,63 @@
+# app/models/email_outbox.py
+"""
+Bandeja de salida de correos.
+Los correos se guardan en la misma transacción que los genera y una tarea del
+scheduler los envía por SMTP con reintentos, así sobreviven a reinicios del proceso.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, text
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.db import Base, utcnow
+
+
+class EmailOutboxStatus(str, Enum):
+    """Estado de un correo en la bandeja de salida."""
+    pending = "pending"
+    sent = "sent"
+    failed = "failed"  # Agotó los reintentos
+
+
+class EmailOutbox(Base):
+    """Correo pendiente o ya enviado."""
+    __tablename__ = "email_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Se vacían al enviar o descartar el correo: pueden contener enlaces con tokens
+    text_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    html_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    status: Mapped[EmailOutboxStatus] = mapped_column(
+        SAEnum(
+            EmailOutboxStatus,
+            name="email_outbox_status",
+            native_enum=False,
+            create_constraint=True,
+            length=32,
+        ),
+        nullable=False,
+        server_default="pending",
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=utcnow())
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=utcnow())
+
+    __table_args__ = (
+        # Índice parcial: la tarea de envío solo lee la cola pendiente
+        Index("ix_email_outbox_pending", next_attempt_at, postgresql_where=text("status = 'pending'")),
+        # Purga de correos enviados antiguos
+        Index("ix_email_outbox_sent", sent_at, postgresql_where=text("status = 'sent'")),
+    )
+
+    def __repr__(self):
+        return f"<EmailOutbox id={self.__dict__.get('id')}>"
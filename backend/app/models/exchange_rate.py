@@ -9,7 +9,15 @@ from datetime import datetime
 
 from sqlalchemy import Column, DateTime, Float, Integer, String, UniqueConstraint
 
-from ..core.db import Base
+from ..core.cache import cache
+from ..core.db import Base, utcnow
+
+# Las tasas cambian como mucho unas veces al día; se cachean por unos minutos en Redis,
+# que todos los workers invalidan juntos. Sin Redis cada proceso tiene su copia y la
+# invalidación solo alcanza al que guardó o restauró las tasas: se guardan 30 s.
+RATE_CACHE_TTL = 300
+RATE_LOCAL_CACHE_TTL = 30
+RATE_CACHE_PREFIX = "exchange_rate:"
 
 
 class ExchangeRate(Base):
@@ -37,19 +45,29 @@ class ExchangeRate(Base):
     is_manual = Column(Integer, default=0)  # 0 = automática, 1 = manual
 
     # Auditoría
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow())
+    updated_at = Column(DateTime, nullable=True, onupdate=utcnow())
 
     @classmethod
     def get_latest_rate(cls, db, from_curr: str, to_curr: str) -> float | None:
-        """Obtiene la tasa más reciente entre dos monedas."""
-        rate = (
-            db.query(cls)
-            .filter(cls.from_currency == from_curr, cls.to_currency == to_curr)
-            .order_by(cls.date.desc())
-            .first()
+        """Obtiene la tasa más reciente entre dos monedas (cacheada, ver RATE_CACHE_TTL)."""
+        def load() -> float | None:
+            return (
+                db.query(cls.rate)
+                .filter(cls.from_currency == from_curr, cls.to_currency == to_curr)
+                .order_by(cls.date.desc())
+                .limit(1)
+                .scalar()
+            )
+
+        return cache.get_or_set(
+            f"{RATE_CACHE_PREFIX}{from_curr}:{to_curr}", load, RATE_CACHE_TTL, local_ttl=RATE_LOCAL_CACHE_TTL
         )
-        return rate.rate if rate else None
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Descarta las tasas cacheadas; llamar después de guardar o borrar tasas."""
+        cache.invalidate(RATE_CACHE_PREFIX)
 
     @classmethod
     def convert(cls, db, amount: float, from_curr: str, to_curr: str) -> float | None:
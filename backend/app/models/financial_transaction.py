@@ -8,11 +8,12 @@ from __future__ import annotations
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text, JSON, Index
+from sqlalchemy import BigInteger, Column, DateTime, Float, ForeignKey, Integer, Numeric, String, Text, JSON, Index
 from sqlalchemy import Enum as SAEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
-from ..core.db import Base
+from ..core.db import Base, utcnow
 
 
 class TransactionType(str, Enum):
@@ -60,37 +61,34 @@ class FinancialTransaction(Base):
     transaction_type = Column(
         SAEnum(TransactionType, name="transaction_type", create_constraint=True),
         nullable=False,
-        index=True
     )
     status = Column(
         SAEnum(TransactionStatus, name="transaction_status", create_constraint=True),
         nullable=False,
         default=TransactionStatus.pending,
         server_default="pending",
-        index=True
     )
 
-    # Referencias (puede estar vinculado a varios items)
-    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=True, index=True)
-    payment_id = Column(Integer, ForeignKey("payments.id"), nullable=True, index=True)
-    guest_id = Column(Integer, ForeignKey("guests.id"), nullable=True, index=True)
+    # Referencias (puede estar vinculado a varios items); indexadas en __table_args__
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=True)
+    payment_id = Column(BigInteger, ForeignKey("payments.id"), nullable=True)
+    guest_id = Column(Integer, ForeignKey("guests.id"), nullable=True)
     reservation_id = Column(Integer, ForeignKey("reservations.id"), nullable=True, index=True)
 
     # Persona que creó la transacción
     created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
     # Montos
-    amount = Column(Float, nullable=False)
+    amount = Column(Numeric(14, 2, asdecimal=False), nullable=False)
     currency = Column(String(3), nullable=False, default="VES", index=True)
-    amount_ves = Column(Float, nullable=False)  # Monto normalizado a VES
+    amount_ves = Column(Numeric(14, 2, asdecimal=False), nullable=False)  # Monto normalizado a VES
 
     # Información de pasarela de pago
     gateway = Column(
         SAEnum(PaymentGateway, name="payment_gateway", create_constraint=True),
         nullable=False,
-        index=True
     )
-    gateway_transaction_id = Column(String(200), nullable=True, index=True)
+    gateway_transaction_id = Column(String(200), nullable=True)
     gateway_reference = Column(String(200), nullable=True)
 
     # Información del pago/transacción
@@ -98,7 +96,8 @@ class FinancialTransaction(Base):
     notes = Column(Text, nullable=True)
 
     # Metadata flexible para información adicional
-    transaction_metadata = Column(JSON, nullable=True)  # {
+    # JSONB en PostgreSQL: formato binario sin re-parseo e indexable con GIN
+    transaction_metadata = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # {
     #     "stripe_charge_id": "ch_xxx",
     #     "invoice_number": "INV-2024-001",
     #     "room_id": 5,
@@ -112,8 +111,8 @@ class FinancialTransaction(Base):
     # Auditoría temporal
     transaction_date = Column(DateTime, nullable=False, index=True)
     completed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow(), index=True)
+    updated_at = Column(DateTime, nullable=False, server_default=utcnow(), onupdate=utcnow())
 
     # Relaciones
     invoice = relationship("Invoice")
@@ -131,10 +130,17 @@ class FinancialTransaction(Base):
         Index("idx_transaction_invoice", invoice_id),
         Index("idx_transaction_payment", payment_id),
         Index("idx_transaction_gateway_ref", gateway_transaction_id),
+        # Búsquedas por contenido: transaction_metadata @> '{"stripe_charge_id": "ch_xxx"}'
+        Index(
+            "idx_transaction_metadata_gin",
+            transaction_metadata,
+            postgresql_using="gin",
+            postgresql_ops={"transaction_metadata": "jsonb_path_ops"},
+        ),
     )
 
     def __repr__(self):
-        return f"<FinancialTransaction {self.transaction_type}: {self.amount} {self.currency} ({self.status})>"
+        return f"<FinancialTransaction id={self.__dict__.get('id')}>"
 
 
 class ExchangeRateSnapshot(Base):
@@ -154,12 +160,12 @@ class ExchangeRateSnapshot(Base):
     is_manual = Column(Integer, nullable=False, default=0)  # 0 = automático, 1 = manual
 
     # Auditoría
-    snapshot_date = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    snapshot_date = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow())
 
     __table_args__ = (
         Index("idx_rate_snapshot_date", snapshot_date),
     )
 
     def __repr__(self):
-        return f"<ExchangeRateSnapshot {self.snapshot_date}: 1 VES = {1/self.ves_to_usd:.4f} USD>"
+        return f"<ExchangeRateSnapshot id={self.__dict__.get('id')}>"
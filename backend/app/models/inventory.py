@@ -17,7 +17,7 @@ from sqlalchemy import (
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from ..core.db import Base
+from ..core.db import Base, utcnow
 
 
 class InventoryCategory(str, Enum):
@@ -60,9 +60,9 @@ class InventoryItem(Base):
     cost_per_unit: Mapped[float | None] = mapped_column(Float, nullable=True)
     allow_negative_stock: Mapped[bool] = mapped_column(Boolean, default=False)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, server_default=utcnow(), onupdate=utcnow()
     )
 
     transactions = relationship(
@@ -106,7 +106,7 @@ class InventoryTransaction(Base):
     reference_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
     reference_type: Mapped[str | None] = mapped_column(String(50), nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
 
     item = relationship("InventoryItem", back_populates="transactions")
 
@@ -2,14 +2,17 @@
 """Modelo para facturación homologada a normativas venezolanas."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime, timezone
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text, Boolean, Date
+from sqlalchemy import BigInteger, Column, Computed, DateTime, Float, ForeignKey, Index, Integer, Numeric, SmallInteger, String, Text, Boolean, Date, text
 from sqlalchemy import Enum as SAEnum
+from sqlalchemy import and_
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
 
-from ..core.db import Base
+from ..core.db import Base, utcnow
 
 
 class InvoiceType(str, Enum):
@@ -27,13 +30,45 @@ class InvoiceStatus(str, Enum):
     paid = "paid"  # Pagada
 
 
-class PaymentStatus(str, Enum):
+# Código numérico con el que se guarda cada estado (no reordenar: están en la BD)
+INVOICE_STATUS_CODES = {
+    InvoiceStatus.draft: 0,
+    InvoiceStatus.issued: 1,
+    InvoiceStatus.cancelled: 2,
+    InvoiceStatus.paid: 3,
+}
+
+
+class InvoiceStatusCode(TypeDecorator):
+    """Guarda InvoiceStatus como SMALLINT; la aplicación y la API siguen usando el enum."""
+    impl = SmallInteger
+    cache_ok = True
+
+    _statuses = {code: status for status, code in INVOICE_STATUS_CODES.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return INVOICE_STATUS_CODES[InvoiceStatus(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._statuses[value]
+
+
+class InvoicePaymentStatus(str, Enum):
     """Estado de pago de la factura."""
     pending = "pending"  # Pendiente
     partial = "partial"  # Parcialmente pagada
     completed = "completed"  # Completamente pagada
 
 
+def _utc_today() -> date:
+    """Fecha actual en UTC, la misma zona de los timestamps que guarda la base."""
+    return datetime.now(timezone.utc).date()
+
+
 class Invoice(Base):
     """Factura homologada a normativas venezolanas."""
     __tablename__ = "invoices"
@@ -43,10 +78,10 @@ class Invoice(Base):
     # Información fiscal
     invoice_type = Column(SAEnum(InvoiceType, name="invoice_type"), nullable=False, default=InvoiceType.factura)
     control_number = Column(String(20), unique=True, nullable=False, index=True)  # Número de control SENIAT
-    invoice_number = Column(Integer, nullable=False, index=True)  # Número secuencial de factura
+    invoice_number = Column(BigInteger, nullable=False)  # Número secuencial; se consulta por serie (idx_invoice_series_number_desc)
     invoice_series = Column(String(10), nullable=False, default="A")  # Serie de la factura (A, B, C, etc)
 
-    # Información del cliente
+    # Información del cliente (snapshot al crear la factura; el listado no une con guests)
     guest_id = Column(Integer, ForeignKey("guests.id"), nullable=True, index=True)
     client_name = Column(String(255), nullable=False)
     client_rif = Column(String(50), nullable=True)  # RIF del cliente (sin guiones)
@@ -57,29 +92,30 @@ class Invoice(Base):
     currency = Column(String(3), nullable=False, default="VES")  # VES, USD, EUR
     exchange_rate = Column(Float, nullable=False, default=1.0)  # Tasa de cambio respecto a VES
 
-    subtotal = Column(Float, nullable=False)  # Subtotal sin IVA
-    taxable_amount = Column(Float, nullable=False)  # Base imponible
+    subtotal = Column(Numeric(12, 2), nullable=False)  # Subtotal sin IVA
+    taxable_amount = Column(Numeric(12, 2), nullable=False)  # Base imponible
 
     # IVA (16% es el estándar en Venezuela)
     tax_percentage = Column(Float, nullable=False, default=16.0)  # Porcentaje de IVA
-    tax_amount = Column(Float, nullable=False)  # Monto de IVA
+    tax_amount = Column(Numeric(12, 2), nullable=False)  # Monto de IVA
 
     # Retenciones
     iva_retention_percentage = Column(Float, nullable=False, default=0.0)  # Retención de IVA (50% sobre IVA)
-    iva_retention_amount = Column(Float, nullable=False, default=0.0)  # Monto retenido de IVA
+    iva_retention_amount = Column(Numeric(12, 2), nullable=False, default=0.0)  # Monto retenido de IVA
 
     islr_retention_percentage = Column(Float, nullable=False, default=0.0)  # Retención ISLR
-    islr_retention_amount = Column(Float, nullable=False, default=0.0)  # Monto retenido de ISLR
+    islr_retention_amount = Column(Numeric(12, 2), nullable=False, default=0.0)  # Monto retenido de ISLR
 
     # Total final
-    total = Column(Float, nullable=False)  # Total a pagar
+    total = Column(Numeric(12, 2), nullable=False)  # Total a pagar
 
     # Información de pago
-    payment_status = Column(SAEnum(PaymentStatus, name="payment_status"), nullable=False, default=PaymentStatus.pending)
-    paid_amount = Column(Float, nullable=False, default=0.0)  # Monto pagado hasta ahora
+    payment_status = Column(SAEnum(InvoicePaymentStatus, name="invoice_payment_status"), nullable=False, default=InvoicePaymentStatus.pending)
+    paid_amount = Column(Numeric(12, 2), nullable=False, default=0.0)  # Monto pagado hasta ahora
+    remaining_balance = Column(Numeric(12, 2), Computed("total - paid_amount", persisted=True))  # Calculado por la BD
 
     # Estados
-    status = Column(SAEnum(InvoiceStatus, name="invoice_status"), nullable=False, default=InvoiceStatus.draft)
+    status = Column(InvoiceStatusCode(), nullable=False, default=InvoiceStatus.draft)
 
     # Información adicional
     notes = Column(Text, nullable=True)
@@ -90,17 +126,70 @@ class Invoice(Base):
     cancellation_authorized_by = Column(Integer, ForeignKey("users.id"), nullable=True)
 
     # Fecha y auditoría
-    invoice_date = Column(Date, nullable=False, index=True)
+    invoice_date = Column(Date, nullable=False)
     due_date = Column(Date, nullable=True)
     issued_at = Column(DateTime, nullable=True)  # Cuando se emitió la factura
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
 
     # Relaciones
     guest = relationship("Guest", back_populates="invoices")
-    lines = relationship("InvoiceLine", back_populates="invoice", cascade="all, delete-orphan")
-    payments = relationship("InvoicePayment", back_populates="invoice", cascade="all, delete-orphan")
+    lines = relationship(
+        "InvoiceLine",
+        back_populates="invoice",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="InvoiceLine.line_order",
+    )
+    payments = relationship(
+        "InvoicePayment",
+        back_populates="invoice",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="InvoicePayment.payment_date.desc()",
+    )
+
+    @property
+    def display_number(self) -> str:
+        """Número de factura formateado para mostrar: SERIE-00000001."""
+        return f"{self.invoice_series}-{self.invoice_number:08d}"
+
+    @hybrid_property
+    def is_overdue(self) -> bool:
+        """Factura emitida, sin pagar por completo y con fecha de vencimiento pasada."""
+        return (
+            self.status == InvoiceStatus.issued
+            and self.due_date is not None
+            and self.due_date < _utc_today()
+        )
+
+    @is_overdue.expression
+    def is_overdue(cls):
+        return and_(cls.status == InvoiceStatus.issued, cls.due_date < _utc_today())
+
+    # Índices para queries frecuentes
+    __table_args__ = (
+        # Facturas emitidas por vencimiento (consulta de vencidas)
+        Index("idx_invoice_overdue", due_date, postgresql_where=text("status = 1")),  # 1 = issued
+        # Filtros por estado dentro de un rango de fechas (estadísticas)
+        Index("idx_invoice_status_date", status, invoice_date),
+        # Rangos de fechas en reportes: BRIN, las facturas se insertan en orden de fecha
+        Index(
+            "idx_invoice_date_brin",
+            invoice_date,
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        # Último número emitido por serie: ORDER BY invoice_number DESC LIMIT 1
+        Index("idx_invoice_series_number_desc", invoice_series, invoice_number.desc(), unique=True),
+        # Facturas con saldo pendiente
+        Index(
+            "idx_invoice_outstanding",
+            remaining_balance,
+            postgresql_where=text("remaining_balance > 0"),
+        ),
+    )
 
 
 class InvoiceLine(Base):
@@ -116,20 +205,20 @@ class InvoiceLine(Base):
 
     # Cantidad y precio
     quantity = Column(Float, nullable=False)
-    unit_price = Column(Float, nullable=False)  # Precio unitario
+    unit_price = Column(Numeric(12, 2), nullable=False)  # Precio unitario
 
     # Total de la línea
-    line_total = Column(Float, nullable=False)  # quantity * unit_price
+    line_total = Column(Numeric(12, 2), nullable=False)  # quantity * unit_price
 
     # Información fiscal
     is_taxable = Column(Boolean, nullable=False, default=True)  # Si está sujeta a IVA
     tax_percentage = Column(Float, nullable=False, default=16.0)
-    tax_amount = Column(Float, nullable=False)
+    tax_amount = Column(Numeric(12, 2), nullable=False)
 
     # Orden de visualización
     line_order = Column(Integer, nullable=False)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
 
     # Relación
     invoice = relationship("Invoice", back_populates="lines")
@@ -140,10 +229,10 @@ class InvoicePayment(Base):
     __tablename__ = "invoice_payments"
 
     id = Column(Integer, primary_key=True, index=True)
-    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False, index=True)
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False)  # Cubierto por idx_invoice_payment_invoice_date
 
     # Información del pago
-    amount = Column(Float, nullable=False)
+    amount = Column(Numeric(12, 2), nullable=False)
     currency = Column(String(3), nullable=False, default="VES")
     exchange_rate = Column(Float, nullable=False, default=1.0)
 
@@ -155,11 +244,16 @@ class InvoicePayment(Base):
 
     # Fechas
     payment_date = Column(Date, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
 
     # Relación
     invoice = relationship("Invoice", back_populates="payments")
 
+    __table_args__ = (
+        # Historial de pagos por factura, más recientes primero
+        Index("idx_invoice_payment_invoice_date", invoice_id, payment_date.desc()),
+    )
+
 
 class InvoiceConfiguration(Base):
     """Configuración fiscal de la empresa para facturación."""
@@ -207,8 +301,8 @@ class InvoiceConfiguration(Base):
     payment_terms = Column(Text, nullable=True)
 
     # Auditoría
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
 
 
 class InvoiceControlNumber(Base):
@@ -226,4 +320,9 @@ class InvoiceControlNumber(Base):
     used_at = Column(DateTime, nullable=True)
 
     # Auditoría
-    generated_at = Column(DateTime, default=datetime.utcnow)
+    generated_at = Column(DateTime, server_default=utcnow())
+
+    __table_args__ = (
+        # Solo indexa los números libres: la tabla crece con cada factura emitida
+        Index("idx_control_numbers_unused", generated_at, postgresql_where=text("is_used = false")),
+    )
@@ -2,11 +2,12 @@
 """Modelo para registrar mantenimiento y limpieza de habitaciones."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, and_, text
 from sqlalchemy import Enum as SAEnum
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 from ..core.db import Base
@@ -41,6 +42,10 @@ class MaintenancePriority(str, Enum):
     critical = "critical"  # Crítico
 
 
+# Una tarea sin completar se considera atrasada después de este tiempo
+OVERDUE_AFTER = timedelta(hours=24)
+
+
 class Maintenance(Base):
     """Registro de tareas de mantenimiento y limpieza."""
     __tablename__ = "maintenances"
@@ -80,8 +85,8 @@ class Maintenance(Base):
     completed_at = Column(DateTime, nullable=True)
 
     # Costos
-    estimated_cost = Column(Float, nullable=True)  # Costo estimado
-    actual_cost = Column(Float, nullable=True)  # Costo real
+    estimated_cost = Column(Numeric(14, 2, asdecimal=False), nullable=True)  # Costo estimado
+    actual_cost = Column(Numeric(14, 2, asdecimal=False), nullable=True)  # Costo real
 
     # Relaciones
     room = relationship("Room", back_populates="maintenances")
@@ -100,10 +105,40 @@ class Maintenance(Base):
             return delta.total_seconds() / 3600
         return None
 
-    @property
+    @hybrid_property
     def is_overdue(self) -> bool:
         """Verifica si el mantenimiento está atrasado (más de 24 horas sin completar)."""
         if self.status in (MaintenanceStatus.completed, MaintenanceStatus.cancelled):
             return False
-        hours_elapsed = (datetime.utcnow() - self.reported_at).total_seconds() / 3600
-        return hours_elapsed > 24
+        return datetime.utcnow() - self.reported_at > OVERDUE_AFTER
+
+    @is_overdue.expression
+    def is_overdue(cls):
+        """Filtro SQL equivalente; el corte se calcula en UTC igual que reported_at."""
+        return and_(
+            cls.status.in_([MaintenanceStatus.pending, MaintenanceStatus.in_progress]),
+            cls.reported_at < datetime.utcnow() - OVERDUE_AFTER,
+        )
+
+    __table_args__ = (
+        # Tareas abiertas ordenadas por antigüedad (consulta de atrasadas)
+        Index(
+            "idx_maint_overdue",
+            reported_at,
+            postgresql_where=text("status IN ('pending', 'in_progress')"),
+        ),
+        # Tareas abiertas por habitación (room_id + pending_only), ordenables por prioridad
+        Index(
+            "idx_maint_room_open",
+            room_id,
+            priority,
+            postgresql_where=text("status IN ('pending', 'in_progress')"),
+        ),
+        # Rangos por fecha de reporte: BRIN, las tareas se insertan en orden cronológico
+        Index(
+            "idx_maint_reported_at_brin",
+            reported_at,
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+    )
@@ -8,7 +8,7 @@ from __future__ import annotations
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import relationship
 
@@ -46,7 +46,7 @@ class Media(Base):
     file_path = Column(String(500), nullable=False)  # Path completo o URL
     file_size = Column(Integer, nullable=False)  # Tamaño en bytes
     mime_type = Column(String(100), nullable=False)  # image/jpeg, application/pdf, etc.
-    file_hash = Column(String(64), nullable=True, index=True)  # SHA256 hash para detección de duplicados
+    file_hash = Column(LargeBinary(32), nullable=True, index=True)  # SHA256 binario para detección de duplicados
 
     # Clasificación
     media_type = Column(
@@ -65,7 +65,7 @@ class Media(Base):
     staff_id = Column(Integer, ForeignKey("staff.id", ondelete="CASCADE"), nullable=True, index=True)
     room_id = Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"), nullable=True, index=True)
     maintenance_id = Column(Integer, ForeignKey("maintenances.id", ondelete="CASCADE"), nullable=True, index=True)
-    payment_id = Column(Integer, ForeignKey("payments.id", ondelete="CASCADE"), nullable=True, index=True)
+    payment_id = Column(BigInteger, ForeignKey("payments.id", ondelete="CASCADE"), nullable=True, index=True)
 
     # Metadatos
     title = Column(String(200), nullable=True)  # Título descriptivo
@@ -74,7 +74,7 @@ class Media(Base):
 
     # Auditoría
     uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=True)
-    uploaded_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    uploaded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     is_primary = Column(Boolean, nullable=False, default=False, server_default="0")
 
     # Relaciones
@@ -85,6 +85,21 @@ class Media(Base):
     payment = relationship("Payment")
     uploader = relationship("User", foreign_keys=[uploaded_by])
 
+    __table_args__ = (
+        # Rangos por fecha de subida: BRIN, las filas se insertan en orden cronológico
+        Index(
+            "idx_media_uploaded_at_brin",
+            uploaded_at,
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+    )
+
+    @property
+    def file_hash_hex(self) -> str | None:
+        """Retorna el hash SHA256 en hexadecimal."""
+        return self.file_hash.hex() if self.file_hash else None
+
     @property
     def file_size_mb(self) -> float:
         """Retorna el tamaño del archivo en MB."""
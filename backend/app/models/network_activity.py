@@ -5,14 +5,13 @@ Modelo para registrar actividad de red de dispositivos de huéspedes.
 """
 from __future__ import annotations
 
-from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import BigInteger, Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Boolean, Column, Computed, DateTime, Float, ForeignKey, Index, Integer, Sequence, String, insert, text
 from sqlalchemy import Enum as SAEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, relationship
 
-from ..core.db import Base
+from ..core.db import Base, BigIntPK, utcnow
 
 
 class ActivityType(str, Enum):
@@ -25,14 +24,19 @@ class ActivityType(str, Enum):
 
 
 class NetworkActivity(Base):
-    """Registro de actividad de red de dispositivos."""
+    """
+    Registro de actividad de red de dispositivos.
+    En PostgreSQL la tabla está particionada por mes sobre timestamp (clave primaria
+    (id, timestamp)); ver services/network_activity_partitions.py.
+    """
     __tablename__ = "network_activities"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # Secuencia en lugar de IDENTITY: PostgreSQL 16 no admite IDENTITY en tablas particionadas
+    id = Column(BigIntPK, Sequence("network_activities_id_seq"), primary_key=True, index=True)
 
     # Relaciones
     device_id = Column(Integer, ForeignKey("devices.id", ondelete="CASCADE"), nullable=False, index=True)
-    guest_id = Column(Integer, ForeignKey("guests.id"), nullable=False, index=True)
+    guest_id = Column(Integer, ForeignKey("guests.id"), nullable=False)
 
     # Información de la actividad
     activity_type = Column(
@@ -40,12 +44,18 @@ class NetworkActivity(Base):
         nullable=False,
         index=True
     )
-    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, nullable=False, server_default=utcnow(), index=True)
 
     # Datos de conexión (opcionales, depende del router)
     ip_address = Column(String(45), nullable=True)  # IPv4 o IPv6
     bytes_downloaded = Column(BigInteger, nullable=True, default=0)  # Bytes descargados
     bytes_uploaded = Column(BigInteger, nullable=True, default=0)  # Bytes subidos
+    # Total calculado por la base de datos (upload + download); usable en WHERE/ORDER BY/SUM
+    total_bytes = Column(
+        BigInteger,
+        Computed("COALESCE(bytes_downloaded, 0) + COALESCE(bytes_uploaded, 0)", persisted=True),
+        index=True,
+    )
     session_duration_seconds = Column(Integer, nullable=True)  # Duración de la sesión
 
     # Metadatos
@@ -56,17 +66,31 @@ class NetworkActivity(Base):
     device = relationship("Device")
     guest = relationship("Guest")
 
-    @property
-    def total_bytes(self) -> int:
-        """Total de bytes transferidos (upload + download)."""
-        return (self.bytes_downloaded or 0) + (self.bytes_uploaded or 0)
+    __table_args__ = (
+        # Actividad reciente por huésped: cubre también los filtros solo por guest_id
+        Index("ix_na_guest_timestamp", "guest_id", timestamp.desc()),
+    )
 
     @property
     def total_mb(self) -> float:
         """Total de MB transferidos."""
-        return self.total_bytes / (1024 * 1024)
+        return (self.total_bytes or 0) / (1024 * 1024)
 
     @property
     def total_gb(self) -> float:
         """Total de GB transferidos."""
-        return self.total_bytes / (1024 * 1024 * 1024)
+        return (self.total_bytes or 0) / (1024 * 1024 * 1024)
+
+    @classmethod
+    def bulk_log(cls, db: Session, events: list[dict], async_commit: bool = False) -> None:
+        """
+        Registra varios eventos con un único INSERT de múltiples VALUES.
+        Con async_commit=True en PostgreSQL se usa synchronous_commit=OFF para toda la
+        transacción actual: el commit no espera el fsync del WAL (solo para datos
+        que se pueden perder ante una caída del servidor).
+        """
+        if not events:
+            return
+        if async_commit and db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SET LOCAL synchronous_commit = OFF"))
+        db.execute(insert(cls), events)
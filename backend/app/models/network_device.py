@@ -9,11 +9,12 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text, Float
+from sqlalchemy import Boolean, Computed, DateTime, Index, Integer, LargeBinary, String, Text, Float, func, text, type_coerce
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 
-from ..core.db import Base
+from ..core.db import ENCRYPTION_KEY_SETTING, Base, utcnow
 
 
 class DeviceBrand(str, Enum):
@@ -58,6 +59,32 @@ class AuthType(str, Enum):
     SSH_KEY = "ssh_key"  # Clave SSH
 
 
+class PgpEncryptedString(TypeDecorator):
+    """
+    Texto cifrado en PostgreSQL con pgcrypto (columna bytea).
+    El cifrado y descifrado ocurren en el servidor con pgp_sym_encrypt/pgp_sym_decrypt;
+    el ORM sigue leyendo y escribiendo str. No sirve para filtrar por igualdad.
+    La clave se toma de la variable que install_encryption_key fija en cada transacción.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def bind_expression(self, bindvalue):
+        # El valor se envía como text: no existe pgp_sym_encrypt(bytea, text)
+        return func.pgp_sym_encrypt(
+            type_coerce(bindvalue, String), func.current_setting(ENCRYPTION_KEY_SETTING)
+        )
+
+    def column_expression(self, col):
+        return func.pgp_sym_decrypt(col, func.current_setting(ENCRYPTION_KEY_SETTING), type_=String)
+
+
+def encrypted_string(length: int):
+    """Columna cifrada en PostgreSQL; en SQLite (desarrollo/tests) se guarda como texto."""
+    return PgpEncryptedString().with_variant(String(length), "sqlite")
+
+
 class NetworkDevice(Base):
     """Dispositivo de red integrado para control de internet."""
     __tablename__ = "network_devices"
@@ -65,17 +92,15 @@ class NetworkDevice(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
     # Información básica del dispositivo
-    name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     brand: Mapped[DeviceBrand] = mapped_column(
         SAEnum(DeviceBrand, name="device_brand", create_constraint=True),
         nullable=False,
-        index=True
     )
     device_type: Mapped[DeviceType] = mapped_column(
         SAEnum(DeviceType, name="device_type", create_constraint=True),
         nullable=False,
-        index=True
     )
 
     # Ubicación y red
@@ -89,9 +114,9 @@ class NetworkDevice(Base):
         nullable=False
     )
     username: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    password: Mapped[str | None] = mapped_column(String(255), nullable=True)  # Encriptada en prod
-    api_key: Mapped[str | None] = mapped_column(String(500), nullable=True)  # Token/clave API
-    api_secret: Mapped[str | None] = mapped_column(String(500), nullable=True)  # Secret adicional
+    password: Mapped[str | None] = mapped_column(encrypted_string(255), nullable=True)
+    api_key: Mapped[str | None] = mapped_column(encrypted_string(500), nullable=True)  # Token/clave API
+    api_secret: Mapped[str | None] = mapped_column(encrypted_string(500), nullable=True)  # Secret adicional
     certificate_path: Mapped[str | None] = mapped_column(String(500), nullable=True)  # Ruta del certificado
 
     # Configuración de conexión
@@ -101,7 +126,7 @@ class NetworkDevice(Base):
     timeout_seconds: Mapped[int] = mapped_column(Integer, default=30)
 
     # Estado del dispositivo
-    is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     connection_status: Mapped[ConnectionStatus] = mapped_column(
         SAEnum(ConnectionStatus, name="connection_status", create_constraint=True),
         default=ConnectionStatus.DISCONNECTED,
@@ -114,7 +139,16 @@ class NetworkDevice(Base):
     # Estadísticas de sincronización
     total_operations: Mapped[int] = mapped_column(Integer, default=0)
     failed_operations: Mapped[int] = mapped_column(Integer, default=0)
-    success_rate: Mapped[float] = mapped_column(Float, default=100.0)  # Porcentaje
+    # Porcentaje calculado por la base de datos a partir de los contadores
+    success_rate: Mapped[float] = mapped_column(
+        Float,
+        Computed(
+            "CASE WHEN total_operations = 0 THEN 100.0 "
+            "ELSE 100.0 * (total_operations - failed_operations) / total_operations END",
+            persisted=True,
+        ),
+        index=True,
+    )
 
     # Capacidades del dispositivo
     supports_mac_blocking: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -127,10 +161,21 @@ class NetworkDevice(Base):
     vendor_config: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON con config específica
 
     # Auditoría
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
     created_by: Mapped[int | None] = mapped_column(Integer, nullable=True)  # User ID
 
+    __table_args__ = (
+        # Los listados filtran dispositivos activos por estado de conexión
+        Index("ix_nd_active_status", "is_active", "connection_status"),
+        # Índice parcial: solo los dispositivos activos y conectados
+        Index(
+            "ix_active_devices",
+            "ip_address",
+            postgresql_where=text("is_active AND connection_status = 'connected'"),
+        ),
+    )
+
     @property
     def is_connected(self) -> bool:
         """Verifica si el dispositivo está conectado."""
@@ -139,9 +184,8 @@ class NetworkDevice(Base):
     @property
     def health_percentage(self) -> float:
         """Porcentaje de salud del dispositivo basado en tasa de éxito."""
-        if self.total_operations == 0:
-            return 100.0
         return self.success_rate
 
     def __repr__(self) -> str:
-        return f"<NetworkDevice({self.name}, {self.brand.value}, {self.connection_status.value})>"
+        # Solo __dict__: no dispara cargas perezosas en instancias expiradas o desconectadas
+        return f"<NetworkDevice id={self.__dict__.get('id')}>"
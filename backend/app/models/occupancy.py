@@ -5,19 +5,17 @@ Registra check-in/check-out real de huéspedes en habitaciones.
 """
 from __future__ import annotations
 
-from datetime import datetime
-
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Identity, Index, Integer, Numeric, String, Text, text
 from sqlalchemy.orm import relationship
 
-from ..core.db import Base
+from ..core.db import Base, BigIntPK, utcnow
 
 
 class Occupancy(Base):
     """Registro de ocupación real de una habitación por un huésped."""
     __tablename__ = "occupancies"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigIntPK, Identity(), primary_key=True, index=True)
 
     # Relaciones
     room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False, index=True)
@@ -25,12 +23,12 @@ class Occupancy(Base):
     reservation_id = Column(Integer, ForeignKey("reservations.id"), nullable=True)  # Puede ser walk-in
 
     # Fechas y tiempos
-    check_in = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    check_in = Column(DateTime, nullable=False, server_default=utcnow(), index=True)
     check_out = Column(DateTime, nullable=True, index=True)  # Null si aún está ocupado
 
     # Información financiera
-    amount_paid_bs = Column(Float, nullable=True)  # Monto pagado en bolívares
-    amount_paid_usd = Column(Float, nullable=True)  # Monto pagado en dólares (común en Venezuela)
+    amount_paid_bs = Column(Numeric(14, 2, asdecimal=False), nullable=True)  # Monto pagado en bolívares
+    amount_paid_usd = Column(Numeric(14, 2, asdecimal=False), nullable=True)  # Monto pagado en dólares (común en Venezuela)
     payment_method = Column(String(50), nullable=True)  # efectivo, transferencia, zelle, paypal, etc.
 
     # Notas
@@ -41,6 +39,11 @@ class Occupancy(Base):
     guest = relationship("Guest")
     reservation = relationship("Reservation")
 
+    __table_args__ = (
+        # Índice parcial: "¿la habitación está ocupada ahora?" sin recorrer el histórico
+        Index("ix_open_occupancies", "room_id", postgresql_where=text("check_out IS NULL")),
+    )
+
     @property
     def is_active(self) -> bool:
         """Verifica si la ocupación está activa (no ha hecho check-out)."""
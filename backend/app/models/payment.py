@@ -5,14 +5,15 @@ Soporta EUR, VES (Bolívares), USD con conversión automática.
 """
 from __future__ import annotations
 
-from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text, JSON, Boolean, Index
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Identity, Integer, Numeric, String, Text, JSON, Boolean, Index, func, text
 from sqlalchemy import Enum as SAEnum
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.hybrid import hybrid_method
 from sqlalchemy.orm import relationship
 
-from ..core.db import Base
+from ..core.db import Base, BigIntPK, utcnow
 
 
 class Currency(str, Enum):
@@ -47,15 +48,15 @@ class Payment(Base):
     """Registro de pagos del hostal con soporte multimoneda."""
     __tablename__ = "payments"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigIntPK, Identity(), primary_key=True, index=True)
 
     # Relaciones
-    guest_id = Column(Integer, ForeignKey("guests.id"), nullable=False, index=True)
+    guest_id = Column(Integer, ForeignKey("guests.id"), nullable=False)  # Cubierto por idx_payment_guest_date
     reservation_id = Column(Integer, ForeignKey("reservations.id"), nullable=True, index=True)
-    occupancy_id = Column(Integer, ForeignKey("occupancies.id"), nullable=True, index=True)
+    occupancy_id = Column(BigInteger, ForeignKey("occupancies.id"), nullable=True, index=True)
 
     # Información del pago
-    amount = Column(Float, nullable=False)  # Monto en la moneda original
+    amount = Column(Numeric(14, 2, asdecimal=False), nullable=False)  # Monto en la moneda original
     currency = Column(
         SAEnum(Currency, name="currency", create_constraint=True),
         nullable=False,
@@ -63,14 +64,14 @@ class Payment(Base):
     )
 
     # Conversiones a otras monedas (calculadas en el momento del pago)
-    amount_eur = Column(Float, nullable=True)  # Equivalente en EUR
-    amount_usd = Column(Float, nullable=True)  # Equivalente en USD
-    amount_ves = Column(Float, nullable=True)  # Equivalente en VES
+    amount_eur = Column(Numeric(14, 2, asdecimal=False), nullable=True)  # Equivalente en EUR
+    amount_usd = Column(Numeric(14, 2, asdecimal=False), nullable=True)  # Equivalente en USD
+    amount_ves = Column(Numeric(14, 2, asdecimal=False), nullable=True)  # Equivalente en VES
 
     # Tasa de cambio usada
-    exchange_rate_eur = Column(Float, nullable=True)  # Tasa EUR usada
-    exchange_rate_usd = Column(Float, nullable=True)  # Tasa USD usada
-    exchange_rate_ves = Column(Float, nullable=True)  # Tasa VES usada
+    exchange_rate_eur = Column(Numeric(18, 8, asdecimal=False), nullable=True)  # Tasa EUR usada
+    exchange_rate_usd = Column(Numeric(18, 8, asdecimal=False), nullable=True)  # Tasa USD usada
+    exchange_rate_ves = Column(Numeric(18, 8, asdecimal=False), nullable=True)  # Tasa VES usada
 
     # Detalles del pago
     method = Column(
@@ -87,17 +88,17 @@ class Payment(Base):
     # Información adicional
     reference_number = Column(String(100), nullable=True)  # Número de referencia/transacción
     notes = Column(Text, nullable=True)
-    payment_date = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    payment_date = Column(DateTime, nullable=False, server_default=utcnow(), index=True)
 
     # ===== Campos para Stripe (NEW) =====
     # IDs de Stripe
-    stripe_payment_intent_id = Column(String(255), nullable=True, unique=True, index=True)  # pi_xxx
-    stripe_charge_id = Column(String(255), nullable=True, unique=True, index=True)  # ch_xxx
+    stripe_payment_intent_id = Column(String(255), nullable=True, unique=True)  # pi_xxx
+    stripe_charge_id = Column(String(255), nullable=True, unique=True)  # ch_xxx
     stripe_payment_method_id = Column(String(255), nullable=True)  # pm_xxx
 
     # Información de la transacción Stripe
     stripe_status = Column(String(50), nullable=True)  # succeeded, processing, requires_action, etc
-    stripe_metadata = Column(JSON, nullable=True)  # Metadata guardada en Stripe
+    stripe_metadata = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # Metadata guardada en Stripe
     stripe_error_code = Column(String(100), nullable=True)  # Código de error si falló
     stripe_error_message = Column(Text, nullable=True)  # Mensaje de error detallado
 
@@ -114,8 +115,8 @@ class Payment(Base):
 
     # Auditoría
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)  # Usuario que registró
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow(), index=True)
+    updated_at = Column(DateTime, nullable=False, server_default=utcnow(), onupdate=utcnow())
 
     # Relaciones
     guest = relationship("Guest")
@@ -123,15 +124,28 @@ class Payment(Base):
     occupancy = relationship("Occupancy")
     creator = relationship("User", foreign_keys=[created_by])
 
-    # Índices para queries de Stripe
+    # Los IDs de Stripe se buscan por sus restricciones UNIQUE
     __table_args__ = (
-        Index("idx_payment_stripe_intent", stripe_payment_intent_id),
-        Index("idx_payment_stripe_charge", stripe_charge_id),
         Index("idx_payment_status_date", status, payment_date),
-        Index("idx_payment_guest_date", guest_id, payment_date),
+        # Índice parcial: cola de pagos pendientes
+        Index("ix_payments_pending", payment_date, postgresql_where=text("status = 'pending'")),
+        # Índice de cobertura: el historial de pagos por huésped se resuelve sin leer la tabla
+        Index(
+            "idx_payment_guest_date",
+            guest_id,
+            payment_date,
+            postgresql_include=["amount", "currency", "status"],
+        ),
+        # Conciliación de webhooks: stripe_metadata @> '{"order_id": "..."}'
+        Index(
+            "ix_payment_stripe_meta",
+            stripe_metadata,
+            postgresql_using="gin",
+            postgresql_ops={"stripe_metadata": "jsonb_path_ops"},
+        ),
     )
 
-    @property
+    @hybrid_method
     def amount_in_currency(self, target_currency: str) -> float:
         """Retorna el monto en la moneda especificada."""
         if target_currency == "EUR":
@@ -141,3 +155,11 @@ class Payment(Base):
         elif target_currency == "VES":
             return self.amount_ves or 0
         return self.amount
+
+    @amount_in_currency.expression
+    def amount_in_currency(cls, target_currency: str):
+        """Expresión SQL equivalente, p. ej. func.sum(Payment.amount_in_currency("USD"))."""
+        column = {"EUR": cls.amount_eur, "USD": cls.amount_usd, "VES": cls.amount_ves}.get(target_currency)
+        if column is None:
+            return cls.amount
+        return func.coalesce(column, 0)
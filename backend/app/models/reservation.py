@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import enum
 
-from sqlalchemy import Column, Date, Enum, Float, ForeignKey, Index, Integer, Text
+from sqlalchemy import Column, Date, Enum, ForeignKey, Index, Integer, Numeric, Text, func, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -22,6 +23,10 @@ class ReservationStatus(str, enum.Enum):
     cancelled = "cancelled"
 
 
+# Tipo único "period" compartido por reservations y room_rates (VARCHAR + CHECK, sin ENUM nativo)
+PeriodType = Enum(Period, name="period", native_enum=False, create_constraint=True, length=32)
+
+
 class Reservation(Base):
     __tablename__ = "reservations"
 
@@ -30,14 +35,25 @@ class Reservation(Base):
     room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
-    period = Column(Enum(Period), nullable=False)
+    period = Column(PeriodType, nullable=False)
     periods_count = Column(Integer, nullable=False)
-    price_bs = Column(Float, nullable=False)
+    price_bs = Column(Numeric(14, 2, asdecimal=False), nullable=False)
     status = Column(Enum(ReservationStatus), nullable=False, default=ReservationStatus.pending)
     notes = Column(Text)
     cancellation_reason = Column(Text)
 
     guest = relationship("Guest")
-    room = relationship("Room")
-
-    __table_args__ = (Index("ix_res_room_range", "room_id", "start_date", "end_date"),)
+    room = relationship("Room", back_populates="reservations")
+
+    __table_args__ = (
+        Index("ix_res_room_range", "room_id", "start_date", "end_date"),
+        # PostgreSQL: impide reservas solapadas en la misma habitación (requiere btree_gist).
+        # El rango es [inicio, fin) para permitir salida y entrada el mismo día.
+        ExcludeConstraint(
+            (room_id, "="),
+            (func.daterange(start_date, end_date, "[)"), "&&"),
+            using="gist",
+            name="res_no_overlap",
+            where=text("status IN ('pending', 'active')"),
+        ).ddl_if(dialect="postgresql"),
+    )
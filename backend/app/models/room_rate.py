@@ -1,21 +1,32 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, Enum, Float, ForeignKey, Integer, String, UniqueConstraint
-from sqlalchemy.orm import relationship
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
-from app.models.reservation import Period
+from app.models.reservation import Period, PeriodType
 
 
 class RoomRate(Base):
     __tablename__ = "room_rates"
 
-    id = Column(Integer, primary_key=True)
-    room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False)
-    period = Column(Enum(Period), nullable=False)  # <-- Enum consistente
-    price_bs = Column(Float, nullable=False)
-    currency_note = Column(String(50), nullable=True)  # Nota sobre moneda/tipo de cambio
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    room_id: Mapped[int] = mapped_column(Integer, ForeignKey("rooms.id"), nullable=False)
+    period: Mapped[Period] = mapped_column(PeriodType, nullable=False)  # <-- Enum consistente
+    price_bs: Mapped[float] = mapped_column(Numeric(14, 2, asdecimal=False), nullable=False)
+    currency_note: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # Nota sobre moneda/tipo de cambio
 
-    room = relationship("Room")
+    # raise_on_sql: un acceso perezoso que emita SQL falla en lugar de generar N+1;
+    # la habitación se resuelve desde el identity map o con selectinload explícito
+    room = relationship("Room", back_populates="rates", lazy="raise_on_sql")
 
-    __table_args__ = (UniqueConstraint("room_id", "period", name="uq_room_rate_room_period"),)
+    __table_args__ = (
+        # DEFERRABLE: las cargas masivas pueden diferir la verificación hasta el COMMIT.
+        # SQLite no admite DEFERRABLE en UNIQUE, allí se crea la restricción simple.
+        UniqueConstraint(
+            "room_id", "period", name="uq_room_rate_room_period", deferrable=True, initially="IMMEDIATE"
+        ).ddl_if(dialect="postgresql"),
+        UniqueConstraint("room_id", "period", name="uq_room_rate_room_period").ddl_if(dialect="sqlite"),
+    )
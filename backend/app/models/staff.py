@@ -2,14 +2,15 @@
 """Modelo para personal del hostal (limpieza, mantenimiento, recepción, etc.)."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
+from typing import Optional
 
-from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, Numeric, String, Text
 from sqlalchemy import Enum as SAEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from ..core.db import Base
+from ..core.db import Base, utcnow
 
 
 class StaffRole(str, Enum):
@@ -29,43 +30,45 @@ class StaffStatus(str, Enum):
     terminated = "terminated"  # Desvinculado
 
 
+# Tipos de columna construidos una sola vez por proceso y reutilizados.
+# VARCHAR + CHECK en lugar de ENUM nativo: agregar un valor no requiere ALTER TYPE
+StaffRoleType = SAEnum(StaffRole, name="staff_role", native_enum=False, create_constraint=True, length=32)
+StaffStatusType = SAEnum(StaffStatus, name="staff_status", native_enum=False, create_constraint=True, length=32)
+
+
 class Staff(Base):
     """Personal del hostal."""
     __tablename__ = "staff"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
     # Información personal
-    full_name = Column(String(255), nullable=False, index=True)
-    document_id = Column(String(100), unique=True, nullable=False, index=True)  # Cédula venezolana
-    phone = Column(String(50), nullable=True)
-    email = Column(String(255), nullable=True)
+    full_name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    document_id: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, index=True)  # Cédula venezolana
+    phone: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
     # Información laboral
-    role = Column(
-        SAEnum(StaffRole, name="staff_role", create_constraint=True),
-        nullable=False,
-        index=True
-    )
-    status = Column(
-        SAEnum(StaffStatus, name="staff_status", create_constraint=True),
+    role: Mapped[StaffRole] = mapped_column(StaffRoleType, nullable=False, index=True)
+    status: Mapped[StaffStatus] = mapped_column(
+        StaffStatusType,
         nullable=False,
         default=StaffStatus.active,
         server_default="active",
         index=True
     )
-    hire_date = Column(Date, nullable=True)  # Fecha de contratación
-    salary = Column(Float, nullable=True)  # Salario
+    hire_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)  # Fecha de contratación
+    salary: Mapped[Optional[float]] = mapped_column(Numeric(14, 2, asdecimal=False), nullable=True)  # Salario
 
     # Notas
-    notes = Column(Text, nullable=True)
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Sistema de usuarios - Un empleado puede estar asociado a una cuenta del sistema
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, unique=True, index=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True, unique=True, index=True)
 
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default="now()")
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default="now()", onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=utcnow())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=utcnow(), onupdate=utcnow())
 
     # Relaciones
     devices = relationship("Device", back_populates="staff", cascade="all, delete-orphan")
@@ -0,0 +1,207 @@
+# app/models/stripe_webhook_event.py
+"""
+Modelo para eventos de webhook recibidos de Stripe.
+Cada evento se registra una sola vez por event_id (Stripe reintenta las entregas).
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+from sqlalchemy import Boolean, DateTime, Index, Integer, JSON, String, Text, insert, text
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from ..core.db import Base, utcnow
+
+
+class WebhookEventType(str, Enum):
+    """Tipos de eventos de Stripe que se registran."""
+    payment_intent_succeeded = "payment_intent.succeeded"
+    payment_intent_payment_failed = "payment_intent.payment_failed"
+    payment_intent_canceled = "payment_intent.canceled"
+    payment_intent_amount_capturable_updated = "payment_intent.amount_capturable_updated"
+    charge_succeeded = "charge.succeeded"
+    charge_failed = "charge.failed"
+    charge_refunded = "charge.refunded"
+    charge_captured = "charge.captured"
+    charge_dispute_created = "charge.dispute.created"
+    customer_created = "customer.created"
+    customer_updated = "customer.updated"
+    customer_deleted = "customer.deleted"
+    payment_method_attached = "payment_method.attached"
+    payment_method_detached = "payment_method.detached"
+
+
+class WebhookProcessingStatus(str, Enum):
+    """Estado de procesamiento de un evento."""
+    pending = "pending"
+    processing = "processing"
+    success = "success"
+    failed = "failed"
+    skipped = "skipped"
+    retry = "retry"
+
+
+def _enum_values(enum_cls) -> list[str]:
+    # Los tipos de la BD guardan el valor ("charge.succeeded"), no el nombre del miembro
+    return [member.value for member in enum_cls]
+
+
+class StripeWebhookEvent(Base):
+    """Evento de webhook de Stripe recibido."""
+    __tablename__ = "stripe_webhook_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    event_id: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    event_type: Mapped[WebhookEventType] = mapped_column(
+        SAEnum(WebhookEventType, name="webhook_event_type", values_callable=_enum_values),
+        nullable=False,
+    )
+    event_timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+
+    # Referencias de Stripe extraídas del payload
+    payment_intent_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    charge_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    customer_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    amount: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # En centavos, como lo envía Stripe
+    currency: Mapped[Optional[str]] = mapped_column(String(3), nullable=True)
+
+    # Procesamiento
+    processing_status: Mapped[WebhookProcessingStatus] = mapped_column(
+        SAEnum(WebhookProcessingStatus, name="webhook_processing_status", values_callable=_enum_values),
+        nullable=False,
+        server_default="pending",
+    )
+    processed: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    error_traceback: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    retry_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_retry_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    next_retry_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    received_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=utcnow())
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=utcnow())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=utcnow(), onupdate=utcnow()
+    )
+
+    __table_args__ = (
+        # Parciales: la ingesta solo mantiene las entradas pendientes o por reintentar
+        Index(
+            "idx_webhook_event_status_timestamp",
+            event_timestamp,
+            postgresql_where=text("processing_status = 'pending'"),
+        ),
+        Index("idx_webhook_event_type_timestamp", event_type, event_timestamp),
+        Index("idx_webhook_payment_intent", payment_intent_id),
+        Index("idx_webhook_charge", charge_id),
+        # Búsquedas de auditoría dentro del payload: payload ? 'livemode', payload @> '{...}'
+        Index("idx_webhook_payload_gin", payload, postgresql_using="gin"),
+        # BRIN: received_at crece con el orden de inserción; índice mínimo para rangos de fechas
+        Index("idx_webhook_received_brin", received_at, postgresql_using="brin"),
+        Index(
+            "idx_webhook_retry",
+            next_retry_at,
+            postgresql_where=text("processing_status IN ('retry', 'failed') AND next_retry_at IS NOT NULL"),
+        ),
+    )
+
+    @classmethod
+    def try_insert(
+        cls,
+        db: Session,
+        event_id: str,
+        event_type: WebhookEventType,
+        event_timestamp: datetime,
+        payload: dict,
+        **fields,
+    ) -> Optional[int]:
+        """
+        Registra el evento con INSERT ... ON CONFLICT (event_id) DO NOTHING RETURNING id.
+        Devuelve el id nuevo, o None si el evento ya se había recibido (entrega duplicada):
+        la deduplicación cuesta una sola consulta contra el índice único de event_id.
+        """
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = (
+            dialect.insert(cls)
+            .values(
+                event_id=event_id,
+                event_type=event_type,
+                event_timestamp=event_timestamp,
+                payload=payload,
+                **fields,
+            )
+            .on_conflict_do_nothing(index_elements=["event_id"])
+            .returning(cls.id)
+        )
+        return db.execute(stmt).scalar_one_or_none()
+
+
+class StripeWebhookLog(Base):
+    """Traza de cada paso del procesamiento de un evento de webhook."""
+    __tablename__ = "stripe_webhook_logs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    webhook_event_id: Mapped[int] = mapped_column(Integer, nullable=False)  # stripe_webhook_events.id
+    event_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    action: Mapped[str] = mapped_column(String(100), nullable=False)  # received, verified, processing, success...
+    status: Mapped[str] = mapped_column(String(50), nullable=False)
+    message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    details: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=utcnow())
+
+    __table_args__ = (
+        Index("idx_webhook_log_event", event_id),
+        Index("idx_webhook_log_action", action),
+        Index("idx_webhook_log_created", created_at),
+    )
+
+
+class WebhookLogBuffer:
+    """
+    Acumula las entradas de StripeWebhookLog de un evento y las inserta al salir
+    del bloque con un único INSERT de múltiples VALUES (no se escribe si hubo excepción).
+    """
+
+    def __init__(self, db: Session, webhook_event_id: int, event_id: str):
+        self.db = db
+        self.webhook_event_id = webhook_event_id
+        self.event_id = event_id
+        self.rows: list[dict[str, Any]] = []
+
+    def add(
+        self,
+        action: str,
+        status: str,
+        message: Optional[str] = None,
+        details: Optional[dict] = None,
+        duration_ms: Optional[int] = None,
+    ) -> None:
+        self.rows.append({
+            "webhook_event_id": self.webhook_event_id,
+            "event_id": self.event_id,
+            "action": action,
+            "status": status,
+            "message": message,
+            "details": details,
+            "duration_ms": duration_ms,
+        })
+
+    def flush(self) -> None:
+        if self.rows:
+            self.db.execute(insert(StripeWebhookLog), self.rows)
+            self.rows = []
+
+    def __enter__(self) -> "WebhookLogBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
@@ -1,9 +1,17 @@
-from sqlalchemy import String, Boolean, DateTime
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Boolean, DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column, validates
 from typing import Optional
 from datetime import datetime
 
-from ..core.db import Base
+from ..core.cache import cache
+from ..core.db import Base, utcnow
+
+# Datos mínimos para autenticar, cacheados por email en Redis: cada intento de login
+# (incluidos los de fuerza bruta) se resuelve sin consultar la BD mientras dure el TTL.
+# Sin caché compartida no se cachean: invalidar en un worker no alcanzaría a los demás
+# y la contraseña anterior seguiría sirviendo en ellos
+LOGIN_CACHE_TTL = 60
+LOGIN_CACHE_PREFIX = "user_login:"
 
 
 class User(Base):
@@ -14,6 +22,37 @@ class User(Base):
     role: Mapped[str] = mapped_column(String(50), default="user")
     approved: Mapped[bool] = mapped_column(Boolean, default=False)
     full_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), index=True)
     reset_password_token: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     reset_password_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Índice parcial: solo las cuentas pendientes de aprobación (pocas filas)
+        Index("ix_user_pending", "id", postgresql_where=text("NOT approved")),
+    )
+
+    @validates("email")
+    def _normalize_email(self, key, value):
+        # Los emails se guardan en minúsculas: las búsquedas comparan contra email.lower()
+        # y usan directamente el índice único de email
+        return value.lower() if value else value
+
+    @classmethod
+    def get_login_record(cls, db, email: str) -> dict | None:
+        """id, hashed_password, role y approved del usuario con ese email (en Redis por LOGIN_CACHE_TTL)."""
+        email = email.lower()
+
+        def load() -> dict | None:
+            row = (
+                db.query(cls.id, cls.hashed_password, cls.role, cls.approved)
+                .filter(cls.email == email)
+                .first()
+            )
+            return dict(row._mapping) if row else None
+
+        return cache.get_or_set(f"{LOGIN_CACHE_PREFIX}{email}", load, LOGIN_CACHE_TTL, shared_only=True)
+
+    @staticmethod
+    def invalidate_login_cache() -> None:
+        """Descarta los datos de login cacheados; llamar después de crear, modificar o borrar usuarios."""
+        cache.invalidate(LOGIN_CACHE_PREFIX)
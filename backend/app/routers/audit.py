@@ -16,6 +16,10 @@ from app.schemas.audit import AuditLogOut, AuditSummary
 
 router = APIRouter(prefix="/audit", tags=["Audit"])
 
+# Los listados son de solo lectura (hasta 1000 filas): se leen columnas en lugar de
+# entidades para no crear estado ORM ni entradas en el identity map por fila.
+AUDIT_LOG_COLUMNS = tuple(AuditLog.__table__.columns)
+
 
 @router.get("/logs", response_model=list[AuditLogOut])
 def get_audit_logs(
@@ -60,7 +64,7 @@ def get_audit_logs(
         )
 
     # Construir query
-    query = db.query(AuditLog)
+    query = db.query(*AUDIT_LOG_COLUMNS)
 
     # Aplicar filtros
     if user_id:
@@ -114,7 +118,7 @@ def get_user_audit_logs(
         )
 
     logs = (
-        db.query(AuditLog)
+        db.query(*AUDIT_LOG_COLUMNS)
         .filter(AuditLog.user_id == user_id)
         .order_by(desc(AuditLog.timestamp))
         .offset(offset)
@@ -156,8 +160,8 @@ def get_audit_summary(
             AuditLog.user_role,
             func.count(AuditLog.id).label("total_actions"),
             func.max(AuditLog.timestamp).label("last_action"),
-            func.sum(func.cast(~AuditLog.success, db.Integer)).label("failed_actions"),
-            func.sum(func.cast(AuditLog.success, db.Integer)).label("successful_actions"),
+            func.count().filter(AuditLog.success.is_(False)).label("failed_actions"),
+            func.count().filter(AuditLog.success.is_(True)).label("successful_actions"),
         )
         .filter(AuditLog.timestamp >= cutoff_date)
         .filter(AuditLog.user_id.isnot(None))
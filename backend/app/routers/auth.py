@@ -1,29 +1,107 @@
 # app/routers/auth.py
 from datetime import datetime, timedelta
+import hmac
 import secrets
+from html import escape
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import delete
+from sqlalchemy.orm import Session, load_only
 
 from app.core.audit import log_login, log_action
 from app.core.config import settings
 from app.core.db import get_db
-from app.core.limiter import limiter
-from app.core.security import create_access_token, get_current_user, hash_password, verify_password
+from app.core.limiter import hit_email_limit, limiter
+from app.core.bcrypt_pool import ahash, averify
+from app.core.security import (
+    ASSIGNABLE_ROLES,
+    ASSIGNABLE_ROLES_TEXT,
+    create_access_token,
+    get_current_user,
+    hash_password,
+    hash_reset_token,
+    password_needs_rehash,
+)
 from app.models.user import User
 from app.schemas.auth import TokenOut, UserApprovalIn, RegisterIn, ForgotPasswordIn, ResetPasswordIn
 from app.schemas.user import UserOut, UserPendingApprovalOut
-from app.core.email_service import send_email
+from app.services.email_outbox import enqueue_email
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+# Hash de relleno: cuando el email no existe se verifica contra este hash para que la
+# respuesta tarde lo mismo que con una contraseña incorrecta (no revela qué cuentas existen)
+_DUMMY_HASH = hash_password(secrets.token_urlsafe(32))
+
+_EMAIL_LIMIT_DETAIL = "Demasiadas solicitudes para este email. Intenta más tarde."
+
+# Correo de recuperación de contraseña; solo se completan nombre y enlace por request
+_FRONTEND_BASE = settings.FRONTEND_URL.rstrip("/")
+_RESET_SUBJECT = "Recupera tu contraseña"
+_RESET_TEXT_TEMPLATE = (
+    "Hola {name},\n\n"
+    "Recibimos una solicitud para restablecer tu contraseña en Hostal App.\n"
+    "Abre el siguiente enlace para continuar: {link}\n\n"
+    "Si no realizaste esta solicitud, puedes ignorar este correo."
+)
+_RESET_HTML_TEMPLATE = (
+    "<p>Hola <strong>{name}</strong>,</p>"
+    "<p>Haz clic en el siguiente botón para crear una nueva contraseña:</p>"
+    "<p><a href='{link}' target='_blank'>Restablecer contraseña</a></p>"
+    "<p>Si no fuiste tú quien solicitó el cambio, simplemente ignora este mensaje.</p>"
+)
+
+
+# Las rutas de login, registro y reseteo son async para esperar a bcrypt en su pool
+# (core/bcrypt_pool) sin ocupar hilos; el acceso a la BD, que sigue siendo síncrono,
+# se ejecuta con run_in_threadpool para no bloquear el event loop.
+def _find_user_for_reset(db: Session, email: str) -> User | None:
+    # Solo las columnas que usan el reseteo y la auditoría
+    return (
+        db.query(User)
+        .options(load_only(User.id, User.email, User.role, User.reset_password_token, User.reset_password_expires_at))
+        .filter(User.email == email)
+        .first()
+    )
+
+
+def _email_taken(db: Session, email: str) -> bool:
+    return db.query(db.query(User.id).filter(User.email == email).exists()).scalar()
+
+
+def _commit_user_changes(db: Session) -> None:
+    db.commit()
+    User.invalidate_login_cache()
+
+
+def _store_password_hash(db: Session, user_id: int, hashed_password: str) -> None:
+    db.get(User, user_id).hashed_password = hashed_password
+    _commit_user_changes(db)
+
+
+def _record_login(db: Session, email: str, success: bool, details: dict) -> None:
+    """Guarda el intento de login en auditoría antes de responder."""
+    log_login(user_email=email, success=success, details=details, db=db)
+    db.commit()
+
+
+def _save_new_user(db: Session, user: User) -> int:
+    """Inserta el usuario y devuelve su id (leído en el flush, antes de que el commit expire la instancia)."""
+    db.add(user)
+    db.flush()
+    user_id = user.id
+    _commit_user_changes(db)
+    return user_id
+
 
 @router.post("/login", response_model=TokenOut)
 @limiter.limit("5/minute")
-def login(
+async def login(
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ):
@@ -32,14 +110,18 @@ def login(
     Limitado a 5 intentos por minuto por IP.
     """
 
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await run_in_threadpool(User.get_login_record, db, form_data.username)
+    stored_hash = user["hashed_password"] if user else None
+    password_ok = await averify(form_data.password, stored_hash or _DUMMY_HASH)
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not stored_hash or not password_ok:
         # Log intento de login fallido
-        log_login(
-            user_email=form_data.username,
-            success=False,
-            details={"ip": request.client.host, "reason": "invalid_credentials"},
+        await run_in_threadpool(
+            _record_login,
+            db,
+            form_data.username,
+            False,
+            {"ip": request.client.host, "reason": "invalid_credentials"},
         )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,26 +129,36 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not user.approved:
-        log_login(
-            user_email=user.email,
-            success=False,
-            details={"ip": request.client.host, "reason": "user_not_approved"},
+    if not user["approved"]:
+        await run_in_threadpool(
+            _record_login,
+            db,
+            form_data.username,
+            False,
+            {"ip": request.client.host, "reason": "user_not_approved"},
         )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Usuario no aprobado. Contacta al administrador.",
         )
 
-    # Log login exitoso
-    log_login(
-        user_email=user.email,
+    # Recalcular el hash si su costo es menor que BCRYPT_ROUNDS o el esquema quedó obsoleto
+    if password_needs_rehash(stored_hash):
+        new_hash = await ahash(form_data.password)
+        await run_in_threadpool(_store_password_hash, db, user["id"], new_hash)
+
+    # Log login exitoso: se escribe después de enviar el token, con su propia sesión
+    # (cola del escritor de auditoría). Los intentos fallidos se registran antes de
+    # responder para no perderlos si el proceso cae.
+    background_tasks.add_task(
+        log_login,
+        user_email=form_data.username,
         success=True,
-        details={"ip": request.client.host, "user_id": user.id, "role": user.role},
+        details={"ip": request.client.host, "user_id": user["id"], "role": user["role"]},
     )
 
     expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    token_data = {"sub": str(user.id), "role": user.role}
+    token_data = {"sub": str(user["id"]), "role": user["role"]}
     access_token = create_access_token(token_data, expires_delta=expires)
 
     return {"access_token": access_token, "token_type": "bearer"}
@@ -74,7 +166,7 @@ def login(
 
 @router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
 @limiter.limit("3/minute")
-def register(
+async def register(
     request: Request,
     data: RegisterIn,
     db: Session = Depends(get_db),
@@ -85,8 +177,8 @@ def register(
     Limitado a 3 intentos por minuto por IP.
     """
     # Verificar si el email ya existe
-    existing_user = db.query(User).filter(User.email == data.email).first()
-    if existing_user:
+    email_taken = await run_in_threadpool(_email_taken, db, data.email.lower())
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El email ya está registrado",
@@ -95,21 +187,21 @@ def register(
     # Crear nuevo usuario con rol de "staff" por defecto
     new_user = User(
         email=data.email,
-        hashed_password=hash_password(data.password),
+        hashed_password=await ahash(data.password),
         role="staff",  # Rol por defecto para nuevos registros
         approved=False,  # Requiere aprobación del administrador
         full_name=data.full_name,
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    new_user_id = await run_in_threadpool(_save_new_user, db, new_user)
 
     # Log del registro
-    log_login(
-        user_email=data.email,
-        success=True,
-        details={
+    await run_in_threadpool(
+        _record_login,
+        db,
+        data.email,
+        True,
+        {
             "ip": request.client.host,
             "action": "user_registration",
             "status": "pending_approval",
@@ -119,45 +211,47 @@ def register(
 
     return {
         "message": "Registro exitoso. Tu cuenta está pendiente de aprobación por el administrador.",
-        "user_id": new_user.id,
-        "email": new_user.email,
+        "user_id": new_user_id,
+        "email": data.email.lower(),
         "status": "pending_approval",
     }
 
 
 @router.post("/password/forgot", response_model=dict)
+@limiter.limit("3/minute")
 def forgot_password(
+    request: Request,
     payload: ForgotPasswordIn,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
-    """Genera un token temporal y envía un enlace de recuperación."""
+    """
+    Genera un token temporal y envía un enlace de recuperación.
+    Limitado a 3 solicitudes por minuto por IP y 5 por hora por email.
+    """
     email = payload.email.lower()
-    user = db.query(User).filter(User.email == email).first()
+    if not hit_email_limit("password_forgot", email):
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=_EMAIL_LIMIT_DETAIL)
+    user = (
+        db.query(User)
+        .options(load_only(User.id, User.email, User.full_name))
+        .filter(User.email == email)
+        .first()
+    )
 
     if user:
         token = secrets.token_urlsafe(48)
-        user.reset_password_token = hash_password(token)
+        user.reset_password_token = hash_reset_token(token)
         user.reset_password_expires_at = datetime.utcnow() + timedelta(
             minutes=settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES
         )
-        db.commit()
 
-        reset_link = f"{settings.FRONTEND_URL.rstrip('/')}/reset-password?token={token}&email={user.email}"
-        subject = "Recupera tu contraseña"
-        text_body = (
-            f"Hola {user.full_name or 'usuario'},\n\n"
-            "Recibimos una solicitud para restablecer tu contraseña en Hostal App.\n"
-            f"Abre el siguiente enlace para continuar: {reset_link}\n\n"
-            "Si no realizaste esta solicitud, puedes ignorar este correo."
-        )
-        html_body = (
-            f"<p>Hola <strong>{user.full_name or 'usuario'}</strong>,</p>"
-            "<p>Haz clic en el siguiente botón para crear una nueva contraseña:</p>"
-            f"<p><a href='{reset_link}' target='_blank'>Restablecer contraseña</a></p>"
-            "<p>Si no fuiste tú quien solicitó el cambio, simplemente ignora este mensaje.</p>"
-        )
-        background_tasks.add_task(send_email, subject, user.email, text_body, html_body)
+        name = user.full_name or "usuario"
+        reset_link = f"{_FRONTEND_BASE}/reset-password?token={token}&email={user.email}"
+        text_body = _RESET_TEXT_TEMPLATE.format(name=name, link=reset_link)
+        html_body = _RESET_HTML_TEMPLATE.format(name=escape(name), link=escape(reset_link))
+        # El token y el correo se guardan juntos; el scheduler hace el envío SMTP
+        enqueue_email(db, _RESET_SUBJECT, user.email, text_body, html_body)
+        db.commit()
 
     return {
         "message": "Si el correo corresponde a un usuario registrado, enviaremos las instrucciones para restablecer la contraseña."
@@ -165,24 +259,34 @@ def forgot_password(
 
 
 @router.post("/password/reset", response_model=dict)
-def reset_password(payload: ResetPasswordIn, db: Session = Depends(get_db)):
-    """Permite definir una nueva contraseña utilizando el token enviado por correo."""
-    user = db.query(User).filter(User.email == payload.email.lower()).first()
+@limiter.limit("3/minute")
+async def reset_password(request: Request, payload: ResetPasswordIn, db: Session = Depends(get_db)):
+    """
+    Permite definir una nueva contraseña utilizando el token enviado por correo.
+    Limitado a 3 intentos por minuto por IP y 5 por hora por email.
+    """
+    # El contador por email vive en Redis: la llamada síncrona no debe bloquear el event loop
+    if not await run_in_threadpool(hit_email_limit, "password_reset", payload.email):
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=_EMAIL_LIMIT_DETAIL)
+    user = await run_in_threadpool(_find_user_for_reset, db, payload.email.lower())
+    stored_token = user.reset_password_token if user else None
+    token_ok = hmac.compare_digest(hash_reset_token(payload.token), stored_token or "")
     if (
         not user
-        or not user.reset_password_token
+        or not stored_token
         or not user.reset_password_expires_at
         or user.reset_password_expires_at < datetime.utcnow()
-        or not verify_password(payload.token, user.reset_password_token)
+        or not token_ok
     ):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token inválido o expirado")
 
-    user.hashed_password = hash_password(payload.new_password)
+    user_id, email = user.id, user.email
+    user.hashed_password = await ahash(payload.new_password)
     user.reset_password_token = None
     user.reset_password_expires_at = None
-    db.commit()
-
-    log_action("password_reset", "user", user.id, user, details={"email": user.email})
+    # La auditoría se guarda con el mismo commit que la nueva contraseña
+    log_action("password_reset", "user", user_id, user, details={"email": email}, db=db)
+    await run_in_threadpool(_commit_user_changes, db)
 
     return {"message": "Contraseña actualizada correctamente"}
 
@@ -211,8 +315,12 @@ def get_pending_users(
             detail="Solo administradores pueden ver usuarios pendientes",
         )
 
-    pending_users = db.query(User).filter(User.approved == False).all()
-    return pending_users
+    return (
+        db.query(User.id, User.email, User.approved, User.full_name, User.created_at)
+        # Mismo predicado que el índice parcial ix_user_pending (NOT approved)
+        .filter(~User.approved)
+        .all()
+    )
 
 
 @router.post("/approve-user/{user_id}")
@@ -241,33 +349,28 @@ def approve_user(
             user_id,
             current_user,
             details={"attempted_role": payload.role},
+            db=db,
         )
+        db.commit()
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Solo administradores pueden aprobar usuarios",
         )
 
     # SEGURIDAD: Validar que el rol sea válido
-    allowed_roles = ["admin", "gerente", "recepcionista", "mantenimiento", "staff"]
-    if payload.role and payload.role not in allowed_roles:
+    if payload.role and payload.role not in ASSIGNABLE_ROLES:
         log_action(
             "invalid_role_assignment",
             "user",
             user_id,
             current_user,
             details={"attempted_role": payload.role},
+            db=db,
         )
+        db.commit()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Rol inválido. Roles permitidos: {', '.join(allowed_roles)}",
-        )
-
-    # SEGURIDAD: Buscar el usuario y validar que existe
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Usuario no encontrado",
+            detail=f"Rol inválido. Roles permitidos: {ASSIGNABLE_ROLES_TEXT}",
         )
 
     # SEGURIDAD: No permitir que un admin se cambie a sí mismo
@@ -278,13 +381,26 @@ def approve_user(
             user_id,
             current_user,
             details={"action": "self_approval_or_role_change"},
+            db=db,
         )
+        db.commit()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No puedes modificar tu propia cuenta",
         )
 
+    user_not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Usuario no encontrado",
+    )
+
+    # Los registros de auditoría se guardan con el mismo commit que el cambio del usuario
     if payload.approved:
+        # SEGURIDAD: Buscar el usuario y validar que existe
+        user = db.get(User, user_id)
+        if not user:
+            raise user_not_found
+
         user.approved = True
         old_role = user.role
         assigned_role = payload.role or "recepcionista"
@@ -301,6 +417,7 @@ def approve_user(
                     "new_role": assigned_role,
                     "assigned_by": current_user.email,
                 },
+                db=db,
             )
 
         user.role = assigned_role
@@ -312,22 +429,28 @@ def approve_user(
             user_id,
             current_user,
             details={"role": assigned_role, "email": user.email},
+            db=db,
         )
     else:
-        # SEGURIDAD: Registrar el rechazo/eliminación
-        user_email = user.email
-        db.delete(user)
+        # Rechazo: un solo DELETE ... RETURNING borra y devuelve el email para la auditoría
+        deleted = db.execute(delete(User).where(User.id == user_id).returning(User.email)).first()
+        if deleted is None:
+            raise user_not_found
+        user_email = deleted.email
         message = f"Usuario {user_email} rechazado y eliminado"
 
+        # SEGURIDAD: Registrar el rechazo/eliminación
         log_action(
             "user_rejected",
             "user",
             user_id,
             current_user,
             details={"email": user_email},
+            db=db,
         )
 
     db.commit()
+    User.invalidate_login_cache()
 
     return {
         "message": message,
@@ -1,14 +1,19 @@
 # app/routers/backup.py
 """Endpoints para gestión de respaldos y restauración del sistema."""
+import json
+from datetime import datetime, timezone
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from starlette.responses import FileResponse
+from fastapi.responses import ORJSONResponse
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from pathlib import Path
 
 from app.core.db import get_db
 from app.core.security import get_current_user
 from app.models.user import User
-from app.services.backup import BackupService
+from app.services.backup import BACKUP_IO_CHUNK, BackupService, drop_page_cache
 from app.schemas.backup import (
     BackupCreate,
     BackupOut,
@@ -25,6 +30,15 @@ from app.core.audit import log_action
 router = APIRouter(prefix="/admin/backup", tags=["Admin - Backup"])
 
 
+class BackupFileResponse(FileResponse):
+    """
+    FileResponse con bloques de BACKUP_IO_CHUNK (Starlette usa 64 KiB): un volcado de
+    varios GB se envía con menos lecturas en el threadpool y mensajes ASGI.
+    """
+
+    chunk_size = BACKUP_IO_CHUNK
+
+
 def require_admin(current_user: User = Depends(get_current_user)) -> User:
     """Verifica que el usuario sea administrador."""
     if current_user.role != "admin":
@@ -48,7 +62,7 @@ def system_health(current_user: User = Depends(require_admin)):
             backups_available=len(backups),
             latest_backup=latest,
             total_backup_size_mb=round(total_size / (1024 * 1024), 2),
-            timestamp=__import__("datetime").datetime.now().isoformat(),
+            timestamp=datetime.now(timezone.utc).isoformat(),  # UTC con desfase explícito
         )
     except Exception as e:
         raise HTTPException(
@@ -58,7 +72,7 @@ def system_health(current_user: User = Depends(require_admin)):
 
 
 @router.post("/create", response_model=BackupOut)
-def create_backup(
+async def create_backup(
     request: BackupCreate,
     current_user: User = Depends(require_admin),
 ):
@@ -67,7 +81,7 @@ def create_backup(
     ⚠️ Esta operación puede tomar varios minutos dependiendo del tamaño de la BD.
     """
     try:
-        backup_info = BackupService.create_backup(request.description)
+        backup_info = await BackupService.create_backup_async(request.description)
 
         log_action(
             "backup_created",
@@ -100,8 +114,9 @@ def create_backup(
 def list_backups(current_user: User = Depends(require_admin)):
     """Lista todos los respaldos disponibles."""
     try:
+        # Los datos salen de BackupService con la forma de BackupOut: sin revalidarlos
         backups = BackupService.list_backups()
-        return BackupListOut(backups=backups, total=len(backups))
+        return ORJSONResponse(content={"backups": backups, "total": len(backups)})
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -109,6 +124,18 @@ def list_backups(current_user: User = Depends(require_admin)):
         )
 
 
+@router.get("/list/stream")
+def stream_backups(current_user: User = Depends(require_admin)):
+    """
+    Lista los respaldos como NDJSON (un objeto por línea), sin ordenar.
+
+    Para directorios con miles de respaldos: la respuesta empieza a enviarse sin
+    cargar todo el listado en memoria.
+    """
+    lines = (json.dumps(backup) + "\n" for backup in BackupService.iter_backups())
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
 @router.get("/database-info")
 def get_database_info(
     current_user: User = Depends(require_admin),
@@ -159,7 +186,7 @@ def get_backup(
 
 
 @router.post("/restore", response_model=RestoreResponse)
-def restore_backup(
+async def restore_backup(
     request: RestoreRequest,
     current_user: User = Depends(require_admin),
 ):
@@ -178,7 +205,7 @@ def restore_backup(
         )
 
     try:
-        result = BackupService.restore_backup(request.backup_id)
+        result = await BackupService.restore_backup_async(request.backup_id)
 
         log_action(
             "database_restored",
@@ -283,10 +310,12 @@ def download_backup(
             details={"backup_id": backup_id},
         )
 
-        return FileResponse(
+        return BackupFileResponse(
             path=backup_file,
             filename=backup_id,
             media_type="application/octet-stream",
+            # Terminado el envío, el archivo sale de la caché de páginas
+            background=BackgroundTask(drop_page_cache, backup_file),
         )
     except HTTPException:
         raise
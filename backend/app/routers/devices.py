@@ -1,11 +1,13 @@
 # app/routers/devices.py
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from pydantic import BaseModel, Field, TypeAdapter
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..core.db import get_db
+from ..core.network import notify_whitelist_add, notify_whitelist_remove
 from ..core.security import require_roles
 from ..models.device import Device
 from ..models.guest import Guest
@@ -17,6 +19,18 @@ router = APIRouter(prefix="/guests/{guest_id}/devices", tags=["devices"])
 # Additional router for device suspension management
 devices_router = APIRouter(prefix="/devices", tags=["devices-management"])
 
+_DEVICE_LIST = TypeAdapter(List[DeviceOut])
+
+
+def _device_list_response(devices) -> Response:
+    """
+    Serializa la lista directamente a JSON con pydantic-core. Devolver un Response evita
+    la validación de response_model (que sigue documentando la ruta), el paso intermedio
+    a dict y el json.dumps posterior.
+    """
+    content = _DEVICE_LIST.dump_json(_DEVICE_LIST.validate_python(devices, from_attributes=True))
+    return Response(content=content, media_type="application/json")
+
 
 @router.get(
     "/",
@@ -26,10 +40,11 @@ devices_router = APIRouter(prefix="/devices", tags=["devices-management"])
 )
 def list_devices(guest_id: int, db: Session = Depends(get_db)):
     """Obtiene todos los dispositivos asociados a un huésped específico."""
-    guest = db.get(Guest, guest_id)
-    if not guest:
+    # Una sola consulta en el caso habitual; el huésped solo se busca si no tiene dispositivos
+    devices = db.scalars(select(Device).where(Device.guest_id == guest_id)).all()
+    if not devices and not db.get(Guest, guest_id):
         raise HTTPException(status_code=404, detail="Guest not found")
-    return guest.devices
+    return _device_list_response(devices)
 
 
 @router.post(
@@ -40,28 +55,25 @@ def list_devices(guest_id: int, db: Session = Depends(get_db)):
     summary="Añadir un dispositivo a un huésped",
     description="Registra un nuevo dispositivo para un huésped. La dirección MAC debe ser única.",
 )
-def add_device(guest_id: int, data: DeviceCreate, db: Session = Depends(get_db)):
+def add_device(
+    guest_id: int,
+    data: DeviceCreate,
+    background: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     guest = db.get(Guest, guest_id)
     if not guest:
         raise HTTPException(status_code=404, detail="Guest not found")
 
-    mac = data.mac.upper()
-    exists = db.query(Device).filter(Device.mac == mac).first()
-    if exists:
+    mac = data.mac
+    device = Device.try_insert(db, mac, guest_id=guest_id, name=data.name, vendor=data.vendor, allowed=True)
+    if device is None:
         raise HTTPException(status_code=400, detail="MAC already registered")
-
-    device = Device(guest_id=guest_id, mac=mac, name=data.name, vendor=data.vendor, allowed=True)
-    db.add(device)
+    device_id = device.id
     db.commit()
-    db.refresh(device)
-
-    try:
-        from ..core.network import notify_whitelist_add
-
-        notify_whitelist_add(mac, guest, device)
-    except Exception:
-        pass
 
+    # El router/firewall se actualiza después de responder
+    background.add_task(notify_whitelist_add, mac, guest_id, device_id)
     return device
 
 
@@ -71,7 +83,12 @@ def add_device(guest_id: int, data: DeviceCreate, db: Session = Depends(get_db))
     dependencies=[Depends(require_roles("admin", "recepcionista"))],
     summary="Eliminar un dispositivo de un huésped",
 )
-def delete_device(guest_id: int, device_id: int, db: Session = Depends(get_db)):
+def delete_device(
+    guest_id: int,
+    device_id: int,
+    background: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """Elimina un dispositivo específico por su ID."""
     device = db.get(Device, device_id)
     if not device or device.guest_id != guest_id:
@@ -81,12 +98,7 @@ def delete_device(guest_id: int, device_id: int, db: Session = Depends(get_db)):
     db.delete(device)
     db.commit()
 
-    try:
-        from ..core.network import notify_whitelist_remove
-
-        notify_whitelist_remove(mac)
-    except Exception:
-        pass
+    background.add_task(notify_whitelist_remove, mac)
     return
 
 
@@ -217,37 +229,39 @@ def list_suspended_devices(
     include_manually_suspended: bool = True,
     guest_id: Optional[int] = None,
     staff_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=500),
+    after_id: Optional[int] = Query(None, description="Devolver dispositivos con id mayor (último id de la página anterior)"),
     db: Session = Depends(get_db),
 ):
     """
-    Lista dispositivos suspendidos con opciones de filtrado.
+    Lista dispositivos suspendidos con opciones de filtrado, paginados por id.
 
     Parámetros:
     - include_auto_suspended: Incluir dispositivos suspendidos automáticamente
     - include_manually_suspended: Incluir dispositivos suspendidos manualmente
     - guest_id: Filtrar por ID de huésped (solo dispositivos de huésped)
     - staff_id: Filtrar por ID de personal (solo dispositivos de personal)
+    - limit / after_id: Tamaño de página y cursor (id del último dispositivo recibido)
     """
-    query = db.query(Device)
-
-    # Construir condición de suspensión
-    suspension_conditions = []
-    if include_auto_suspended:
-        suspension_conditions.append(Device.auto_suspended == True)
-    if include_manually_suspended:
-        suspension_conditions.append(Device.suspended == True)
-
-    if suspension_conditions:
-        from sqlalchemy import or_
-        query = query.filter(or_(*suspension_conditions))
-
+    filters = []
+    if after_id is not None:
+        filters.append(Device.id > after_id)
     if guest_id:
-        query = query.filter(Device.guest_id == guest_id)
-
+        filters.append(Device.guest_id == guest_id)
     if staff_id:
-        query = query.filter(Device.staff_id == staff_id)
-
-    return query.all()
+        filters.append(Device.staff_id == staff_id)
+
+    mask = (Device.SUSPENDED_AUTO if include_auto_suspended else 0) | (
+        Device.SUSPENDED_MANUAL if include_manually_suspended else 0
+    )
+    if mask:
+        # suspension_flags <> 0 coincide con el predicado del índice parcial ix_devices_suspended
+        filters.append(Device.suspension_flags != 0)
+        if mask != Device.SUSPENDED_AUTO | Device.SUSPENDED_MANUAL:
+            filters.append(Device.suspension_flags.op("&")(mask) != 0)
+
+    stmt = select(Device).where(*filters).order_by(Device.id).limit(limit)
+    return _device_list_response(db.scalars(stmt).all())
 
 
 @devices_router.get(
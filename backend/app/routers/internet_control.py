@@ -215,11 +215,24 @@ def suspend_guest_internet(
         raise HTTPException(status_code=404, detail="Guest has no devices")
 
     suspended_count = 0
+    activities = []
+    now = datetime.utcnow()
     for device in devices:
         if not device.suspended:
             device.suspended = True
             device.suspension_reason = reason or f"Suspendido junto con huésped {guest.full_name}"
             suspended_count += 1
+            activities.append({
+                "device_id": device.id,
+                "guest_id": guest_id,
+                "activity_type": ActivityType.blocked,
+                "timestamp": now,
+                "initiated_by_system": False,
+                "notes": f"Suspended by {current_user.email}: {reason or 'No reason provided'}",
+            })
+
+    # Registrar actividad de red de todos los dispositivos en un solo INSERT
+    NetworkActivity.bulk_log(db, activities)
 
     # Auditoría
     log_action(
@@ -265,11 +278,24 @@ def resume_guest_internet(
         raise HTTPException(status_code=404, detail="Guest has no devices")
 
     resumed_count = 0
+    activities = []
+    now = datetime.utcnow()
     for device in devices:
         if device.suspended:
             device.suspended = False
             device.suspension_reason = None
             resumed_count += 1
+            activities.append({
+                "device_id": device.id,
+                "guest_id": guest_id,
+                "activity_type": ActivityType.unblocked,
+                "timestamp": now,
+                "initiated_by_system": False,
+                "notes": f"Resumed by {current_user.email}",
+            })
+
+    # Registrar actividad de red de todos los dispositivos en un solo INSERT
+    NetworkActivity.bulk_log(db, activities)
 
     # Auditoría
     log_action(
@@ -298,7 +324,7 @@ def resume_guest_internet(
 def get_internet_status(db: Session = Depends(get_db)):
     """Obtiene estadísticas del estado de internet."""
     total_devices = db.query(Device).count()
-    suspended_devices = db.query(Device).filter(Device.suspended == True).count()  # noqa
+    suspended_devices = db.query(Device).filter(Device.suspended).count()
     active_devices = total_devices - suspended_devices
 
     # Dispositivos online (vistos en los últimos 5 minutos)
@@ -351,13 +377,15 @@ def get_bandwidth_summary(
     # Actividad de red reciente
     recent_activity = db.query(
         func.sum(NetworkActivity.bytes_downloaded).label('downloaded'),
-        func.sum(NetworkActivity.bytes_uploaded).label('uploaded')
+        func.sum(NetworkActivity.bytes_uploaded).label('uploaded'),
+        func.sum(NetworkActivity.total_bytes).label('total')
     ).filter(
         NetworkActivity.timestamp >= cutoff
     ).first()
 
     recent_downloaded = recent_activity.downloaded or 0
     recent_uploaded = recent_activity.uploaded or 0
+    recent_total = recent_activity.total or 0
 
     return {
         "period_days": days,
@@ -371,7 +399,7 @@ def get_bandwidth_summary(
         "recent_usage": {
             "downloaded_gb": round(recent_downloaded / (1024 * 1024 * 1024), 2),
             "uploaded_gb": round(recent_uploaded / (1024 * 1024 * 1024), 2),
-            "total_gb": round((recent_downloaded + recent_uploaded) / (1024 * 1024 * 1024), 2),
+            "total_gb": round(recent_total / (1024 * 1024 * 1024), 2),
         },
         "top_devices": [
             {
@@ -1,6 +1,7 @@
 # app/routers/invoices.py
 """Endpoints para gestión de facturas homologadas a normativas venezolanas."""
 from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
 from typing import List, Optional
 import random
 import string
@@ -10,13 +11,13 @@ from io import BytesIO
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy import func, and_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload, load_only
 
 from ..core.db import get_db
 from ..core.security import get_current_user, require_permission, require_roles
 from ..models.invoice import (
     Invoice, InvoiceLine, InvoicePayment, InvoiceConfiguration,
-    InvoiceControlNumber, InvoiceStatus, PaymentStatus
+    InvoiceControlNumber, InvoicePaymentStatus, InvoiceStatus
 )
 from ..models.guest import Guest
 from ..models.user import User
@@ -55,49 +56,112 @@ def generate_control_number(db: Session, series: str = "A") -> str:
             return control_number
 
 
+def get_next_invoice_number(db: Session, config: InvoiceConfiguration) -> int:
+    """
+    Reserva el siguiente número secuencial de la serie configurada.
+    La fila de configuración queda bloqueada (SELECT ... FOR UPDATE) hasta el commit de
+    la factura, así dos creaciones concurrentes no obtienen el mismo número. El índice
+    (invoice_series, invoice_number DESC) da el último número emitido, por si la serie
+    ya tiene facturas con número explícito (datos importados o de prueba).
+    """
+    db.flush()  # refresh descartaría un contador ya modificado y sin volcar
+    db.refresh(config, with_for_update=True)
+
+    last_number = db.query(Invoice.invoice_number).filter(
+        Invoice.invoice_series == config.invoice_series
+    ).order_by(Invoice.invoice_number.desc()).limit(1).scalar()
+
+    number = config.next_invoice_number
+    if last_number is not None:
+        number = max(number, last_number + 1)
+    config.next_invoice_number = number + 1
+    return number
+
+
+CENT = Decimal("0.01")
+
+
+def to_money(value) -> Decimal:
+    """Convierte un monto a Decimal redondeado a céntimos."""
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def calculate_line_amounts(line: dict, tax_percentage: float = 16.0) -> tuple[Decimal, Decimal]:
+    """Calcula el total y el IVA de una línea de factura."""
+    line_total = to_money(Decimal(str(line['quantity'])) * Decimal(str(line['unit_price'])))
+    if not line.get('is_taxable', True):
+        return line_total, Decimal("0.00")
+    line_tax_percentage = Decimal(str(line.get('tax_percentage', tax_percentage)))
+    return line_total, to_money(line_total * line_tax_percentage / 100)
+
+
+def build_line_rows(invoice_id: Optional[int], lines: List[dict], tax_percentage: float = 16.0) -> List[dict]:
+    """
+    Prepara las filas de invoice_lines con sus montos ya calculados,
+    listas para insertarse en bloque con bulk_insert_mappings.
+    """
+    rows = []
+    for idx, line in enumerate(lines):
+        line_total, line_tax = calculate_line_amounts(line, tax_percentage)
+        rows.append({
+            'invoice_id': invoice_id,
+            'description': line['description'],
+            'code': line.get('code'),
+            'quantity': line['quantity'],
+            'unit_price': line['unit_price'],
+            'line_total': line_total,
+            'is_taxable': line.get('is_taxable', True),
+            'tax_percentage': line.get('tax_percentage', tax_percentage),
+            'tax_amount': line_tax,
+            'line_order': idx,
+        })
+    return rows
+
+
 def calculate_invoice_totals(
-    lines: List[dict],
+    line_rows: List[dict],
     tax_percentage: float = 16.0,
     iva_retention_enabled: bool = False,
     iva_retention_percentage: float = 75.0,
     islr_retention_enabled: bool = False,
     islr_retention_percentage: float = 0.75
 ) -> dict:
-    """Calcula los totales de la factura con impuestos y retenciones."""
-    subtotal = 0.0
-    taxable_amount = 0.0
-    tax_amount = 0.0
+    """
+    Calcula los totales de la factura con impuestos y retenciones
+    a partir de las filas generadas por build_line_rows.
+    """
+    subtotal = Decimal("0.00")
+    taxable_amount = Decimal("0.00")
+    tax_amount = Decimal("0.00")
 
     # Calcular subtotal e IVA
-    for line in lines:
-        line_total = line['quantity'] * line['unit_price']
-        subtotal += line_total
-        
-        if line.get('is_taxable', True):
-            taxable_amount += line_total
-            line_tax = line_total * (line.get('tax_percentage', tax_percentage) / 100)
-            tax_amount += line_tax
+    for row in line_rows:
+        subtotal += row['line_total']
+
+        if row['is_taxable']:
+            taxable_amount += row['line_total']
+            tax_amount += row['tax_amount']
 
     # Calcular retenciones
-    iva_retention_amount = 0.0
-    islr_retention_amount = 0.0
+    iva_retention_amount = Decimal("0.00")
+    islr_retention_amount = Decimal("0.00")
 
     if iva_retention_enabled:
-        iva_retention_amount = tax_amount * (iva_retention_percentage / 100)
+        iva_retention_amount = to_money(tax_amount * Decimal(str(iva_retention_percentage)) / 100)
 
     if islr_retention_enabled:
-        islr_retention_amount = subtotal * (islr_retention_percentage / 100)
+        islr_retention_amount = to_money(subtotal * Decimal(str(islr_retention_percentage)) / 100)
 
     # Total final
     total = subtotal + tax_amount - iva_retention_amount - islr_retention_amount
 
     return {
-        'subtotal': round(subtotal, 2),
-        'taxable_amount': round(taxable_amount, 2),
-        'tax_amount': round(tax_amount, 2),
-        'iva_retention_amount': round(iva_retention_amount, 2),
-        'islr_retention_amount': round(islr_retention_amount, 2),
-        'total': round(total, 2)
+        'subtotal': subtotal,
+        'taxable_amount': taxable_amount,
+        'tax_amount': tax_amount,
+        'iva_retention_amount': iva_retention_amount,
+        'islr_retention_amount': islr_retention_amount,
+        'total': total
     }
 
 
@@ -122,12 +186,23 @@ def create_invoice(
     if not config:
         raise HTTPException(status_code=400, detail="Configuración de facturación no establecida")
 
-    # Convertir líneas a diccionarios
+    # Snapshot de los datos del cliente: el listado no necesita unir con guests
+    client_email = invoice_data.client_email
+    client_phone = invoice_data.client_phone
+    if invoice_data.guest_id is not None:
+        guest = db.get(Guest, invoice_data.guest_id)
+        if not guest:
+            raise HTTPException(status_code=404, detail="Huésped no encontrado")
+        client_email = client_email or guest.email
+        client_phone = client_phone or guest.phone
+
+    # Calcular montos de cada línea una sola vez; invoice_id se asigna tras el flush
     lines_data = [line.model_dump() for line in invoice_data.lines]
+    line_rows = build_line_rows(None, lines_data, config.tax_percentage)
 
     # Calcular totales
     totals = calculate_invoice_totals(
-        lines_data,
+        line_rows,
         tax_percentage=config.tax_percentage,
         iva_retention_enabled=config.enable_iva_retention,
         iva_retention_percentage=config.iva_retention_percentage,
@@ -135,20 +210,21 @@ def create_invoice(
         islr_retention_percentage=config.islr_retention_percentage
     )
 
-    # Generar número de control
+    # Generar número de control y número secuencial
     control_number = generate_control_number(db, config.invoice_series)
+    invoice_number = get_next_invoice_number(db, config)
 
     # Crear factura
     invoice = Invoice(
         invoice_type=invoice_data.invoice_type,
         control_number=control_number,
-        invoice_number=config.next_invoice_number,
+        invoice_number=invoice_number,
         invoice_series=config.invoice_series,
         guest_id=invoice_data.guest_id,
         client_name=invoice_data.client_name,
         client_rif=invoice_data.client_rif,
-        client_email=invoice_data.client_email,
-        client_phone=invoice_data.client_phone,
+        client_email=client_email,
+        client_phone=client_phone,
         currency=invoice_data.currency,
         exchange_rate=1.0,
         subtotal=totals['subtotal'],
@@ -161,7 +237,7 @@ def create_invoice(
         islr_retention_amount=totals['islr_retention_amount'],
         total=totals['total'],
         status=InvoiceStatus.draft,
-        payment_status=PaymentStatus.pending,
+        payment_status=InvoicePaymentStatus.pending,
         notes=invoice_data.notes,
         internal_reference=invoice_data.internal_reference,
         invoice_date=invoice_data.invoice_date,
@@ -171,24 +247,10 @@ def create_invoice(
     db.add(invoice)
     db.flush()  # Asigna ID sin hacer commit
 
-    # Agregar líneas
-    for idx, line_data in enumerate(lines_data):
-        line_total = line_data['quantity'] * line_data['unit_price']
-        line_tax = line_total * (line_data.get('tax_percentage', config.tax_percentage) / 100) if line_data.get('is_taxable', True) else 0.0
-
-        line = InvoiceLine(
-            invoice_id=invoice.id,
-            description=line_data['description'],
-            code=line_data.get('code'),
-            quantity=line_data['quantity'],
-            unit_price=line_data['unit_price'],
-            line_total=round(line_total, 2),
-            is_taxable=line_data.get('is_taxable', True),
-            tax_percentage=line_data.get('tax_percentage', config.tax_percentage),
-            tax_amount=round(line_tax, 2),
-            line_order=idx
-        )
-        db.add(line)
+    # Agregar líneas en un solo INSERT
+    for row in line_rows:
+        row['invoice_id'] = invoice.id
+    db.bulk_insert_mappings(InvoiceLine, line_rows)
 
     # Registrar control number
     control_reg = InvoiceControlNumber(
@@ -198,9 +260,6 @@ def create_invoice(
     )
     db.add(control_reg)
 
-    # Incrementar número de serie
-    config.next_invoice_number += 1
-
     db.commit()
     db.refresh(invoice)
 
@@ -216,15 +275,26 @@ def create_invoice(
 def list_invoices(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    status_filter: Optional[str] = None,
+    status_filter: Optional[InvoiceStatus] = None,
     client_name: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    overdue_only: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Lista las facturas con filtros opcionales."""
-    query = db.query(Invoice)
+    # Solo las columnas del listado: notas, datos de anulación, líneas y pagos quedan fuera
+    query = db.query(Invoice).options(
+        load_only(
+            Invoice.id, Invoice.control_number, Invoice.invoice_number, Invoice.client_name,
+            Invoice.currency, Invoice.subtotal, Invoice.tax_amount, Invoice.total,
+            Invoice.remaining_balance, Invoice.payment_status, Invoice.status,
+            Invoice.invoice_date, Invoice.due_date,
+        ),
+        lazyload(Invoice.lines),
+        lazyload(Invoice.payments),
+    )
 
     if status_filter:
         query = query.filter(Invoice.status == status_filter)
@@ -238,6 +308,9 @@ def list_invoices(
     if end_date:
         query = query.filter(Invoice.invoice_date <= end_date)
 
+    if overdue_only:
+        query = query.filter(Invoice.is_overdue)
+
     invoices = query.order_by(Invoice.created_at.desc()).offset(skip).limit(limit).all()
     return invoices
 
@@ -302,22 +375,9 @@ def update_invoice(
         # Agregar nuevas líneas
         config = db.query(InvoiceConfiguration).first()
         lines_data = [line.model_dump() for line in invoice_data.lines]
-        totals = calculate_invoice_totals(lines_data, config.tax_percentage if config else 16.0)
-
-        for idx, line_data in enumerate(lines_data):
-            line = InvoiceLine(
-                invoice_id=invoice.id,
-                description=line_data['description'],
-                code=line_data.get('code'),
-                quantity=line_data['quantity'],
-                unit_price=line_data['unit_price'],
-                line_total=line_data['quantity'] * line_data['unit_price'],
-                is_taxable=line_data.get('is_taxable', True),
-                tax_percentage=line_data.get('tax_percentage', 16.0),
-                tax_amount=0.0,
-                line_order=idx
-            )
-            db.add(line)
+        line_rows = build_line_rows(invoice.id, lines_data, config.tax_percentage if config else 16.0)
+        totals = calculate_invoice_totals(line_rows)
+        db.bulk_insert_mappings(InvoiceLine, line_rows)
 
         # Actualizar totales
         invoice.subtotal = totals['subtotal']
@@ -433,7 +493,7 @@ def annul_invoice(
             detail="Solo se pueden anular facturas emitidas pendientes de pago."
         )
 
-    if invoice.payment_status == PaymentStatus.completed:
+    if invoice.payment_status == InvoicePaymentStatus.completed:
         raise HTTPException(
             status_code=400,
             detail="No se puede anular una factura pagada. Emite una nota de crédito conforme a SENIAT."
@@ -498,7 +558,7 @@ def register_payment(
     # Crear registro de pago
     payment = InvoicePayment(
         invoice_id=invoice.id,
-        amount=payment_data.amount,
+        amount=to_money(payment_data.amount),
         currency=payment_data.currency,
         exchange_rate=payment_data.exchange_rate,
         payment_method=payment_data.payment_method,
@@ -508,15 +568,15 @@ def register_payment(
     )
 
     # Actualizar monto pagado e estado
-    invoice.paid_amount += payment_data.amount
+    invoice.paid_amount += to_money(payment_data.amount)
 
     if invoice.paid_amount >= invoice.total:
-        invoice.payment_status = PaymentStatus.completed
+        invoice.payment_status = InvoicePaymentStatus.completed
         invoice.status = InvoiceStatus.paid
     elif invoice.paid_amount > 0:
-        invoice.payment_status = PaymentStatus.partial
+        invoice.payment_status = InvoicePaymentStatus.partial
     else:
-        invoice.payment_status = PaymentStatus.pending
+        invoice.payment_status = InvoicePaymentStatus.pending
 
     db.add(payment)
     db.commit()
@@ -540,7 +600,9 @@ def list_payments(
     if not invoice:
         raise HTTPException(status_code=404, detail="Factura no encontrada")
 
-    return invoice.payments
+    return db.query(InvoicePayment).filter(
+        InvoicePayment.invoice_id == invoice_id
+    ).order_by(InvoicePayment.payment_date.desc(), InvoicePayment.id.desc()).all()
 
 
 # ============ Configuración ============
@@ -608,14 +670,12 @@ def get_invoice_stats(
     total_revenue = db.query(func.sum(Invoice.total)).filter(Invoice.status != InvoiceStatus.cancelled).scalar() or 0
     total_tax = db.query(func.sum(Invoice.tax_amount)).filter(Invoice.status != InvoiceStatus.cancelled).scalar() or 0
 
-    pending_payment = db.query(func.sum(
-        Invoice.total - Invoice.paid_amount
-    )).filter(
-        and_(Invoice.payment_status.in_([PaymentStatus.pending, PaymentStatus.partial]),
+    pending_payment = db.query(func.sum(Invoice.remaining_balance)).filter(
+        and_(Invoice.payment_status.in_([InvoicePaymentStatus.pending, InvoicePaymentStatus.partial]),
              Invoice.status != InvoiceStatus.cancelled)
     ).scalar() or 0
 
-    average_value = total_revenue / total_issued if total_issued > 0 else 0
+    average_value = to_money(total_revenue / total_issued) if total_issued > 0 else 0
 
     # Estadísticas del mes actual
     from datetime import datetime as dt
@@ -634,33 +694,20 @@ def get_invoice_stats(
         'total_invoices': total_invoices,
         'total_issued': total_issued,
         'total_cancelled': total_cancelled,
-        'total_revenue': round(total_revenue, 2),
-        'total_tax_collected': round(total_tax, 2),
-        'pending_payment': round(pending_payment, 2),
-        'average_invoice_value': round(average_value, 2),
+        'total_revenue': total_revenue,
+        'total_tax_collected': total_tax,
+        'pending_payment': pending_payment,
+        'average_invoice_value': average_value,
         'invoices_this_month': invoices_month,
-        'revenue_this_month': round(revenue_month or 0, 2),
+        'revenue_this_month': revenue_month,
     }
 
 
-@router.get(
-    "/{id}/printable",
-    summary="Obtener factura imprimible en HTML",
-    dependencies=[Depends(require_permission("finance:read"))],
-)
-def get_printable_invoice(
-    id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Genera una versión HTML imprimible de la factura."""
-    invoice = db.query(Invoice).filter(Invoice.id == id).first()
-    if not invoice:
-        raise HTTPException(status_code=404, detail="Factura no encontrada")
-
+def get_printable_config(db: Session) -> dict:
+    """Datos de la empresa para el encabezado de las facturas imprimibles."""
     config = db.query(InvoiceConfiguration).first()
     if not config:
-        config_data = {
+        return {
             "company_name": "Tu Empresa",
             "company_rif": "0000000000",
             "address": "Dirección",
@@ -668,24 +715,25 @@ def get_printable_invoice(
             "state": "Estado",
             "invoice_header_color": "#1a3a52",
         }
-    else:
-        config_data = {
-            "company_name": config.company_name,
-            "company_rif": config.company_rif,
-            "address": config.address,
-            "city": config.city,
-            "state": config.state,
-            "invoice_header_color": config.invoice_header_color,
-        }
+    return {
+        "company_name": config.company_name,
+        "company_rif": config.company_rif,
+        "address": config.address,
+        "city": config.city,
+        "state": config.state,
+        "invoice_header_color": config.invoice_header_color,
+    }
 
-    # Generar HTML
-    html_content = f"""
+
+def render_printable_document(title: str, body: str, config_data: dict) -> str:
+    """Envuelve una o varias facturas en un documento HTML imprimible."""
+    return f"""
     <!DOCTYPE html>
     <html lang="es">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Factura {invoice.control_number}</title>
+        <title>{title}</title>
         <style>
             body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; background: #f5f5f5; }}
             .container {{ max-width: 800px; margin: 0 auto; background: white; padding: 40px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }}
@@ -707,10 +755,23 @@ def get_printable_invoice(
             .total-row {{ display: flex; justify-content: space-between; padding: 8px 0; font-size: 13px; }}
             .total-row.final {{ font-size: 16px; font-weight: bold; color: {config_data['invoice_header_color']}; padding: 12px 0; }}
             footer {{ margin-top: 40px; padding-top: 20px; border-top: 1px solid #ddd; color: #666; font-size: 11px; text-align: center; }}
-            @media print {{ body {{ background: white; }} .container {{ box-shadow: none; }} }}
+            @media print {{
+                body {{ background: white; }}
+                .container {{ box-shadow: none; page-break-after: always; }}
+                .container:last-child {{ page-break-after: auto; }}
+            }}
         </style>
     </head>
     <body>
+    {body}
+    </body>
+    </html>
+    """
+
+
+def render_invoice_container(invoice: Invoice, config_data: dict, generated_at: datetime) -> str:
+    """Genera el bloque HTML de una factura (una página al imprimir)."""
+    html_content = f"""
         <div class="container">
             <header>
                 <div class="company-info">
@@ -725,7 +786,7 @@ def get_printable_invoice(
             <div class="info-grid">
                 <div class="info-section">
                     <h3>Datos de la Factura</h3>
-                    <p><strong>Número:</strong> {invoice.invoice_number}</p>
+                    <p><strong>Número:</strong> {invoice.display_number}</p>
                     <p><strong>Serie:</strong> {invoice.invoice_series}</p>
                     <p><strong>Control SENIAT:</strong> {invoice.control_number}</p>
                     <p><strong>Fecha:</strong> {invoice.invoice_date.strftime('%d/%m/%Y')}</p>
@@ -754,13 +815,12 @@ def get_printable_invoice(
     """
 
     for line in invoice.lines:
-        line_total = line.quantity * line.unit_price
         html_content += f"""
                     <tr>
                         <td>{line.description}</td>
                         <td class="text-right">{line.quantity}</td>
                         <td class="text-right">{line.unit_price:,.2f}</td>
-                        <td class="text-right">{line_total:,.2f}</td>
+                        <td class="text-right">{line.line_total:,.2f}</td>
                     </tr>
         """
 
@@ -806,13 +866,63 @@ def get_printable_invoice(
             </div>
 
             <footer>
-                <p>Factura generada el {datetime.now().strftime('%d/%m/%Y a las %H:%M:%S')}</p>
+                <p>Factura generada el {generated_at.strftime('%d/%m/%Y a las %H:%M:%S')}</p>
                 <p>Esta es una factura electrónica homologada a las normativas SENIAT de Venezuela</p>
             </footer>
         </div>
-    </body>
-    </html>
     """
+    return html_content
+
+
+@router.get(
+    "/printable/batch",
+    summary="Obtener varias facturas imprimibles en un solo HTML",
+    dependencies=[Depends(require_permission("finance:read"))],
+)
+def get_printable_invoices_batch(
+    ids: List[int] = Query(..., min_length=1, max_length=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Genera un único documento HTML con una factura por página.
+    Las facturas, sus líneas y la configuración se cargan con un número fijo
+    de consultas, y el navegador imprime o exporta a PDF todo el lote de una vez.
+    """
+    invoices = db.query(Invoice).filter(Invoice.id.in_(ids)).order_by(Invoice.invoice_number).all()
+    if not invoices:
+        raise HTTPException(status_code=404, detail="Facturas no encontradas")
+
+    config_data = get_printable_config(db)
+    generated_at = datetime.now()
+    body = "".join(render_invoice_container(invoice, config_data, generated_at) for invoice in invoices)
+    html_content = render_printable_document(f"Facturas ({len(invoices)})", body, config_data)
+
+    return StreamingResponse(
+        iter([html_content]),
+        media_type="text/html; charset=utf-8",
+        headers={"Content-Disposition": "inline; filename=facturas.html"},
+    )
+
+
+@router.get(
+    "/{id}/printable",
+    summary="Obtener factura imprimible en HTML",
+    dependencies=[Depends(require_permission("finance:read"))],
+)
+def get_printable_invoice(
+    id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Genera una versión HTML imprimible de la factura."""
+    invoice = db.query(Invoice).filter(Invoice.id == id).first()
+    if not invoice:
+        raise HTTPException(status_code=404, detail="Factura no encontrada")
+
+    config_data = get_printable_config(db)
+    body = render_invoice_container(invoice, config_data, datetime.now())
+    html_content = render_printable_document(f"Factura {invoice.control_number}", body, config_data)
 
     return StreamingResponse(
         iter([html_content]),
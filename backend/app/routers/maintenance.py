@@ -77,6 +77,7 @@ class MaintenanceResponse(BaseModel):
     room_number: str | None = None
     assigned_staff_name: str | None = None
     duration_hours: float | None = None
+    is_overdue: bool = False
     inventory_items: list[MaintenanceInventoryUsageOut] = []
 
     class Config:
@@ -138,6 +139,7 @@ def _build_maintenance_response(maintenance: Maintenance, db: Session | None = N
         actual_cost=maintenance.actual_cost,
         room_number=room_number,
         assigned_staff_name=assigned_staff_name,
+        is_overdue=maintenance.is_overdue,
         duration_hours=round(duration_hours, 2) if duration_hours else None,
         inventory_items=inventory_items,
     )
@@ -203,6 +205,7 @@ def list_maintenance(
     status: MaintenanceStatus | None = None,
     assigned_to: int | None = None,
     pending_only: bool = Query(False, description="Solo tareas pendientes o en progreso"),
+    overdue_only: bool = Query(False, description="Solo tareas atrasadas (más de 24 horas abiertas)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     db: Session = Depends(get_db),
@@ -216,6 +219,7 @@ def list_maintenance(
     - **status**: Filtrar por estado
     - **assigned_to**: Filtrar por empleado asignado
     - **pending_only**: Solo tareas pendientes o en progreso
+    - **overdue_only**: Solo tareas atrasadas
     """
     query = db.query(Maintenance).options(
         joinedload(Maintenance.room),
@@ -237,6 +241,8 @@ def list_maintenance(
         query = query.filter(
             Maintenance.status.in_([MaintenanceStatus.pending, MaintenanceStatus.in_progress])
         )
+    if overdue_only:
+        query = query.filter(Maintenance.is_overdue)
 
     # Ordenar por prioridad y fecha
     priority_order = {
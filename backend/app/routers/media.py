@@ -189,7 +189,7 @@ async def upload_file(
             "category": media.category.value,
             "file_size_mb": size_mb,
             "size_mb": size_mb,
-            "hash": media.file_hash,
+            "hash": media.file_hash_hex,
             "room_id": media.room_id,
             "is_primary": media.is_primary,
             "uploaded_at": media.uploaded_at.isoformat(),
@@ -26,13 +26,8 @@ from ..schemas.network_device import (
     NetworkDeviceTestConnection,
 )
 from ..core.security import get_current_user
-from ..services.network_integrations import (
-    NetworkIntegrationBase,
-    UbiquitiIntegration,
-    MikrotikIntegration,
-    CiscoIntegration,
-    OpenWrtIntegration,
-)
+from ..services import network_integrations
+from ..services.network_integrations import NetworkIntegrationBase
 
 router = APIRouter(tags=["Network Devices"])
 
@@ -42,19 +37,20 @@ def get_integration(device: NetworkDevice, db: Session) -> NetworkIntegrationBas
     Obtiene la integración correcta según la marca del dispositivo.
     """
     integrations = {
-        DeviceBrand.UBIQUITI: UbiquitiIntegration,
-        DeviceBrand.MIKROTIK: MikrotikIntegration,
-        DeviceBrand.CISCO: CiscoIntegration,
-        DeviceBrand.OPENWRT: OpenWrtIntegration,
+        DeviceBrand.UBIQUITI: "UbiquitiIntegration",
+        DeviceBrand.MIKROTIK: "MikrotikIntegration",
+        DeviceBrand.CISCO: "CiscoIntegration",
+        DeviceBrand.OPENWRT: "OpenWrtIntegration",
     }
 
-    integration_class = integrations.get(device.brand)
-    if not integration_class:
+    class_name = integrations.get(device.brand)
+    if not class_name:
         raise HTTPException(
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
             detail=f"Integración para {device.brand.value} no disponible"
         )
 
+    integration_class = getattr(network_integrations, class_name)
     return integration_class(device, db)
 
 
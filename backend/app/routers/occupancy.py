@@ -1,6 +1,6 @@
 # app/routers/occupancy.py
 """Endpoints para gestión de ocupación (check-in/check-out)."""
-from datetime import datetime
+from datetime import date, datetime, time
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -15,6 +15,7 @@ from ..models.occupancy import Occupancy
 from ..models.reservation import Reservation
 from ..models.room import Room, RoomStatus
 from ..models.user import User
+from ..services.rollups import daily_occupancy, rollups_available
 
 router = APIRouter(prefix="/occupancy", tags=["Occupancy"])
 
@@ -393,7 +394,30 @@ def get_occupancy_stats(db: Session = Depends(get_db)):
     - Habitaciones ocupadas
     - Ingresos totales (Bs y USD)
     """
-    total = db.query(func.count(Occupancy.id)).scalar()
+    # Totales e ingresos: los días ya cerrados salen del agregado diario materializado
+    # (PostgreSQL, refrescado cada 5 minutos) y solo el día en curso se suma sobre occupancies
+    live_query = db.query(
+        func.count(Occupancy.id),
+        func.coalesce(func.sum(Occupancy.amount_paid_bs), 0),
+        func.coalesce(func.sum(Occupancy.amount_paid_usd), 0),
+    )
+    closed = (0, 0, 0)
+    if rollups_available(db):
+        today = date.today()
+        closed = (
+            db.query(
+                func.coalesce(func.sum(daily_occupancy.c.check_ins), 0),
+                func.coalesce(func.sum(daily_occupancy.c.total_paid_bs), 0),
+                func.coalesce(func.sum(daily_occupancy.c.total_paid_usd), 0),
+            )
+            .filter(daily_occupancy.c.day < today)
+            .one()
+        )
+        live_query = live_query.filter(Occupancy.check_in >= datetime.combine(today, time.min))
+    live = live_query.one()
+    total = int(closed[0]) + live[0]
+    total_bs = float(closed[1]) + float(live[1])
+    total_usd = float(closed[2]) + float(live[2])
 
     active_count = (
         db.query(func.count(Occupancy.id))
@@ -401,21 +425,6 @@ def get_occupancy_stats(db: Session = Depends(get_db)):
         .scalar()
     )
 
-    # Ingresos totales
-    total_bs = (
-        db.query(func.sum(Occupancy.amount_paid_bs))
-        .filter(Occupancy.amount_paid_bs.isnot(None))
-        .scalar()
-        or 0
-    )
-
-    total_usd = (
-        db.query(func.sum(Occupancy.amount_paid_usd))
-        .filter(Occupancy.amount_paid_usd.isnot(None))
-        .scalar()
-        or 0
-    )
-
     # Habitaciones únicas ocupadas actualmente
     occupied_rooms = (
         db.query(func.count(func.distinct(Occupancy.room_id)))
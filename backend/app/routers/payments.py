@@ -6,8 +6,8 @@ Incluye CRUD completo, conversión automática, reportes y estadísticas.
 import structlog
 from datetime import datetime, timedelta, date
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, and_, cast, func, or_
+from sqlalchemy.orm import Session, joinedload
 from typing import Optional
 from pydantic import BaseModel, Field
 
@@ -19,6 +19,7 @@ from ..models.payment import Currency, Payment, PaymentMethod, PaymentStatus
 from ..models.reservation import Reservation, ReservationStatus
 from ..models.user import User
 from ..services.currency import CurrencyService
+from ..services.rollups import daily_revenue, rollups_available
 
 router = APIRouter(prefix="/payments", tags=["Payments"])
 log = structlog.get_logger()
@@ -418,21 +419,44 @@ def get_payments_by_date(
             detail="Date range cannot exceed 365 days"
         )
 
-    query = db.query(
-        func.date(Payment.payment_date).label('date'),
-        func.count(Payment.id).label('count'),
-        func.sum(Payment.amount_usd).label('total_usd'),
-        func.sum(Payment.amount).label('total_original')
-    ).filter(
-        Payment.status == PaymentStatus.completed,
-        Payment.payment_date >= start_date,
-        Payment.payment_date <= datetime.combine(end_date, datetime.max.time())
-    )
+    result = []
+    live_start = start_date
+    today = date.today()
+
+    # Días ya cerrados: leer del agregado diario materializado (PostgreSQL)
+    if rollups_available(db) and start_date < today:
+        rollup_end = min(end_date, today - timedelta(days=1))
+        rollup_query = db.query(
+            daily_revenue.c.day,
+            cast(func.sum(daily_revenue.c.payment_count), Integer),
+            func.sum(daily_revenue.c.total_usd),
+            func.sum(daily_revenue.c.total_amount),
+        ).filter(
+            daily_revenue.c.day >= start_date,
+            daily_revenue.c.day <= rollup_end,
+        )
+        if currency:
+            rollup_query = rollup_query.filter(daily_revenue.c.currency == currency)
+        result.extend(rollup_query.group_by(daily_revenue.c.day).order_by(daily_revenue.c.day).all())
+        live_start = today
+
+    # Días en curso (o todos, sin vistas materializadas): agregar sobre payments
+    if live_start <= end_date:
+        query = db.query(
+            func.date(Payment.payment_date).label('date'),
+            func.count(Payment.id).label('count'),
+            func.sum(Payment.amount_usd).label('total_usd'),
+            func.sum(Payment.amount).label('total_original')
+        ).filter(
+            Payment.status == PaymentStatus.completed,
+            Payment.payment_date >= live_start,
+            Payment.payment_date <= datetime.combine(end_date, datetime.max.time())
+        )
 
-    if currency:
-        query = query.filter(Payment.currency == currency)
+        if currency:
+            query = query.filter(Payment.currency == currency)
 
-    result = query.group_by(func.date(Payment.payment_date)).order_by('date').all()
+        result.extend(query.group_by(func.date(Payment.payment_date)).order_by('date').all())
 
     daily_totals = []
     for day, count, total_usd, total_original in result:
@@ -489,6 +513,7 @@ def get_guest_payments_report(
     ]
     reservations = (
         db.query(Reservation)
+        .options(joinedload(Reservation.room))  # room_number en el listado
         .filter(
             Reservation.guest_id == guest_id,
             Reservation.status.in_(chargeable_statuses),
@@ -3,7 +3,8 @@ from __future__ import annotations
 from typing import Literal, cast
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, func
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
 from app.core.dates import compute_end_date
@@ -21,16 +22,17 @@ from app.schemas.reservation import (
     ReservationCancel,
     ReservationListResponse,
 )
+from app.services.reservations import overlap_clause
 
 router = APIRouter(prefix="/reservations", tags=["reservations"])
 
 
-def _range_overlap(q, start, end):
+def _range_overlap(db: Session, q, start, end):
     """
     Filtra traslapes de rangos en la misma habitación.
-    Usamos < y > para permitir reservas consecutivas (salida y entrada el mismo día).
+    El rango es [inicio, fin) para permitir reservas consecutivas (salida y entrada el mismo día).
     """
-    return q.filter(and_(Reservation.start_date < end, Reservation.end_date > start))
+    return q.filter(overlap_clause(db, start, end))
 
 
 @router.post(
@@ -69,6 +71,7 @@ def create_reservation(data: ReservationCreate, db: Session = Depends(get_db)):
 
     # Validar solapamiento en misma habitación
     overlap = _range_overlap(
+        db,
         db.query(Reservation).filter(Reservation.room_id == data.room_id),
         start=data.start_date,
         end=end_date,
@@ -113,7 +116,17 @@ def create_reservation(data: ReservationCreate, db: Session = Depends(get_db)):
         notes=data.notes,
     )
     db.add(res)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        # Solo res_no_overlap significa que otra reserva concurrente tomó la habitación
+        if getattr(getattr(e.orig, "diag", None), "constraint_name", None) != "res_no_overlap":
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": "Room already reserved in that range"},
+        ) from None
     db.refresh(res)
 
     # Crear un Payment automático para acreditar el costo a la cuenta del huésped
@@ -3,12 +3,13 @@
 from datetime import date
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from ..core.db import get_db
+from ..core.network import notify_whitelist_add, notify_whitelist_remove
 from ..core.security import get_current_user, require_roles
 from ..models.staff import Staff, StaffRole, StaffStatus
 from ..models.user import User
@@ -392,6 +393,7 @@ def list_staff_devices(staff_id: int, db: Session = Depends(get_db)):
 def add_staff_device(
     staff_id: int,
     data: DeviceCreate,
+    background: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -406,29 +408,21 @@ def add_staff_device(
     if not staff:
         raise HTTPException(status_code=404, detail="Empleado no encontrado")
 
-    mac = data.mac.upper()
-    exists = db.query(Device).filter(Device.mac == mac).first()
-    if exists:
-        raise HTTPException(status_code=400, detail="MAC already registered")
-
-    device = Device(
+    mac = data.mac
+    device = Device.try_insert(
+        db,
+        mac,
         staff_id=staff_id,
-        mac=mac,
         name=data.name,
         vendor=data.vendor,
         allowed=True
     )
-    db.add(device)
+    if device is None:
+        raise HTTPException(status_code=400, detail="MAC already registered")
+    device_id = device.id
     db.commit()
-    db.refresh(device)
-
-    try:
-        from ..core.network import notify_whitelist_add
-
-        notify_whitelist_add(mac, None, device)
-    except Exception:
-        pass
 
+    background.add_task(notify_whitelist_add, mac, None, device_id)
     return device
 
 
@@ -441,6 +435,7 @@ def add_staff_device(
 def delete_staff_device(
     staff_id: int,
     device_id: int,
+    background: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -453,10 +448,5 @@ def delete_staff_device(
     db.delete(device)
     db.commit()
 
-    try:
-        from ..core.network import notify_whitelist_remove
-
-        notify_whitelist_remove(mac)
-    except Exception:
-        pass
+    background.add_task(notify_whitelist_remove, mac)
     return
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from ..core.db import get_db
-from ..core.security import get_current_user, hash_password, require_roles
+from ..core.security import ASSIGNABLE_ROLES, ASSIGNABLE_ROLES_TEXT, get_current_user, hash_password, require_roles
 from ..core.audit import log_action, log_delete
 from ..models.user import User
 from ..models.staff import Staff
@@ -25,14 +25,13 @@ class AssignStaffRequest(BaseModel):
 )
 def create_user(data: UserCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     # Validar rol
-    ALLOWED_ROLES = ["admin", "gerente", "recepcionista", "mantenimiento", "staff"]
-    if data.role not in ALLOWED_ROLES:
+    if data.role not in ASSIGNABLE_ROLES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid role. Allowed roles: {', '.join(ALLOWED_ROLES)}"
+            detail=f"Invalid role. Allowed roles: {ASSIGNABLE_ROLES_TEXT}"
         )
 
-    if db.query(User).filter(User.email == data.email).first():
+    if db.query(db.query(User.id).filter(User.email == data.email.lower()).exists()).scalar():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
@@ -44,17 +43,20 @@ def create_user(data: UserCreate, current_user: User = Depends(get_current_user)
         full_name=data.full_name,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
 
-    # Auditoría
+    # Auditoría: se guarda con el mismo commit que el usuario y su rol
     log_action(
         "create",
         "user",
         user.id,
         current_user,
-        details={"email": user.email, "role": user.role, "full_name": user.full_name}
+        details={"email": user.email, "role": user.role, "full_name": user.full_name},
+        db=db,
     )
+    db.commit()
+    User.invalidate_login_cache()
+    db.refresh(user)
 
     return user
 
@@ -88,7 +90,7 @@ def list_users(db: Session = Depends(get_db)):
     description="Obtiene la información de un usuario específico. Solo administradores.",
 )
 def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -116,23 +118,22 @@ def update_user(
             detail="Cannot modify your own user account. Contact another admin."
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
     # Validar rol si se proporciona
-    ALLOWED_ROLES = ["admin", "gerente", "recepcionista", "mantenimiento", "staff"]
-    if data.role and data.role not in ALLOWED_ROLES:
+    if data.role and data.role not in ASSIGNABLE_ROLES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid role. Allowed roles: {', '.join(ALLOWED_ROLES)}"
+            detail=f"Invalid role. Allowed roles: {ASSIGNABLE_ROLES_TEXT}"
         )
 
     # Registrar cambios anteriores para auditoría
     changes = {}
-    if data.email and data.email != user.email:
+    if data.email and data.email.lower() != user.email:
         changes["email"] = {"old": user.email, "new": data.email}
         user.email = data.email
     if data.password:
@@ -145,19 +146,21 @@ def update_user(
         changes["full_name"] = {"old": user.full_name, "new": data.full_name}
         user.full_name = data.full_name
 
-    db.commit()
-    db.refresh(user)
-
-    # Auditoría
+    # Auditoría: se guarda con el mismo commit que los cambios (incluye cambios de rol)
     if changes:
         log_action(
             "update",
             "user",
             user.id,
             current_user,
-            details={"changes": changes, "email": user.email}
+            details={"changes": changes, "email": user.email},
+            db=db,
         )
 
+    db.commit()
+    User.invalidate_login_cache()
+    db.refresh(user)
+
     return user
 
 
@@ -179,22 +182,24 @@ def delete_user(
             detail="Cannot delete your own user account. Contact another admin."
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
-    # Auditoría antes de eliminar
+    # Auditoría en la misma transacción que la eliminación
     log_delete(
         "user",
         user.id,
         current_user,
-        details={"email": user.email, "role": user.role, "full_name": user.full_name}
+        details={"email": user.email, "role": user.role, "full_name": user.full_name},
+        db=db,
     )
 
     db.delete(user)
     db.commit()
+    User.invalidate_login_cache()
 
     return {"success": True, "message": f"User {user.email} deleted"}
 
@@ -219,7 +224,7 @@ def assign_staff_to_user(
     Si el empleado ya está asignado a otro usuario, se desasigna de ese usuario.
     """
     # Validar que el usuario existe
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -294,7 +299,7 @@ def unassign_staff_from_user(
     Desasigna el empleado asignado a una cuenta de usuario del sistema.
     """
     # Validar que el usuario existe
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -338,10 +343,10 @@ def unassign_staff_from_user(
     description="Endpoint especial para crear el primer usuario administrador si no existe ninguno. Falla si ya existe un administrador.",
 )
 def bootstrap_admin(data: UserCreate, db: Session = Depends(get_db)):
-    has_admin = db.query(User).filter(User.role == "admin").first()
+    has_admin = db.query(db.query(User.id).filter(User.role == "admin").exists()).scalar()
     if has_admin:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Admin already exists")
-    if db.query(User).filter(User.email == data.email).first():
+    if db.query(db.query(User.id).filter(User.email == data.email.lower()).exists()).scalar():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
@@ -354,5 +359,6 @@ def bootstrap_admin(data: UserCreate, db: Session = Depends(get_db)):
     )
     db.add(user)
     db.commit()
+    User.invalidate_login_cache()
     db.refresh(user)
     return user
@@ -2,14 +2,117 @@
 """
 Routers para manejar webhooks de pasarelas de pago.
 Soporta:
+- Stripe webhooks (registro idempotente de eventos)
 - PayPal webhooks (futura implementación)
 """
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from ..core.config import settings
 from ..core.db import get_db
+from ..models.stripe_webhook_event import StripeWebhookEvent, WebhookEventType, WebhookLogBuffer
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+# Tolerancia de la marca de tiempo de la firma (protección contra reenvíos)
+STRIPE_SIGNATURE_TOLERANCE_SECONDS = 300
+
+
+def _verify_stripe_signature(payload: bytes, signature_header: str, secret: str) -> bool:
+    """Verifica la cabecera Stripe-Signature (t=...,v1=...) con HMAC-SHA256."""
+    items = [part.split("=", 1) for part in signature_header.split(",") if "=" in part]
+    timestamps = [value for key, value in items if key == "t"]
+    signatures = [value for key, value in items if key == "v1"]
+    if not timestamps or not signatures or not timestamps[0].isdigit():
+        return False
+    if abs(time.time() - int(timestamps[0])) > STRIPE_SIGNATURE_TOLERANCE_SECONDS:
+        return False
+
+    signed_payload = timestamps[0].encode() + b"." + payload
+    expected = hmac.new(secret.encode(), signed_payload, hashlib.sha256).hexdigest()
+    return any(hmac.compare_digest(expected, signature) for signature in signatures)
+
+
+def _store_stripe_event(
+    db: Session,
+    event: dict,
+    event_id: str,
+    event_type: WebhookEventType,
+    started: float,
+    verified_ms: int,
+) -> dict:
+    """Registra el evento y sus trazas; responde duplicate si event_id ya existía."""
+    data = (event.get("data") or {}).get("object") or {}
+    object_id = data.get("id") or ""
+    event_pk = StripeWebhookEvent.try_insert(
+        db,
+        event_id=event_id,
+        event_type=event_type,
+        event_timestamp=datetime.utcfromtimestamp(event.get("created") or time.time()),
+        payload=event,
+        payment_intent_id=data.get("payment_intent") or (object_id if object_id.startswith("pi_") else None),
+        charge_id=data.get("charge") or (object_id if object_id.startswith("ch_") else None),
+        customer_id=data.get("customer"),
+        amount=data.get("amount"),
+        currency=(data.get("currency") or "").upper()[:3] or None,
+    )
+    if event_pk is None:
+        db.commit()
+        return {"received": True, "duplicate": True}
+
+    # Las trazas del evento se escriben juntas en un solo INSERT y en la misma transacción
+    with WebhookLogBuffer(db, event_pk, event_id) as logs:
+        logs.add("received", "success", message=event_type.value)
+        logs.add("verified", "success", duration_ms=verified_ms)
+        logs.add(
+            "stored",
+            "pending",
+            message="Evento registrado para procesamiento",
+            duration_ms=int((time.perf_counter() - started) * 1000),
+        )
+    db.commit()
+    return {"received": True, "id": event_pk}
+
+
+@router.post("/stripe")
+async def handle_stripe_webhook(
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    Recibe webhooks de Stripe y registra cada evento una sola vez.
+
+    Las entregas duplicadas (Stripe reintenta hasta recibir 2xx) se detectan con un
+    único INSERT ... ON CONFLICT sobre event_id y responden 200 sin más trabajo.
+    El procesamiento del evento queda en estado pending.
+    """
+    if not settings.STRIPE_WEBHOOK_SECRET:
+        raise HTTPException(status_code=501, detail="Webhook de Stripe no configurado")
+
+    started = time.perf_counter()
+    payload = await request.body()
+    signature = request.headers.get("Stripe-Signature", "")
+    if not _verify_stripe_signature(payload, signature, settings.STRIPE_WEBHOOK_SECRET):
+        raise HTTPException(status_code=400, detail="Firma de Stripe inválida")
+    verified_ms = int((time.perf_counter() - started) * 1000)
+
+    try:
+        event = json.loads(payload)
+        event_id = event["id"]
+        event_type = WebhookEventType(event["type"])
+    except (ValueError, KeyError, TypeError):
+        # Eventos no registrados: se confirma la recepción para que Stripe no reintente
+        return {"received": True, "ignored": True}
 
-router = APIRouter(prefix="/api/v1/webhooks", tags=["webhooks"])
+    # El acceso a la BD es síncrono: se ejecuta en el threadpool (como auth.login)
+    return await run_in_threadpool(_store_stripe_event, db, event, event_id, event_type, started, verified_ms)
 
 
 @router.post("/paypal")
@@ -1,13 +1,15 @@
 from datetime import datetime
 from typing import Annotated, Optional
 
-from pydantic import BaseModel, ConfigDict, Field  # 1. Importa ConfigDict
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field  # 1. Importa ConfigDict
 
 MAC = Annotated[str, Field(pattern=r"^[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}$")]
+# MAC de entrada: se valida y se normaliza a mayúsculas (formato guardado en la BD) al parsear
+NormalizedMAC = Annotated[MAC, AfterValidator(str.upper)]
 
 
 class DeviceCreate(BaseModel):
-    mac: MAC
+    mac: NormalizedMAC
     name: Optional[str] = None
     vendor: Optional[str] = None
 
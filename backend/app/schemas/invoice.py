@@ -1,6 +1,7 @@
 # app/schemas/invoice.py
 """Schemas Pydantic para facturas homologadas a normativas venezolanas."""
 from datetime import date, datetime
+from decimal import Decimal
 from typing import Optional, List
 from pydantic import BaseModel, Field, field_validator
 import re
@@ -11,7 +12,7 @@ class InvoiceLineCreate(BaseModel):
     description: str = Field(..., min_length=1, max_length=255)
     code: Optional[str] = Field(None, max_length=50)
     quantity: float = Field(..., gt=0)
-    unit_price: float = Field(..., ge=0)
+    unit_price: Decimal = Field(..., ge=0)
     is_taxable: bool = Field(True)
     tax_percentage: float = Field(16.0, ge=0, le=100)
 
@@ -20,6 +21,7 @@ class InvoiceLineResponse(InvoiceLineCreate):
     """Esquema de respuesta para línea de factura."""
     id: int
     invoice_id: int
+    unit_price: float
     line_total: float
     tax_amount: float
     line_order: int
@@ -34,14 +36,14 @@ class InvoiceLineUpdate(BaseModel):
     description: Optional[str] = Field(None, min_length=1, max_length=255)
     code: Optional[str] = Field(None, max_length=50)
     quantity: Optional[float] = Field(None, gt=0)
-    unit_price: Optional[float] = Field(None, ge=0)
+    unit_price: Optional[Decimal] = Field(None, ge=0)
     is_taxable: Optional[bool] = None
     tax_percentage: Optional[float] = Field(None, ge=0, le=100)
 
 
 class InvoicePaymentCreate(BaseModel):
     """Esquema para crear pago de factura."""
-    amount: float = Field(..., gt=0)
+    amount: Decimal = Field(..., gt=0)
     currency: str = Field("VES", max_length=3)
     exchange_rate: float = Field(1.0, ge=0)
     payment_method: str = Field(..., min_length=1, max_length=50)
@@ -54,6 +56,7 @@ class InvoicePaymentResponse(InvoicePaymentCreate):
     """Esquema de respuesta para pago de factura."""
     id: int
     invoice_id: int
+    amount: float
     created_at: datetime
 
     class Config:
@@ -148,7 +151,9 @@ class InvoiceResponse(BaseModel):
     total: float
     payment_status: str
     paid_amount: float
+    remaining_balance: float
     status: str
+    is_overdue: bool
     notes: Optional[str]
     internal_reference: Optional[str]
     invoice_date: date
@@ -177,8 +182,10 @@ class InvoiceListResponse(BaseModel):
     subtotal: float
     tax_amount: float
     total: float
+    remaining_balance: float
     payment_status: str
     status: str
+    is_overdue: bool
     invoice_date: date
     due_date: Optional[date]
 
@@ -1,15 +1,24 @@
 # app/services/backup.py
-"""Servicio para manejar respaldos y restauración del sistema."""
+"""
+Servicio para manejar respaldos y restauración del sistema.
+
+Todas las fechas que reporta (respaldos, restauraciones, estado del sistema) y las
+de los nombres de archivo están en UTC; las ISO 8601 llevan el desfase +00:00.
+"""
+import asyncio
 import os
 import subprocess
 import gzip
 import shutil
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 import structlog
 from app.core.config import settings
 from app.core.db import Base, engine, SessionLocal
+from app.models.exchange_rate import ExchangeRate
 from app.models.user import User
 
 log = structlog.get_logger()
@@ -23,6 +32,57 @@ except PermissionError:
     BACKUP_DIR = Path("/tmp/hostal_backups")
     BACKUP_DIR.mkdir(parents=True, exist_ok=True)
 
+# pg_dump/pg_restore y la copia de SQLite pueden tardar minutos: se ejecutan en un hilo
+# propio para no ocupar el threadpool compartido ni el event loop (respaldos
+# programados). Con un solo hilo, respaldos y restauraciones nunca se solapan.
+_BACKUP_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backup")
+
+# Listado de respaldos en memoria: se descarta cuando cambia el mtime del directorio
+# (archivos agregados o borrados, también desde fuera de la app) o tras LIST_CACHE_TTL
+LIST_CACHE_TTL = 60
+_list_cache: Optional[tuple[int, float, list[dict]]] = None  # (mtime_ns, expira, respaldos)
+
+# Respaldos PostgreSQL (.sql) y SQLite (.db.gz)
+BACKUP_PREFIX = "hostal_backup_"
+BACKUP_SUFFIXES = (".sql", ".db.gz")
+
+# Tamaño de bloque para comprimir, descomprimir y descargar respaldos. shutil usa
+# 64 KiB: con 1 MiB un volcado de varios GB necesita 16 veces menos read()/write()
+BACKUP_IO_CHUNK = 1024 * 1024
+
+
+def drop_page_cache(path: Path, flush: bool = False) -> None:
+    """
+    Pide al kernel descartar de la caché de páginas un respaldo ya escrito o enviado,
+    para que un volcado de varios GB no desplace las páginas de la base de datos.
+    Con flush=True se sincroniza antes a disco: las páginas sucias no se descartan.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        if flush:
+            os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError as e:
+        log.warning("posix_fadvise failed", path=str(path), error=str(e))
+    finally:
+        os.close(fd)
+
+
+def _backup_entry(name: str, stat: os.stat_result) -> dict:
+    return {
+        "id": name,
+        "filename": name,
+        "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+        "size_bytes": stat.st_size,
+        "size_mb": round(stat.st_size / (1024 * 1024), 2),
+        "description": None,
+    }
+
 
 class BackupService:
     """Servicio para crear y restaurar respaldos de la base de datos."""
@@ -90,7 +150,7 @@ class BackupService:
             is_sqlite = db_url.startswith("sqlite")
 
             # Nombre del archivo de respaldo
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
 
             if is_sqlite:
                 # Para SQLite, simplemente copiar el archivo .db
@@ -116,9 +176,11 @@ class BackupService:
 
                 # Comprimir con gzip para ahorrar espacio
                 with open(backup_file, 'rb') as f_in:
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(f_in.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
                     backup_file_gz = BACKUP_DIR / f"{backup_name}.gz"
                     with gzip.open(backup_file_gz, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
+                        shutil.copyfileobj(f_in, f_out, BACKUP_IO_CHUNK)
 
                 # Eliminar el archivo sin comprimir
                 backup_file.unlink()
@@ -162,10 +224,14 @@ class BackupService:
                         backup_file.unlink()
                     raise Exception(f"pg_dump falló: {error_msg}")
 
+            # El respaldo no se vuelve a leer salvo en una descarga o restauración
+            drop_page_cache(backup_file, flush=True)
+
             # Obtener información del archivo
             file_size = backup_file.stat().st_size
-            created_at = datetime.now().isoformat()
+            created_at = datetime.now(timezone.utc).isoformat()
 
+            BackupService.invalidate_list_cache()
             log.info("Backup created successfully",
                     backup_name=backup_name,
                     size_bytes=file_size,
@@ -186,32 +252,67 @@ class BackupService:
             raise
 
     @staticmethod
-    def list_backups() -> list[dict]:
-        """Lista todos los respaldos disponibles."""
-        try:
-            backups = []
-            # Buscar tanto archivos PostgreSQL (.sql) como SQLite (.db.gz)
-            backup_patterns = ["hostal_backup_*.sql", "hostal_backup_*.db.gz"]
-            backup_files = []
+    async def create_backup_async(description: Optional[str] = None) -> dict:
+        """create_backup en el hilo de respaldos, sin bloquear el event loop."""
+        return await asyncio.get_running_loop().run_in_executor(
+            _BACKUP_EXECUTOR, BackupService.create_backup, description
+        )
 
-            for pattern in backup_patterns:
-                backup_files.extend(BACKUP_DIR.glob(pattern))
+    @staticmethod
+    async def restore_backup_async(backup_id: str) -> dict:
+        """restore_backup en el hilo de respaldos, sin bloquear el event loop."""
+        return await asyncio.get_running_loop().run_in_executor(
+            _BACKUP_EXECUTOR, BackupService.restore_backup, backup_id
+        )
 
-            # Ordenar por fecha de modificación (más recientes primero)
-            for backup_file in sorted(backup_files, key=lambda f: f.stat().st_mtime, reverse=True):
-                stat = backup_file.stat()
-                backups.append({
-                    "id": backup_file.name,
-                    "filename": backup_file.name,
-                    "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "size_bytes": stat.st_size,
-                    "size_mb": round(stat.st_size / (1024 * 1024), 2),
-                })
-            return backups
+    @staticmethod
+    def invalidate_list_cache() -> None:
+        """Descarta el listado cacheado; llamar después de crear o borrar respaldos."""
+        global _list_cache
+        _list_cache = None
+
+    @staticmethod
+    def list_backups() -> list[dict]:
+        """Lista todos los respaldos disponibles (más recientes primero)."""
+        global _list_cache
+        try:
+            dir_mtime = BACKUP_DIR.stat().st_mtime_ns
+            cached = _list_cache
+            if cached and cached[0] == dir_mtime and cached[1] > time.monotonic():
+                return list(cached[2])
+
+            # Ordenar por fecha de modificación (más recientes primero); un stat por archivo
+            stats = [(entry.name, entry.stat()) for entry in BackupService._scan_backup_dir()]
+            backups = [
+                _backup_entry(name, stat)
+                for name, stat in sorted(stats, key=lambda item: item[1].st_mtime, reverse=True)
+            ]
+            _list_cache = (dir_mtime, time.monotonic() + LIST_CACHE_TTL, backups)
+            return list(backups)
         except Exception as e:
             log.error("Error listing backups", error=str(e))
             raise
 
+    @staticmethod
+    def _scan_backup_dir() -> Iterator[os.DirEntry]:
+        with os.scandir(BACKUP_DIR) as entries:
+            for entry in entries:
+                if entry.name.startswith(BACKUP_PREFIX) and entry.name.endswith(BACKUP_SUFFIXES):
+                    yield entry
+
+    @staticmethod
+    def iter_backups() -> Iterator[dict]:
+        """
+        Recorre los respaldos uno a uno, en el orden del directorio (sin ordenar ni cachear):
+        la memoria no crece con la cantidad de archivos.
+        """
+        for entry in BackupService._scan_backup_dir():
+            try:
+                yield _backup_entry(entry.name, entry.stat())
+            except FileNotFoundError:
+                # Borrado entre el listado del directorio y el stat
+                continue
+
     @staticmethod
     def get_backup(backup_id: str) -> Optional[dict]:
         """Obtiene información de un respaldo específico."""
@@ -224,7 +325,7 @@ class BackupService:
                 return {
                     "id": backup_file.name,
                     "filename": backup_file.name,
-                    "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
                     "size_bytes": stat.st_size,
                     "size_mb": round(stat.st_size / (1024 * 1024), 2),
                     "type": db_type,
@@ -282,10 +383,10 @@ class BackupService:
 
                 try:
                     # Descomprimir el backup
-                    temp_restore_file = BACKUP_DIR / f"temp_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+                    temp_restore_file = BACKUP_DIR / f"temp_restore_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.db"
                     with gzip.open(backup_file, 'rb') as f_in:
                         with open(temp_restore_file, 'wb') as f_out:
-                            shutil.copyfileobj(f_in, f_out)
+                            shutil.copyfileobj(f_in, f_out, BACKUP_IO_CHUNK)
 
                     # Reemplazar el archivo de la base de datos actual
                     if sqlite_path.exists():
@@ -341,11 +442,14 @@ class BackupService:
 
                 log.info("PostgreSQL database restored successfully", backup_id=backup_id)
 
+            # Los usuarios y las tasas pueden haber cambiado con los datos restaurados
+            User.invalidate_login_cache()
+            ExchangeRate.invalidate_cache()
             return {
                 "status": "success",
                 "message": f"Base de datos restaurada desde {backup_id}",
                 "backup_id": backup_id,
-                "restored_at": datetime.now().isoformat(),
+                "restored_at": datetime.now(timezone.utc).isoformat(),
             }
 
         except Exception as e:
@@ -361,6 +465,7 @@ class BackupService:
                 raise FileNotFoundError(f"Respaldo no encontrado: {backup_id}")
 
             backup_file.unlink()
+            BackupService.invalidate_list_cache()
             log.info("Backup deleted", backup_id=backup_id)
 
             return {
@@ -419,7 +524,7 @@ class BackupService:
             return {
                 "total_records": total_records,
                 "tables": tables_info,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
             }
         except Exception as e:
             log.error("Error getting database info", error=str(e))
@@ -483,6 +588,8 @@ class BackupService:
             deleted_counts["users"] = db.query(User).filter(User.id != keep_admin_user_id).delete()
 
             db.commit()
+            ExchangeRate.invalidate_cache()
+            User.invalidate_login_cache()
 
             total_deleted = sum(deleted_counts.values())
 
@@ -494,7 +601,7 @@ class BackupService:
                 "records_deleted": total_deleted,
                 "details": deleted_counts,
                 "admin_preserved": True,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
             }
 
         except Exception as e:
@@ -547,6 +654,8 @@ class BackupService:
             restore_session.commit()
         finally:
             restore_session.close()
+        User.invalidate_login_cache()
+        ExchangeRate.invalidate_cache()
 
         log.info("SQLite database recreated successfully", path=str(sqlite_path))
         return {
@@ -555,7 +664,7 @@ class BackupService:
             "records_deleted": "full_reset",
             "details": {},
             "admin_preserved": True,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
     @staticmethod
@@ -576,6 +685,7 @@ class BackupService:
             ExchangeRateSnapshot, FinancialTransaction
         )
         from app.core.security import get_password_hash
+        from sqlalchemy import insert, text
         import random
         import uuid
         from datetime import datetime, timedelta
@@ -680,19 +790,24 @@ class BackupService:
                         existing_network_names.add(candidate)
                         return candidate
 
+            def insert_rows(model, rows: list[dict]) -> list[int]:
+                """INSERT de múltiples VALUES por tabla; devuelve los ids en el orden de rows."""
+                if not rows:
+                    return []
+                stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+                return list(db.scalars(stmt, rows))
+
             # 1. Habitaciones con más variedad
             rooms = []
             for i in range(base_count):
-                room = Room(
-                    number=generate_room_number(),
-                    type=random.choice(room_types),
-                    price_bs=random.randint(800, 6000),
-                    status=random.choice(room_statuses),
-                    notes=f"Habitación de prueba #{i+1}. {random.choice(['Con balcón', 'Vista a la calle', 'Esquinera', 'Interior', 'Piso alto'])}",
-                )
-                db.add(room)
-                rooms.append(room)
-            db.flush()
+                rooms.append({
+                    "number": generate_room_number(),
+                    "type": random.choice(room_types),
+                    "price_bs": random.randint(800, 6000),
+                    "status": random.choice(room_statuses),
+                    "notes": f"Habitación de prueba #{i+1}. {random.choice(['Con balcón', 'Vista a la calle', 'Esquinera', 'Interior', 'Piso alto'])}",
+                })
+            room_ids = insert_rows(Room, rooms)
             created_counts["rooms"] = len(rooms)
 
             # 2. Huéspedes con nombres realistas
@@ -700,16 +815,15 @@ class BackupService:
             for i in range(base_count * 3):
                 first_name = random.choice(first_names)
                 last_name = f"{random.choice(last_names)} {random.choice(last_names)}"
-                guest = Guest(
-                    full_name=f"{first_name} {last_name}",
-                    document_id=generate_guest_document(),
-                    email=f"{first_name.lower()}.{last_name.split()[0].lower()}{i}@{'gmail.com' if i % 2 == 0 else 'hotmail.com'}",
-                    phone=f"+58{random.choice(['414', '424', '412', '416'])}{random.randint(1000000, 9999999)}",
-                    notes=f"País: {random.choice(['Venezuela', 'Colombia', 'España', 'Argentina', 'México', 'Chile', 'Perú'])}. Dirección: Calle {random.randint(1, 100)}, {random.choice(['Caracas', 'Maracaibo', 'Valencia', 'Maracay'])}",
-                )
-                db.add(guest)
-                guests.append(guest)
-            db.flush()
+                guests.append({
+                    "full_name": f"{first_name} {last_name}",
+                    "document_id": generate_guest_document(),
+                    "email": f"{first_name.lower()}.{last_name.split()[0].lower()}{i}@{'gmail.com' if i % 2 == 0 else 'hotmail.com'}",
+                    "phone": f"+58{random.choice(['414', '424', '412', '416'])}{random.randint(1000000, 9999999)}",
+                    "notes": f"País: {random.choice(['Venezuela', 'Colombia', 'España', 'Argentina', 'México', 'Chile', 'Perú'])}. Dirección: Calle {random.randint(1, 100)}, {random.choice(['Caracas', 'Maracaibo', 'Valencia', 'Maracay'])}",
+                })
+            for guest, guest_id in zip(guests, insert_rows(Guest, guests)):
+                guest["id"] = guest_id
             created_counts["guests"] = len(guests)
 
             # 3. Personal con más variedad
@@ -717,25 +831,31 @@ class BackupService:
             for i in range(base_count):
                 first_name = random.choice(first_names)
                 last_name = f"{random.choice(last_names)} {random.choice(last_names)}"
-                staff = Staff(
-                    full_name=f"{first_name} {last_name}",
-                    document_id=generate_staff_document(),
-                    role=random.choice(staff_roles),
-                    phone=f"+58{random.choice(['414', '424', '412'])}{random.randint(1000000, 9999999)}",
-                    email=generate_staff_email(first_name),
-                    salary=random.randint(600, 2000),
-                    status=random.choice([StaffStatus.active, StaffStatus.inactive]) if i % 10 != 0 else StaffStatus.active,
-                    hire_date=datetime.now().date() - timedelta(days=random.randint(30, 1000)),
-                )
-                db.add(staff)
-                staff_members.append(staff)
-            db.flush()
+                staff_members.append({
+                    "full_name": f"{first_name} {last_name}",
+                    "document_id": generate_staff_document(),
+                    "role": random.choice(staff_roles),
+                    "phone": f"+58{random.choice(['414', '424', '412'])}{random.randint(1000000, 9999999)}",
+                    "email": generate_staff_email(first_name),
+                    "salary": random.randint(600, 2000),
+                    "status": random.choice([StaffStatus.active, StaffStatus.inactive]) if i % 10 != 0 else StaffStatus.active,
+                    "hire_date": datetime.now().date() - timedelta(days=random.randint(30, 1000)),
+                })
+            staff_ids = insert_rows(Staff, staff_members)
             created_counts["staff"] = len(staff_members)
 
             # 4. Reservas con más variedad temporal
             reservations = []
+            # res_no_overlap: las reservas pendientes o activas de una habitación no pueden
+            # solaparse, así que cada una empieza cuando termina la anterior de esa habitación
+            room_booked_until = {}
             for i in range(min(base_count * 2, len(rooms) * 3, len(guests))):
+                room_id = room_ids[random.randint(0, len(room_ids) - 1)]
+                reservation_status = random.choice(reservation_statuses)
+                blocks_room = reservation_status in (ReservationStatus.pending, ReservationStatus.active)
                 start_date = datetime.now().date() + timedelta(days=random.randint(-90, 60))
+                if blocks_room:
+                    start_date = max(start_date, room_booked_until.get(room_id, start_date))
                 periods = random.randint(1, 21)
                 period_type = random.choice([Period.day, Period.week, Period.month])
 
@@ -745,21 +865,22 @@ class BackupService:
                     end_date = start_date + timedelta(weeks=periods)
                 else:
                     end_date = start_date + timedelta(days=periods * 30)
-
-                reservation = Reservation(
-                    guest_id=guests[random.randint(0, len(guests) - 1)].id,
-                    room_id=rooms[random.randint(0, len(rooms) - 1)].id,
-                    start_date=start_date,
-                    end_date=end_date,
-                    period=period_type,
-                    periods_count=periods,
-                    price_bs=random.randint(500, 5000),
-                    status=random.choice(reservation_statuses),
-                    notes=f"Reserva de prueba #{i+1}" if i % 3 == 0 else None,
-                )
-                db.add(reservation)
-                reservations.append(reservation)
-            db.flush()
+                if blocks_room:
+                    room_booked_until[room_id] = end_date
+
+                reservations.append({
+                    "guest_id": guests[random.randint(0, len(guests) - 1)]["id"],
+                    "room_id": room_id,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "period": period_type,
+                    "periods_count": periods,
+                    "price_bs": random.randint(500, 5000),
+                    "status": reservation_status,
+                    "notes": f"Reserva de prueba #{i+1}" if i % 3 == 0 else None,
+                })
+            for reservation, reservation_id in zip(reservations, insert_rows(Reservation, reservations)):
+                reservation["id"] = reservation_id
             created_counts["reservations"] = len(reservations)
 
             # 5. Pagos con más variedad
@@ -768,59 +889,29 @@ class BackupService:
                 currency = random.choice(currencies)
                 amount = random.randint(10, 500) if currency == Currency.USD else (random.randint(10, 300) if currency == Currency.EUR else random.randint(300, 20000))
 
-                payment = Payment(
-                    guest_id=reservations[i].guest_id,
-                    amount=amount,
-                    currency=currency,
-                    method=random.choice(payment_methods),
-                    status=random.choice([PaymentStatus.completed, PaymentStatus.pending]) if i % 10 != 0 else PaymentStatus.completed,
-                    payment_date=datetime.now() - timedelta(days=random.randint(0, 60)),
-                    reference_number=f"REF-{random.randint(100000, 999999)}" if i % 2 == 0 else None,
-                    notes=f"Pago de prueba #{i+1}" if i % 5 == 0 else None,
-                )
-                db.add(payment)
-                payments.append(payment)
-            db.flush()
+                payments.append({
+                    "guest_id": reservations[i]["guest_id"],
+                    "amount": amount,
+                    "currency": currency,
+                    "method": random.choice(payment_methods),
+                    "status": random.choice([PaymentStatus.completed, PaymentStatus.pending]) if i % 10 != 0 else PaymentStatus.completed,
+                    "payment_date": datetime.now() - timedelta(days=random.randint(0, 60)),
+                    "reference_number": f"REF-{random.randint(100000, 999999)}" if i % 2 == 0 else None,
+                    "notes": f"Pago de prueba #{i+1}" if i % 5 == 0 else None,
+                })
+            insert_rows(Payment, payments)
             created_counts["payments"] = len(payments)
 
             # 6. Facturas con líneas de factura (modelo venezolano)
+            # Las líneas se generan primero para insertar cada factura ya con sus totales reales
             invoices = []
-            invoice_lines_total = 0
+            invoice_lines_by_invoice = []
             for i in range(min(base_count * 2, len(guests))):
                 invoice_date = datetime.now().date() - timedelta(days=random.randint(0, 90))
                 guest = guests[random.randint(0, len(guests) - 1)]
 
-                # Calcular valores
-                subtotal_amount = float(random.randint(500, 5000))
-                tax_percentage = 16.0
-                tax_amount = subtotal_amount * (tax_percentage / 100.0)
-                total_amount = subtotal_amount + tax_amount
-
-                invoice = Invoice(
-                    guest_id=guest.id,
-                    client_name=guest.full_name,
-                    client_rif=f"J-{random.randint(300000000, 399999999)}" if i % 3 == 0 else None,
-                    client_email=guest.email,
-                    client_phone=guest.phone,
-                    control_number=f"HC-{i+1:08d}",  # Número de control SENIAT
-                    invoice_number=i + 1,  # Número secuencial (int)
-                    invoice_series="A",
-                    invoice_date=invoice_date,
-                    status=random.choice([InvoiceStatus.issued, InvoiceStatus.paid, InvoiceStatus.draft]) if i % 15 != 0 else InvoiceStatus.paid,
-                    currency="VES" if i % 3 != 0 else "USD",
-                    exchange_rate=1.0 if i % 3 != 0 else random.uniform(30.0, 45.0),
-                    subtotal=subtotal_amount,
-                    taxable_amount=subtotal_amount,
-                    tax_percentage=tax_percentage,
-                    tax_amount=tax_amount,
-                    total=total_amount,
-                    notes=f"Factura de prueba #{i+1}" if i % 4 == 0 else None,
-                )
-                db.add(invoice)
-                db.flush()
-
-                # Agregar líneas de factura
                 num_lines = random.randint(1, 5)
+                lines = []
                 line_subtotal = 0.0
                 for j in range(num_lines):
                     unit_price = float(random.randint(50, 1000))
@@ -828,9 +919,8 @@ class BackupService:
                     line_total = unit_price * quantity
                     line_tax = line_total * 0.16
 
-                    invoice_line = InvoiceLine(
-                        invoice_id=invoice.id,
-                        description=random.choice([
+                    lines.append({
+                        "description": random.choice([
                             "Hospedaje - Habitación estándar",
                             "Hospedaje - Suite",
                             "Servicio de limpieza",
@@ -840,59 +930,75 @@ class BackupService:
                             "Internet Premium",
                             "Traslado al aeropuerto"
                         ]),
-                        quantity=quantity,
-                        unit_price=unit_price,
-                        line_total=line_total,
-                        is_taxable=True,
-                        tax_percentage=16.0,
-                        tax_amount=line_tax,
-                        line_order=j + 1,
-                    )
-                    db.add(invoice_line)
+                        "quantity": quantity,
+                        "unit_price": unit_price,
+                        "line_total": line_total,
+                        "is_taxable": True,
+                        "tax_percentage": 16.0,
+                        "tax_amount": line_tax,
+                        "line_order": j + 1,
+                    })
                     line_subtotal += line_total
-                    invoice_lines_total += 1
-
-                # Actualizar totales de la factura con los valores reales
-                invoice.subtotal = line_subtotal
-                invoice.taxable_amount = line_subtotal
-                invoice.tax_amount = line_subtotal * 0.16
-                invoice.total = line_subtotal + invoice.tax_amount
-
-                invoices.append(invoice)
-            db.flush()
+                invoice_lines_by_invoice.append(lines)
+
+                tax_amount = line_subtotal * 0.16
+                invoices.append({
+                    "guest_id": guest["id"],
+                    "client_name": guest["full_name"],
+                    "client_rif": f"J-{random.randint(300000000, 399999999)}" if i % 3 == 0 else None,
+                    "client_email": guest["email"],
+                    "client_phone": guest["phone"],
+                    "control_number": f"HC-{i+1:08d}",  # Número de control SENIAT
+                    "invoice_number": i + 1,  # Número secuencial (int)
+                    "invoice_series": "A",
+                    "invoice_date": invoice_date,
+                    "status": random.choice([InvoiceStatus.issued, InvoiceStatus.paid, InvoiceStatus.draft]) if i % 15 != 0 else InvoiceStatus.paid,
+                    "currency": "VES" if i % 3 != 0 else "USD",
+                    "exchange_rate": 1.0 if i % 3 != 0 else random.uniform(30.0, 45.0),
+                    "subtotal": line_subtotal,
+                    "taxable_amount": line_subtotal,
+                    "tax_percentage": 16.0,
+                    "tax_amount": tax_amount,
+                    "total": line_subtotal + tax_amount,
+                    "notes": f"Factura de prueba #{i+1}" if i % 4 == 0 else None,
+                })
+            invoice_lines = []
+            for invoice_id, lines in zip(insert_rows(Invoice, invoices), invoice_lines_by_invoice):
+                for line in lines:
+                    line["invoice_id"] = invoice_id
+                    invoice_lines.append(line)
+            if invoice_lines:
+                db.execute(insert(InvoiceLine), invoice_lines)
             created_counts["invoices"] = len(invoices)
-            created_counts["invoice_lines"] = invoice_lines_total
+            created_counts["invoice_lines"] = len(invoice_lines)
 
             # 7. Dispositivos de red
             network_devices = []
             for i in range(max(1, base_count // 3)):
-                device = NetworkDevice(
-                    name=generate_network_name(random.choice(['Router', 'Switch', 'AccessPoint', 'Controller'])),
-                    brand=random.choice(device_brands),
-                    device_type=random.choice(device_types),
-                    ip_address=generate_network_ip(),
-                    port=random.choice([8728, 80, 443, 22]),
-                    username="admin",
-                    auth_type=random.choice(auth_types),
-                    connection_status=random.choice(connection_statuses) if i % 10 != 0 else ConnectionStatus.CONNECTED,
-                )
-                db.add(device)
-                network_devices.append(device)
-            db.flush()
+                network_devices.append({
+                    "name": generate_network_name(random.choice(['Router', 'Switch', 'AccessPoint', 'Controller'])),
+                    "brand": random.choice(device_brands),
+                    "device_type": random.choice(device_types),
+                    "ip_address": generate_network_ip(),
+                    "port": random.choice([8728, 80, 443, 22]),
+                    "username": "admin",
+                    "auth_type": random.choice(auth_types),
+                    "connection_status": random.choice(connection_statuses) if i % 10 != 0 else ConnectionStatus.CONNECTED,
+                })
+            insert_rows(NetworkDevice, network_devices)
             created_counts["network_devices"] = len(network_devices)
 
             # 8. Dispositivos de huéspedes
             devices = []
             for i in range(min(base_count * 4, len(guests) * 2)):
-                device = Device(
-                    guest_id=guests[random.randint(0, len(guests) - 1)].id,
-                    mac=generate_mac(),
-                    name=random.choice(["iPhone", "Samsung Galaxy", "MacBook", "HP Laptop", "iPad", "Android Tablet", "Dell Laptop"]) + f" #{i+1}",
-                    suspended=random.random() < 0.1,  # 10% suspendidos
-                )
-                db.add(device)
-                devices.append(device)
-            db.flush()
+                devices.append({
+                    "guest_id": guests[random.randint(0, len(guests) - 1)]["id"],
+                    "mac": generate_mac(),
+                    "name": random.choice(["iPhone", "Samsung Galaxy", "MacBook", "HP Laptop", "iPad", "Android Tablet", "Dell Laptop"]) + f" #{i+1}",
+                    "suspension_flags": Device.SUSPENDED_MANUAL if random.random() < 0.1 else 0,  # 10% suspendidos
+                })
+            for device, device_id in zip(devices, insert_rows(Device, devices)):
+                device["id"] = device_id
             created_counts["devices"] = len(devices)
 
             # 9. Actividades de red
@@ -902,112 +1008,100 @@ class BackupService:
                 device = devices[random.randint(0, len(devices) - 1)]
                 bytes_down = random.randint(100 * 1024 * 1024, 50000 * 1024 * 1024)  # 100MB a 50GB en bytes
                 bytes_up = random.randint(10 * 1024 * 1024, 5000 * 1024 * 1024)  # 10MB a 5GB en bytes
-                activity = NetworkActivity(
-                    device_id=device.id,
-                    guest_id=device.guest_id,
-                    activity_type=random.choice([ActivityType.connected, ActivityType.disconnected, ActivityType.blocked, ActivityType.unblocked]),
-                    bytes_downloaded=bytes_down,
-                    bytes_uploaded=bytes_up,
-                    session_duration_seconds=random.randint(300, 86400),  # 5 minutos a 24 horas
-                    timestamp=datetime.now() - timedelta(hours=random.randint(0, 720)),  # últimos 30 días
-                    ip_address=f"192.168.{random.randint(1, 10)}.{random.randint(10, 254)}",
-                )
-                db.add(activity)
-                network_activities.append(activity)
-            db.flush()
+                network_activities.append({
+                    "device_id": device["id"],
+                    "guest_id": device["guest_id"],
+                    "activity_type": random.choice([ActivityType.connected, ActivityType.disconnected, ActivityType.blocked, ActivityType.unblocked]),
+                    "bytes_downloaded": bytes_down,
+                    "bytes_uploaded": bytes_up,
+                    "session_duration_seconds": random.randint(300, 86400),  # 5 minutos a 24 horas
+                    "timestamp": datetime.now() - timedelta(hours=random.randint(0, 720)),  # últimos 30 días
+                    "ip_address": f"192.168.{random.randint(1, 10)}.{random.randint(10, 254)}",
+                    "initiated_by_system": True,
+                })
+            NetworkActivity.bulk_log(db, network_activities, async_commit=True)
             created_counts["network_activities"] = len(network_activities)
 
             # 10. Órdenes de mantenimiento
             maintenances = []
             for i in range(base_count):
                 reported_date = datetime.now() - timedelta(days=random.randint(0, 60))
-                maint = Maintenance(
-                    room_id=rooms[random.randint(0, len(rooms) - 1)].id,
-                    type=random.choice(maintenance_types),
-                    title=f"{random.choice(['Reparación', 'Revisión', 'Instalación', 'Mantenimiento'])} - {random.choice(['urgente', 'programado', 'preventivo'])}",
-                    description=f"Mantenimiento de prueba #{i+1}. {random.choice(['Requiere atención inmediata', 'Programado para este mes', 'Revisión de rutina', 'Reporte de huésped'])}",
-                    priority=random.choice(maintenance_priorities),
-                    status=random.choice(maintenance_statuses),
-                    reported_at=reported_date,
-                    completed_at=reported_date + timedelta(days=random.randint(1, 14)) if random.random() > 0.5 else None,
-                    assigned_to=staff_members[random.randint(0, len(staff_members) - 1)].id if staff_members and random.random() > 0.3 else None,
-                )
-                db.add(maint)
-                maintenances.append(maint)
-            db.flush()
+                maintenances.append({
+                    "room_id": room_ids[random.randint(0, len(room_ids) - 1)],
+                    "type": random.choice(maintenance_types),
+                    "title": f"{random.choice(['Reparación', 'Revisión', 'Instalación', 'Mantenimiento'])} - {random.choice(['urgente', 'programado', 'preventivo'])}",
+                    "description": f"Mantenimiento de prueba #{i+1}. {random.choice(['Requiere atención inmediata', 'Programado para este mes', 'Revisión de rutina', 'Reporte de huésped'])}",
+                    "priority": random.choice(maintenance_priorities),
+                    "status": random.choice(maintenance_statuses),
+                    "reported_at": reported_date,
+                    "completed_at": reported_date + timedelta(days=random.randint(1, 14)) if random.random() > 0.5 else None,
+                    "assigned_to": staff_ids[random.randint(0, len(staff_ids) - 1)] if staff_ids and random.random() > 0.3 else None,
+                })
+            insert_rows(Maintenance, maintenances)
             created_counts["maintenances"] = len(maintenances)
 
             # 11. Ocupancias
             occupancies = []
             for i in range(min(base_count, len(reservations))):
-                if reservations[i].status == ReservationStatus.active:
-                    occupancy = Occupancy(
-                        reservation_id=reservations[i].id,
-                        room_id=reservations[i].room_id,
-                        guest_id=reservations[i].guest_id,
-                        check_in=reservations[i].start_date,
-                        check_out=reservations[i].end_date if random.random() > 0.7 else None,
-                    )
-                    db.add(occupancy)
-                    occupancies.append(occupancy)
-            db.flush()
+                if reservations[i]["status"] == ReservationStatus.active:
+                    occupancies.append({
+                        "reservation_id": reservations[i]["id"],
+                        "room_id": reservations[i]["room_id"],
+                        "guest_id": reservations[i]["guest_id"],
+                        "check_in": reservations[i]["start_date"],
+                        "check_out": reservations[i]["end_date"] if random.random() > 0.7 else None,
+                    })
+            insert_rows(Occupancy, occupancies)
             created_counts["occupancies"] = len(occupancies)
 
             # 12. Tasas de cambio con histórico
             exchange_rates = []
             for i in range(random.randint(5, 15)):
-                rate = ExchangeRate(
-                    from_currency="USD",
-                    to_currency="VES",
-                    rate=random.uniform(30.0, 45.0),
-                    source=random.choice(["manual", "bcv", "dolar_today"]),
-                    is_manual=random.choice([0, 1]),
-                    date=datetime.now() - timedelta(days=i * 7),
-                )
-                db.add(rate)
-                exchange_rates.append(rate)
-            db.flush()
+                exchange_rates.append({
+                    "from_currency": "USD",
+                    "to_currency": "VES",
+                    "rate": random.uniform(30.0, 45.0),
+                    "source": random.choice(["manual", "bcv", "dolar_today"]),
+                    "is_manual": random.choice([0, 1]),
+                    "date": datetime.now() - timedelta(days=i * 7),
+                })
+            insert_rows(ExchangeRate, exchange_rates)
             created_counts["exchange_rates"] = len(exchange_rates)
 
             # 13. Snapshots de tasas de cambio
             exchange_rate_snapshots = []
             for i in range(random.randint(3, 10)):
-                # Generar tasas realistas
-                ves_to_usd_rate = random.uniform(0.020, 0.030)  # 1 VES = ~0.025 USD
-                ves_to_eur_rate = random.uniform(0.018, 0.027)  # 1 VES = ~0.022 EUR
-                usd_to_eur_rate = random.uniform(0.85, 0.95)    # 1 USD = ~0.90 EUR
-
-                snapshot = ExchangeRateSnapshot(
-                    ves_to_usd=ves_to_usd_rate,
-                    ves_to_eur=ves_to_eur_rate,
-                    usd_to_eur=usd_to_eur_rate,
-                    source=random.choice(["dolarapi", "bcv", "manual", "exchangerate-api"]),
-                    is_manual=random.choice([0, 1]),
-                    snapshot_date=datetime.now() - timedelta(days=i * 7),  # Un snapshot por semana
-                )
-                db.add(snapshot)
-                exchange_rate_snapshots.append(snapshot)
-            db.flush()
+                exchange_rate_snapshots.append({
+                    "ves_to_usd": random.uniform(0.020, 0.030),  # 1 VES = ~0.025 USD
+                    "ves_to_eur": random.uniform(0.018, 0.027),  # 1 VES = ~0.022 EUR
+                    "usd_to_eur": random.uniform(0.85, 0.95),    # 1 USD = ~0.90 EUR
+                    "source": random.choice(["dolarapi", "bcv", "manual", "exchangerate-api"]),
+                    "is_manual": random.choice([0, 1]),
+                    "snapshot_date": datetime.now() - timedelta(days=i * 7),  # Un snapshot por semana
+                })
+            insert_rows(ExchangeRateSnapshot, exchange_rate_snapshots)
             created_counts["exchange_rate_snapshots"] = len(exchange_rate_snapshots)
 
             # 14. Tarifas de habitación
+            if db.get_bind().dialect.name == "postgresql":
+                # Unicidad (room_id, period) verificada una sola vez al COMMIT
+                db.execute(text("SET CONSTRAINTS uq_room_rate_room_period DEFERRED"))
             room_rates = []
-            for room in rooms:
+            for room_id in room_ids:
                 # Generar múltiples tarifas por periodo
                 for period in [Period.day, Period.week, Period.month]:
-                    rate = RoomRate(
-                        room_id=room.id,
-                        period=period,
-                        price_bs=random.randint(1000, 8000) if period == Period.day else (
+                    room_rates.append({
+                        "room_id": room_id,
+                        "period": period,
+                        "price_bs": random.randint(1000, 8000) if period == Period.day else (
                             random.randint(6000, 50000) if period == Period.week else random.randint(20000, 150000)
                         ),
-                    )
-                    db.add(rate)
-                    room_rates.append(rate)
-            db.flush()
+                    })
+            insert_rows(RoomRate, room_rates)
             created_counts["room_rates"] = len(room_rates)
 
             db.commit()
+            ExchangeRate.invalidate_cache()
 
             total_created = sum(created_counts.values())
 
@@ -1018,7 +1112,7 @@ class BackupService:
                 "message": f"Datos de prueba generados exitosamente: {total_created} registros",
                 "total_records_created": total_created,
                 "details": created_counts,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
             }
 
         except Exception as e:
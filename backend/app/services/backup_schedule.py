@@ -87,7 +87,7 @@ class BackupScheduleService:
         if datetime.utcnow() >= next_run_dt:
             try:
                 log.info("Running scheduled backup")
-                BackupService.create_backup(data.get("description"))
+                await BackupService.create_backup_async(data.get("description"))
                 BackupScheduleService.record_execution()
             except Exception as exc:
                 log.error("Scheduled backup failed", error=str(exc))
@@ -146,6 +146,7 @@ class CurrencyService:
             db.add(exchange_rate_eur)
 
         db.commit()
+        ExchangeRate.invalidate_cache()
         return True
 
     @classmethod
@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional, List
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select, update
 
 from ..models.device import Device
 from ..models.occupancy import Occupancy
@@ -15,6 +15,9 @@ from ..models.guest import Guest
 from ..models.payment import Payment, PaymentStatus
 from ..models.reservation import Reservation
 
+# Tamaño de las listas IN de los UPDATE masivos de check_and_suspend_all_devices
+SUSPENSION_UPDATE_CHUNK = 1000
+
 
 class DeviceSuspensionReason:
     """Razones predefinidas para la suspensión automática de dispositivos."""
@@ -105,44 +108,99 @@ def has_valid_occupancy_or_staff(db: Session, device: Device) -> bool:
     return False
 
 
-def get_device_suspension_reason(db: Session, device: Device) -> Optional[str]:
+def load_suspension_context(db: Session, guest_ids: set[int], staff_ids: set[int]) -> dict:
     """
-    Obtiene la razón por la cual un dispositivo debería ser suspendido automáticamente.
+    Precarga, con una consulta por tabla, los datos que deciden la suspensión automática
+    de los dispositivos de esos huéspedes y empleados.
 
-    Args:
-        db: Sesión de base de datos
-        device: Dispositivo a evaluar
+    Returns:
+        Diccionario con 'existing_guests', 'occupied_guests' y 'arrears_guests' (sets de
+        guest_id) y 'staff_status' (staff_id -> StaffStatus)
+    """
+    from ..models.staff import Staff
+
+    context = {'existing_guests': set(), 'occupied_guests': set(), 'arrears_guests': set(), 'staff_status': {}}
+    if guest_ids:
+        context['existing_guests'] = set(db.scalars(select(Guest.id).where(Guest.id.in_(guest_ids))))
+        context['occupied_guests'] = set(db.scalars(
+            select(Occupancy.guest_id)
+            .where(Occupancy.guest_id.in_(guest_ids), Occupancy.check_out.is_(None))
+            .distinct()
+        ))
+        context['arrears_guests'] = set(db.scalars(
+            select(Payment.guest_id)
+            .where(Payment.guest_id.in_(guest_ids), Payment.status == PaymentStatus.pending)
+            .distinct()
+        ))
+    if staff_ids:
+        context['staff_status'] = dict(
+            db.execute(select(Staff.id, Staff.status).where(Staff.id.in_(staff_ids))).all()
+        )
+    return context
+
+
+def suspension_reason_in_context(context: dict, guest_id: Optional[int], staff_id: Optional[int]) -> Optional[str]:
+    """
+    Razón por la cual un dispositivo debería ser suspendido automáticamente, evaluada en
+    memoria sobre un contexto de load_suspension_context.
 
     Returns:
         Razón de suspensión si aplica, None si no debe ser suspendido
     """
+    from ..models.staff import StaffStatus
+
+    existing_guests = context['existing_guests']
+    occupied_guests = context['occupied_guests']
+    staff_status = context['staff_status']
+
     # Verificar si tiene ocupancia/personal válido
-    if not has_valid_occupancy_or_staff(db, device):
-        if device.guest_id:
-            occupancy = get_guest_active_occupancy(db, device.guest_id)
-            if not occupancy:
+    if staff_id:
+        valid = staff_status.get(staff_id) == StaffStatus.active
+    elif guest_id:
+        valid = guest_id in existing_guests and guest_id in occupied_guests
+    else:
+        valid = False
+
+    if not valid:
+        if guest_id:
+            if guest_id not in occupied_guests:
                 return DeviceSuspensionReason.NO_ACTIVE_OCCUPANCY
-            guest = db.query(Guest).filter(Guest.id == device.guest_id).first()
-            if not guest:
+            if guest_id not in existing_guests:
                 return DeviceSuspensionReason.GUEST_DELETED
-        elif device.staff_id:
-            from ..models.staff import Staff, StaffStatus
-            staff = db.query(Staff).filter(Staff.id == device.staff_id).first()
-            if not staff:
+        elif staff_id:
+            if staff_id not in staff_status:
                 return DeviceSuspensionReason.GUEST_DELETED
-            if staff.status != StaffStatus.active:
+            if staff_status[staff_id] != StaffStatus.active:
                 return DeviceSuspensionReason.STAFF_INACTIVE
         else:
             return DeviceSuspensionReason.NO_ACTIVE_OCCUPANCY
 
     # Verificar si huésped está en mora
-    if device.guest_id:
-        if is_guest_in_arrears(db, device.guest_id):
-            return DeviceSuspensionReason.GUEST_IN_ARREARS
+    if guest_id and guest_id in context['arrears_guests']:
+        return DeviceSuspensionReason.GUEST_IN_ARREARS
 
     return None
 
 
+def get_device_suspension_reason(db: Session, device: Device) -> Optional[str]:
+    """
+    Obtiene la razón por la cual un dispositivo debería ser suspendido automáticamente.
+
+    Args:
+        db: Sesión de base de datos
+        device: Dispositivo a evaluar
+
+    Returns:
+        Razón de suspensión si aplica, None si no debe ser suspendido
+    """
+    context = load_suspension_context(
+        db,
+        {device.guest_id} if device.guest_id else set(),
+        {device.staff_id} if device.staff_id else set(),
+    )
+    return suspension_reason_in_context(context, device.guest_id, device.staff_id)
+
+
 def should_suspend_device(db: Session, device: Device) -> bool:
     """
     Determina si un dispositivo debe ser suspendido automáticamente.
@@ -216,11 +274,19 @@ def auto_reactivate_device(db: Session, device: Device) -> bool:
     return True
 
 
+def _chunks(ids: List[int]):
+    for start in range(0, len(ids), SUSPENSION_UPDATE_CHUNK):
+        yield ids[start:start + SUSPENSION_UPDATE_CHUNK]
+
+
 def check_and_suspend_all_devices(db: Session) -> dict:
     """
     Revisa todos los dispositivos y suspende los que deben serlo.
     Útil para ejecutarse periódicamente como tarea programada.
 
+    Se lee una vez cada tabla involucrada (load_suspension_context), se decide en memoria
+    y los cambios se escriben con UPDATE masivos por razón, en una sola transacción.
+
     Args:
         db: Sesión de base de datos
 
@@ -241,26 +307,57 @@ def check_and_suspend_all_devices(db: Session) -> dict:
     }
 
     try:
-        devices = db.query(Device).all()
+        devices = db.execute(
+            select(Device.id, Device.guest_id, Device.staff_id, Device.suspension_flags)
+        ).all()
         stats['total_checked'] = len(devices)
 
-        for device in devices:
-            try:
-                # Verificar si debe ser suspendido
-                if should_suspend_device(db, device):
-                    reason = get_device_suspension_reason(db, device)
-                    if auto_suspend_device(db, device, reason):
-                        stats['newly_suspended'] += 1
-                    else:
-                        stats['already_suspended'] += 1
+        context = load_suspension_context(
+            db,
+            {row.guest_id for row in devices if row.guest_id},
+            {row.staff_id for row in devices if row.staff_id},
+        )
+
+        to_suspend: dict[str, List[int]] = {}
+        to_reactivate: List[int] = []
+        for row in devices:
+            reason = suspension_reason_in_context(context, row.guest_id, row.staff_id)
+            auto_suspended = bool(row.suspension_flags & Device.SUSPENDED_AUTO)
+            if reason is not None:
+                if auto_suspended:
+                    stats['already_suspended'] += 1
                 else:
-                    # Intentar reactivar si está suspendido
-                    if device.auto_suspended:
-                        if auto_reactivate_device(db, device):
-                            stats['reactivated'] += 1
-
-            except Exception as e:
-                stats['errors'].append(f"Device {device.id}: {str(e)}")
+                    to_suspend.setdefault(reason, []).append(row.id)
+            elif auto_suspended:
+                to_reactivate.append(row.id)
+
+        # Los bits se cambian en SQL: no pisan una suspensión manual hecha mientras tanto
+        now = datetime.utcnow()
+        for reason, ids in to_suspend.items():
+            for chunk in _chunks(ids):
+                db.execute(
+                    update(Device)
+                    .where(Device.id.in_(chunk))
+                    .values(
+                        suspension_flags=Device.suspension_flags.op("|")(Device.SUSPENDED_AUTO),
+                        auto_suspension_reason=reason,
+                        auto_suspension_date=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            stats['newly_suspended'] += len(ids)
+        for chunk in _chunks(to_reactivate):
+            db.execute(
+                update(Device)
+                .where(Device.id.in_(chunk))
+                .values(
+                    suspension_flags=Device.suspension_flags.op("&")(~Device.SUSPENDED_AUTO),
+                    auto_suspension_reason=None,
+                    auto_suspension_date=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        stats['reactivated'] = len(to_reactivate)
 
         # Guardar cambios
         db.commit()
@@ -295,10 +392,10 @@ def get_devices_by_suspension_status(
     query = db.query(Device)
 
     if auto_suspended is not None:
-        query = query.filter(Device.auto_suspended == auto_suspended)
+        query = query.filter(Device.auto_suspended if auto_suspended else ~Device.auto_suspended)
 
     if manually_suspended is not None:
-        query = query.filter(Device.suspended == manually_suspended)
+        query = query.filter(Device.suspended if manually_suspended else ~Device.suspended)
 
     if guest_id is not None:
         query = query.filter(Device.guest_id == guest_id)
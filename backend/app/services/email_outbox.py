@@ -0,0 +1,84 @@
+# app/services/email_outbox.py
+"""
+Encolado y envío de correos a través de la tabla email_outbox.
+Cada ejecución envía un lote acotado (límite de ritmo frente al servidor SMTP) y
+reprograma los fallos con espera exponencial hasta MAX_ATTEMPTS. El cuerpo de un
+correo enviado o descartado se borra (los de recuperación llevan el token en claro)
+y las filas enviadas se purgan tras SENT_RETENTION_DAYS.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+import structlog
+from sqlalchemy.orm import Session
+
+from ..core.email_service import deliver_email
+from ..models.email_outbox import EmailOutbox, EmailOutboxStatus
+
+log = structlog.get_logger()
+
+BATCH_SIZE = 20
+MAX_ATTEMPTS = 5
+SENT_RETENTION_DAYS = 7
+
+
+def enqueue_email(
+    db: Session,
+    subject: str,
+    to_email: str,
+    text_body: str,
+    html_body: Optional[str] = None,
+) -> EmailOutbox:
+    """Agrega un correo a la bandeja de salida; se guarda con el commit del llamador."""
+    email = EmailOutbox(to_email=to_email, subject=subject, text_body=text_body, html_body=html_body)
+    db.add(email)
+    return email
+
+
+async def deliver_pending_emails(db: Session) -> int:
+    """Envía hasta BATCH_SIZE correos pendientes. Devuelve cuántos se enviaron."""
+    now = datetime.utcnow()
+    emails = (
+        db.query(EmailOutbox)
+        .filter(EmailOutbox.status == EmailOutboxStatus.pending, EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(BATCH_SIZE)
+        .with_for_update(skip_locked=True)  # Varios workers no toman el mismo correo
+        .all()
+    )
+
+    sent = 0
+    for email in emails:
+        try:
+            # smtplib es bloqueante: el envío no debe detener el event loop
+            await asyncio.to_thread(deliver_email, email.subject, email.to_email, email.text_body, email.html_body)
+        except Exception as exc:
+            email.attempts += 1
+            email.last_error = str(exc)
+            if email.attempts >= MAX_ATTEMPTS:
+                email.status = EmailOutboxStatus.failed
+                email.text_body = email.html_body = None
+            else:
+                email.next_attempt_at = datetime.utcnow() + timedelta(minutes=2 ** email.attempts)
+            log.warning("email_outbox_retry", email_id=email.id, attempts=email.attempts, error=str(exc))
+        else:
+            email.status = EmailOutboxStatus.sent
+            email.sent_at = datetime.utcnow()
+            email.text_body = email.html_body = None
+            sent += 1
+
+    db.commit()
+    return sent
+
+
+def purge_sent_emails(db: Session, retention_days: int = SENT_RETENTION_DAYS) -> int:
+    """Borra los correos enviados hace más de retention_days. Devuelve cuántos se borraron."""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = (
+        db.query(EmailOutbox)
+        .filter(EmailOutbox.status == EmailOutboxStatus.sent, EmailOutbox.sent_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
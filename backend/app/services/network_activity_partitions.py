@@ -0,0 +1,148 @@
+# app/services/network_activity_partitions.py
+"""
+Mantenimiento de las particiones mensuales de network_activities (PostgreSQL).
+Crea por adelantado las particiones de los próximos meses y elimina las que
+quedan fuera del período de retención con DROP TABLE, sin DELETE masivos.
+Si la partición DEFAULT ya tiene filas del mes nuevo, se mueven a la partición creada.
+"""
+from datetime import date
+from typing import List
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+log = structlog.get_logger()
+
+PARENT_TABLE = "network_activities"
+PARTITION_PREFIX = f"{PARENT_TABLE}_"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y_%m}"
+
+
+def _is_partitioned(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _existing_partitions(db: Session) -> List[str]:
+    rows = db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :parent
+            """
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    return [row[0] for row in rows]
+
+
+def _copy_columns() -> str:
+    from ..models.network_activity import NetworkActivity
+
+    # Sin las columnas generadas (total_bytes), que la BD recalcula al insertar
+    return ", ".join(column.name for column in NetworkActivity.__table__.columns if column.computed is None)
+
+
+def _create_partition(db: Session, name: str, start: date, has_default: bool) -> int:
+    """
+    Crea la partición de [start, mes siguiente) y devuelve cuántas filas trajo de la DEFAULT.
+    PostgreSQL rechaza la partición si la DEFAULT tiene filas de ese rango: se sacan
+    primero a una tabla temporal y se reinsertan por la tabla padre al final.
+    """
+    end = _add_months(start, 1)
+    bounds = {"start": start, "end": end}
+    moved = 0
+    if has_default:
+        # Nadie debe escribir en la DEFAULT mientras se vacía el rango
+        db.execute(text(f'LOCK TABLE "{DEFAULT_PARTITION}" IN ACCESS EXCLUSIVE MODE'))
+        moved = db.execute(
+            text(
+                f'SELECT count(*) FROM "{DEFAULT_PARTITION}" '
+                "WHERE timestamp >= :start AND timestamp < :end"
+            ),
+            bounds,
+        ).scalar()
+    if moved:
+        columns = _copy_columns()
+        db.execute(text(f"CREATE TEMP TABLE moved_network_activities (LIKE {PARENT_TABLE}) ON COMMIT DROP"))
+        db.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+                "WHERE timestamp >= :start AND timestamp < :end "
+                f"RETURNING {columns}) "
+                f"INSERT INTO moved_network_activities ({columns}) SELECT {columns} FROM moved"
+            ),
+            bounds,
+        )
+
+    db.execute(
+        text(
+            f'CREATE TABLE "{name}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+
+    if moved:
+        db.execute(
+            text(f"INSERT INTO {PARENT_TABLE} ({columns}) SELECT {columns} FROM moved_network_activities")
+        )
+        db.execute(text("DROP TABLE moved_network_activities"))
+    return moved
+
+
+def ensure_partitions(db: Session, months_ahead: int = 3) -> List[str]:
+    """Crea las particiones del mes actual y de los próximos months_ahead meses."""
+    if not _is_partitioned(db):
+        return []
+
+    existing = set(_existing_partitions(db))
+    current = date.today().replace(day=1)
+    created = []
+    for offset in range(months_ahead + 1):
+        start = _add_months(current, offset)
+        name = _partition_name(start)
+        if name in existing:
+            continue
+        moved = _create_partition(db, name, start, DEFAULT_PARTITION in existing)
+        if moved:
+            log.warning("Rows moved out of the default partition", partition=name, rows=moved)
+        created.append(name)
+    db.commit()
+
+    if created:
+        log.info("Network activity partitions created", partitions=created)
+    return created
+
+
+def drop_expired_partitions(db: Session, retention_months: int) -> List[str]:
+    """Elimina las particiones mensuales anteriores a los últimos retention_months meses."""
+    if not _is_partitioned(db):
+        return []
+
+    first_kept = _partition_name(_add_months(date.today().replace(day=1), -retention_months))
+    dropped = []
+    for name in sorted(_existing_partitions(db)):
+        suffix = name[len(PARTITION_PREFIX):]
+        # Solo particiones mensuales (YYYY_MM); la DEFAULT se conserva
+        if len(suffix) != 7 or not suffix.replace("_", "").isdigit():
+            continue
+        if name < first_kept:
+            db.execute(text(f'DROP TABLE "{name}"'))
+            dropped.append(name)
+    db.commit()
+
+    if dropped:
+        log.info("Network activity partitions dropped", partitions=dropped)
+    return dropped
@@ -3,11 +3,25 @@
 Servicios de integración con dispositivos de red.
 Soporta múltiples marcas: Ubiquiti, Mikrotik, Cisco, TP-Link, etc.
 """
+from importlib import import_module
+
 from .base import NetworkIntegrationBase
-from .ubiquiti import UbiquitiIntegration
-from .mikrotik import MikrotikIntegration
-from .cisco import CiscoIntegration
-from .openwrt import OpenWrtIntegration
+
+# Las integraciones concretas importan aiohttp (la mayor parte del tiempo de importación
+# de la API); se cargan al primer acceso en lugar de al arrancar.
+_LAZY_INTEGRATIONS = {
+    "UbiquitiIntegration": ".ubiquiti",
+    "MikrotikIntegration": ".mikrotik",
+    "CiscoIntegration": ".cisco",
+    "OpenWrtIntegration": ".openwrt",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_INTEGRATIONS:
+        return getattr(import_module(_LAZY_INTEGRATIONS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "NetworkIntegrationBase",
@@ -171,13 +171,6 @@ class NetworkIntegrationBase(ABC):
         self.device.last_error_message = error_message
         self.device.connection_status = ConnectionStatus.ERROR
         self.device.last_connection_attempt = datetime.utcnow()
-
-        if self.device.total_operations > 0:
-            self.device.success_rate = (
-                (self.device.total_operations - self.device.failed_operations)
-                / self.device.total_operations * 100
-            )
-
         self.db.commit()
 
     async def record_operation_success(self):
@@ -185,13 +178,6 @@ class NetworkIntegrationBase(ABC):
         Registra una operación exitosa.
         """
         self.device.total_operations += 1
-
-        if self.device.total_operations > 0:
-            self.device.success_rate = (
-                (self.device.total_operations - self.device.failed_operations)
-                / self.device.total_operations * 100
-            )
-
         self.device.connection_status = ConnectionStatus.CONNECTED
         self.device.last_successful_connection = datetime.utcnow()
         self.db.commit()
@@ -5,12 +5,14 @@ Proporciona una interfaz común para múltiples proveedores de pago.
 """
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from ..models import Payment, PaymentStatus, Currency, Invoice
+from ..models.invoice import InvoicePaymentStatus, InvoiceStatus
 from ..services.payment_validators import (
     VenezuelanMobilePaymentValidator,
     PaymentValidator,
@@ -153,14 +155,14 @@ class PaymentGatewayService:
             if invoice_id:
                 invoice = self.db.query(Invoice).filter(Invoice.id == invoice_id).first()
                 if invoice:
-                    invoice.paid_amount += amount
-                    invoice.remaining_balance = invoice.total - invoice.paid_amount
+                    # remaining_balance es una columna calculada por la BD
+                    invoice.paid_amount += Decimal(str(amount))
 
-                    if invoice.remaining_balance <= 0:
-                        invoice.status = "paid"
-                        invoice.paid_date = datetime.utcnow()
+                    if invoice.paid_amount >= invoice.total:
+                        invoice.payment_status = InvoicePaymentStatus.completed
+                        invoice.status = InvoiceStatus.paid
                     else:
-                        invoice.status = "partially_paid"
+                        invoice.payment_status = InvoicePaymentStatus.partial
 
                     self.db.add(invoice)
 
@@ -283,14 +285,14 @@ class PaymentGatewayService:
         total = query.count()
         payments = query.limit(limit).offset(offset).all()
 
-        # Calcular totales
-        total_by_status = {}
-        for status in PaymentStatus:
-            count_query = self.db.query(func.sum(Payment.amount)).filter(
-                Payment.guest_id == guest_id,
-                Payment.status == status,
-            )
-            total_by_status[status.value] = count_query.scalar() or 0
+        # Calcular totales por estado en una sola consulta
+        totals = dict(
+            self.db.query(Payment.status, func.sum(Payment.amount))
+            .filter(Payment.guest_id == guest_id)
+            .group_by(Payment.status)
+            .all()
+        )
+        total_by_status = {status.value: totals.get(status) or 0 for status in PaymentStatus}
 
         return {
             "total": total,
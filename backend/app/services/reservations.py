@@ -6,11 +6,25 @@ Centraliza validaciones y operaciones complejas.
 from datetime import date
 from typing import Optional
 
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
 from ..models.reservation import Reservation, ReservationStatus
 
 
+def overlap_clause(db: Session, start_date: date, end_date: date):
+    """
+    Condición de traslape de rangos [inicio, fin) con las reservas existentes.
+    En PostgreSQL usa daterange && para aprovechar el índice GiST de res_no_overlap;
+    en otros motores compara las fechas directamente.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return func.daterange(Reservation.start_date, Reservation.end_date, "[)").op("&&")(
+            func.daterange(start_date, end_date, "[)")
+        )
+    return and_(Reservation.start_date < end_date, Reservation.end_date > start_date)
+
+
 def check_overlap(
     db: Session, room_id: int, start_date: date, end_date: date, exclude_id: int | None = None
 ) -> Optional[Reservation]:
@@ -29,8 +43,7 @@ def check_overlap(
     """
     query = db.query(Reservation).filter(
         Reservation.room_id == room_id,
-        Reservation.start_date < end_date,
-        Reservation.end_date > start_date,
+        overlap_clause(db, start_date, end_date),
         Reservation.status.in_(
             [ReservationStatus.pending, ReservationStatus.active]
         ),  # Solo activas
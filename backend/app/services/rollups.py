@@ -0,0 +1,42 @@
+# app/services/rollups.py
+"""
+Agregados diarios de ingresos y ocupación (vistas materializadas de PostgreSQL).
+Las vistas se crean en la migración a9c1e3f5b7d0 y se refrescan periódicamente
+desde el scheduler; en otros motores no existen y los reportes consultan las tablas.
+"""
+from sqlalchemy import Date, Float, Integer, String, column, table, text
+from sqlalchemy.orm import Session
+
+ROLLUP_VIEWS = ("mv_daily_revenue", "mv_daily_occupancy")
+
+daily_revenue = table(
+    "mv_daily_revenue",
+    column("day", Date),
+    column("currency", String),
+    column("payment_count", Integer),
+    column("total_amount", Float),
+    column("total_usd", Float),
+)
+
+daily_occupancy = table(
+    "mv_daily_occupancy",
+    column("day", Date),
+    column("check_ins", Integer),
+    column("rooms_occupied", Integer),
+    column("total_paid_bs", Float),
+    column("total_paid_usd", Float),
+)
+
+
+def rollups_available(db: Session) -> bool:
+    """Las vistas materializadas solo existen en PostgreSQL."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def refresh_daily_rollups(db: Session) -> None:
+    """Refresca las vistas sin bloquear las lecturas (requiere su índice único)."""
+    if not rollups_available(db):
+        return
+    for view in ROLLUP_VIEWS:
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+    db.commit()
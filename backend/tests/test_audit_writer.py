@@ -0,0 +1,70 @@
+"""
+Tests del escritor de auditoría: reintento del lote, inserción fila por fila
+y escritura inmediata cuando el escritor no está corriendo.
+"""
+import asyncio
+
+from app.core import audit
+from app.models.audit_log import AuditLog
+
+
+class _FakeDatabase:
+    """Reemplaza _insert_rows; falla en los lotes de más de una fila o en las filas marcadas."""
+
+    def __init__(self, fail_batches: bool = False):
+        self.fail_batches = fail_batches
+        self.calls = []
+        self.saved = []
+
+    def __call__(self, rows):
+        self.calls.append(len(rows))
+        if self.fail_batches and len(rows) > 1:
+            raise RuntimeError("batch failed")
+        if any(row["action"] == "broken" for row in rows):
+            raise RuntimeError("invalid row")
+        self.saved.extend(rows)
+
+
+def _drain():
+    while not audit._pending.empty():
+        audit._pending.get_nowait()
+
+
+def test_failed_batch_is_retried_then_written_row_by_row(monkeypatch):
+    fake = _FakeDatabase(fail_batches=True)
+    monkeypatch.setattr(audit, "_insert_rows", fake)
+    monkeypatch.setattr(audit, "_writer_task", object())
+    _drain()
+
+    for action in ("create", "broken", "update"):
+        audit.log_action(action, "room", 1)
+    asyncio.run(audit.flush_audit_queue())
+
+    # Lote + reintento, y luego una inserción por fila; solo se pierde la inválida
+    assert fake.calls == [3, 3, 1, 1, 1]
+    assert [row["action"] for row in fake.saved] == ["create", "update"]
+    assert audit._pending.empty()
+
+
+def test_log_action_writes_immediately_without_writer(monkeypatch):
+    fake = _FakeDatabase()
+    monkeypatch.setattr(audit, "_insert_rows", fake)
+    monkeypatch.setattr(audit, "_writer_task", None)
+    _drain()
+
+    audit.log_action("delete", "guest", 7)
+
+    assert audit._pending.empty()
+    assert [(row["action"], row["resource_id"]) for row in fake.saved] == [("delete", 7)]
+
+
+def test_security_events_use_callers_session(monkeypatch, db_session):
+    fake = _FakeDatabase()
+    monkeypatch.setattr(audit, "_insert_rows", fake)
+
+    audit.log_login("ana@hostal.com", success=False, details={"reason": "invalid_credentials"}, db=db_session)
+    db_session.flush()
+
+    assert fake.calls == []
+    saved = db_session.query(AuditLog).filter(AuditLog.action == "login").one()
+    assert saved.success is False and "ana@hostal.com" in saved.details
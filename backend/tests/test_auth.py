@@ -1,3 +1,14 @@
+from passlib.hash import bcrypt
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.routers import auth
+from app.core.security import hash_password, password_needs_rehash
+from app.models.audit_log import AuditLog
+from app.models.user import User
+
+
 def test_login_and_me(client, seed_admin):
     r = client.post(
         "/auth/login", data={"username": "admin@hostal.com", "password": "MiClaveSegura"}
@@ -11,3 +22,41 @@ def test_login_and_me(client, seed_admin):
     me = r2.json()
     assert me["email"] == "admin@hostal.com"
     assert me["role"] == "admin"
+
+
+def test_failed_login_is_audited_before_responding(client, seed_admin, db_session):
+    r = client.post(
+        "/api/v1/auth/login", data={"username": "admin@hostal.com", "password": "incorrecta"}
+    )
+    assert r.status_code == 401, r.text
+
+    entry = db_session.query(AuditLog).filter(AuditLog.action == "login").one()
+    assert entry.success is False
+    assert "invalid_credentials" in entry.details
+
+
+def test_successful_login_is_audited_in_background(client, seed_admin, db_session, monkeypatch):
+    calls = []
+    monkeypatch.setattr(auth, "log_login", lambda **kwargs: calls.append(kwargs))
+
+    r = client.post(
+        "/api/v1/auth/login", data={"username": "admin@hostal.com", "password": "MiClaveSegura"}
+    )
+    assert r.status_code == 200, r.text
+
+    # La tarea usa su propia sesión: nada queda en la sesión del request
+    assert [(call["success"], "db" in call) for call in calls] == [(True, False)]
+    assert db_session.query(AuditLog).filter(AuditLog.action == "login").count() == 0
+
+
+def test_rehash_only_raises_bcrypt_cost():
+    assert not password_needs_rehash(hash_password("MiClaveSegura"))
+    assert not password_needs_rehash(bcrypt.using(rounds=settings.BCRYPT_ROUNDS + 2).hash("x"))
+    assert password_needs_rehash(bcrypt.using(rounds=settings.BCRYPT_ROUNDS - 1).hash("x"))
+
+
+def test_pending_users_filter_matches_partial_index():
+    index = next(i for i in User.__table__.indexes if i.name == "ix_user_pending")
+    predicate = str(index.dialect_options["postgresql"]["where"])
+    sql = str(select(User.id).where(~User.approved).compile(dialect=postgresql.dialect()))
+    assert sql.endswith(f"WHERE {predicate.replace('approved', 'users.approved')}")
@@ -0,0 +1,69 @@
+"""
+Tests de la caché de login: sin una caché compartida entre workers no se deben
+servir credenciales o roles obsoletos.
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, update
+
+from app.core.cache import TTLCache
+from app.core.security import create_access_token, get_current_user, hash_password
+from app.models.user import User
+
+
+class _UnavailableRedis:
+    def get(self, key):
+        raise ConnectionError("redis down")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("redis down")
+
+
+def test_shared_only_skips_local_fallback():
+    cache = TTLCache()
+    calls = []
+    assert cache.get_or_set("k", lambda: calls.append(1) or len(calls), 60, shared_only=True) == 1
+    assert cache.get_or_set("k", lambda: calls.append(1) or len(calls), 60, shared_only=True) == 2
+
+    cache._redis = _UnavailableRedis()
+    assert cache.get_or_set("k", lambda: calls.append(1) or len(calls), 60, shared_only=True) == 3
+    assert cache.get_or_set("k", lambda: calls.append(1) or len(calls), 60, shared_only=True) == 4
+
+
+def test_local_cache_still_used_without_shared_only():
+    cache = TTLCache()
+    assert cache.get_or_set("k", lambda: 1, 60) == 1
+    assert cache.get_or_set("k", lambda: 2, 60) == 1
+
+
+def test_login_record_sees_password_change_without_invalidation(db_session, monkeypatch):
+    monkeypatch.setattr("app.models.user.cache", TTLCache())
+    user = User(email="staff@hostal.com", role="user", approved=True, hashed_password=hash_password("old-pass"))
+    db_session.add(user)
+    db_session.flush()
+    first = User.get_login_record(db_session, "Staff@Hostal.com")
+    assert first["id"] == user.id
+
+    # Otro worker cambia la contraseña: este proceso no recibe la invalidación
+    user.hashed_password = hash_password("new-pass")
+    db_session.flush()
+    assert User.get_login_record(db_session, "staff@hostal.com")["hashed_password"] == user.hashed_password
+
+
+def test_current_user_reflects_role_and_deletion(db_session):
+    user = User(email="manager@hostal.com", role="manager", approved=True, hashed_password=hash_password("x"))
+    db_session.add(user)
+    db_session.flush()
+    token = create_access_token({"sub": str(user.id)})
+    assert get_current_user(token=token, db=db_session).role == "manager"
+
+    db_session.execute(update(User).where(User.id == user.id).values(role="user", approved=False))
+    db_session.expire_all()
+    current = get_current_user(token=token, db=db_session)
+    assert (current.role, current.approved) == ("user", False)
+
+    db_session.execute(delete(User).where(User.id == user.id))
+    db_session.expire_all()
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(token=token, db=db_session)
+    assert exc.value.status_code == 401
@@ -0,0 +1,53 @@
+"""
+Tests de la suspensión automática masiva de dispositivos.
+"""
+from app.models.device import Device
+from app.models.guest import Guest
+from app.models.occupancy import Occupancy
+from app.models.payment import Currency, Payment, PaymentMethod, PaymentStatus
+from app.models.staff import Staff, StaffRole, StaffStatus
+from app.services.devices import DeviceSuspensionReason, check_and_suspend_all_devices
+
+
+def test_bulk_suspension_sets_reasons_and_keeps_manual_flag(db_session):
+    staying = Guest(full_name="Hospedado", document_id="V-10")
+    checked_out = Guest(full_name="Se fue", document_id="V-11")
+    in_arrears = Guest(full_name="En mora", document_id="V-12")
+    inactive = Staff(full_name="Ex empleado", document_id="V-20", role=StaffRole.limpieza, status=StaffStatus.inactive)
+    db_session.add_all([staying, checked_out, in_arrears, inactive])
+    db_session.flush()
+    db_session.add_all([
+        Occupancy(room_id=1, guest_id=staying.id),
+        Occupancy(room_id=2, guest_id=in_arrears.id),
+        Payment(
+            guest_id=in_arrears.id,
+            amount=10,
+            currency=Currency.USD,
+            method=PaymentMethod.cash,
+            status=PaymentStatus.pending,
+        ),
+    ])
+    devices = {
+        "ok": Device(mac="AA:00:00:00:00:01", guest_id=staying.id),
+        "gone": Device(mac="AA:00:00:00:00:02", guest_id=checked_out.id, suspension_flags=Device.SUSPENDED_MANUAL),
+        "arrears": Device(mac="AA:00:00:00:00:03", guest_id=in_arrears.id),
+        "staff": Device(mac="AA:00:00:00:00:04", staff_id=inactive.id),
+        "stale": Device(mac="AA:00:00:00:00:05", guest_id=staying.id, suspension_flags=Device.SUSPENDED_AUTO),
+    }
+    db_session.add_all(devices.values())
+    db_session.flush()
+
+    stats = check_and_suspend_all_devices(db_session)
+
+    assert stats["errors"] == []
+    assert stats["total_checked"] == 5
+    assert stats["newly_suspended"] == 3
+    assert stats["reactivated"] == 1
+    for device in devices.values():
+        db_session.refresh(device)
+    assert not devices["ok"].auto_suspended
+    assert devices["gone"].auto_suspended and devices["gone"].suspended
+    assert devices["gone"].auto_suspension_reason == DeviceSuspensionReason.NO_ACTIVE_OCCUPANCY
+    assert devices["arrears"].auto_suspension_reason == DeviceSuspensionReason.GUEST_IN_ARREARS
+    assert devices["staff"].auto_suspension_reason == DeviceSuspensionReason.STAFF_INACTIVE
+    assert not devices["stale"].auto_suspended and devices["stale"].auto_suspension_reason is None
@@ -3,6 +3,9 @@ Tests para endpoints de dispositivos (Devices).
 """
 import pytest
 
+from app.models.device import Device
+from app.models.guest import Guest
+
 
 def test_add_device_to_guest(client, seed_admin, auth_headers):
     """Test agregar un dispositivo a un huésped."""
@@ -172,3 +175,16 @@ def test_device_cascade_delete_with_guest(client, seed_admin, auth_headers):
     # Verificar que el huésped ya no existe
     r = client.get(f"/api/v1/guests/{guest_id}", headers=auth_headers)
     assert r.status_code == 404
+
+
+def test_try_insert_returns_none_on_duplicate_mac(db_session):
+    guest = Guest(full_name="Ana", document_id="V-1")
+    db_session.add(guest)
+    db_session.flush()
+
+    device = Device.try_insert(db_session, "AA:BB:CC:DD:EE:01", guest_id=guest.id, name="Phone")
+    assert device is not None and device.id is not None
+
+    assert Device.try_insert(db_session, "AA:BB:CC:DD:EE:01", guest_id=guest.id, name="Other") is None
+    # La fila original no se modifica
+    assert db_session.query(Device).filter_by(mac="AA:BB:CC:DD:EE:01").one().name == "Phone"
@@ -0,0 +1,67 @@
+"""
+Tests de la bandeja de salida de correos: envío, reintentos, borrado del cuerpo
+(los enlaces de recuperación llevan el token) y purga de enviados.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.services import email_outbox
+from app.services.email_outbox import deliver_pending_emails, enqueue_email, purge_sent_emails
+
+
+@pytest.fixture
+def delivered(monkeypatch):
+    sent = []
+    monkeypatch.setattr(email_outbox, "deliver_email", lambda *args: sent.append(args))
+    return sent
+
+
+def _enqueue(db, body: str = "https://hostal/reset-password?token=secret") -> EmailOutbox:
+    email = enqueue_email(db, "Recupera tu contraseña", "guest@hostal.com", body, f"<a href='{body}'>")
+    db.flush()
+    email.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.flush()
+    return email
+
+
+def test_sent_email_body_is_cleared(db_session, delivered):
+    email = _enqueue(db_session)
+    assert asyncio.run(deliver_pending_emails(db_session)) == 1
+    assert delivered[0][2].endswith("token=secret")
+    assert email.status == EmailOutboxStatus.sent
+    assert (email.text_body, email.html_body) == (None, None)
+
+
+def test_failed_email_is_retried_then_discarded(db_session, monkeypatch):
+    def fail(*args):
+        raise ConnectionError("smtp down")
+
+    monkeypatch.setattr(email_outbox, "deliver_email", fail)
+    email = _enqueue(db_session)
+    assert asyncio.run(deliver_pending_emails(db_session)) == 0
+    assert email.status == EmailOutboxStatus.pending
+    assert email.attempts == 1
+    assert email.next_attempt_at > datetime.utcnow()
+    assert email.text_body is not None
+
+    email.attempts = email_outbox.MAX_ATTEMPTS - 1
+    email.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db_session.flush()
+    asyncio.run(deliver_pending_emails(db_session))
+    assert email.status == EmailOutboxStatus.failed
+    assert (email.text_body, email.html_body) == (None, None)
+
+
+def test_purge_only_old_sent_emails(db_session, delivered):
+    old, recent, pending = _enqueue(db_session), _enqueue(db_session), _enqueue(db_session)
+    asyncio.run(deliver_pending_emails(db_session))
+    pending.status = EmailOutboxStatus.pending
+    old.sent_at = datetime.utcnow() - timedelta(days=email_outbox.SENT_RETENTION_DAYS + 1)
+    db_session.flush()
+
+    assert purge_sent_emails(db_session) == 1
+    remaining = {e.id for e in db_session.query(EmailOutbox)}
+    assert remaining == {recent.id, pending.id}
@@ -0,0 +1,35 @@
+"""
+Tests de la caché de tasas de cambio: sin Redis la copia de cada proceso solo
+puede quedar obsoleta RATE_LOCAL_CACHE_TTL segundos.
+"""
+from app.core.cache import TTLCache
+from app.models import exchange_rate
+from app.models.exchange_rate import RATE_LOCAL_CACHE_TTL, ExchangeRate
+
+
+def test_local_ttl_bounds_process_copy(monkeypatch):
+    cache = TTLCache()
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    assert cache.get_or_set("rate", lambda: 1, 300, local_ttl=30) == 1
+    now[0] += 29
+    assert cache.get_or_set("rate", lambda: 2, 300, local_ttl=30) == 1
+    now[0] += 2
+    assert cache.get_or_set("rate", lambda: 3, 300, local_ttl=30) == 3
+
+
+def test_rate_changed_by_another_worker_expires_locally(db_session, monkeypatch):
+    monkeypatch.setattr(exchange_rate, "cache", TTLCache())
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    rate = ExchangeRate(from_currency="USD", to_currency="VES", rate=36.5)
+    db_session.add(rate)
+    db_session.flush()
+    assert ExchangeRate.get_latest_rate(db_session, "USD", "VES") == 36.5
+
+    # Otro worker guarda una tasa nueva: su invalidación no llega a este proceso
+    rate.rate = 40.0
+    db_session.flush()
+    assert ExchangeRate.get_latest_rate(db_session, "USD", "VES") == 36.5
+    now[0] += RATE_LOCAL_CACHE_TTL + 1
+    assert ExchangeRate.get_latest_rate(db_session, "USD", "VES") == 40.0
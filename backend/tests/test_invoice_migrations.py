@@ -0,0 +1,119 @@
+"""
+Tests de la cadena de migraciones de facturas desde el diseño de phase1.
+Necesita PostgreSQL: defina TEST_POSTGRES_URL para ejecutarlo. Las migraciones
+se aplican en un esquema propio que se borra al terminar.
+"""
+import os
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+SCHEMA = "invoice_migration_test"
+
+pytestmark = pytest.mark.skipif(not TEST_POSTGRES_URL, reason="requiere PostgreSQL (TEST_POSTGRES_URL)")
+
+
+@pytest.fixture
+def alembic_config(monkeypatch):
+    engine = create_engine(TEST_POSTGRES_URL)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+    # libpq aplica PGOPTIONS a cada conexión, también a las que abre alembic/env.py
+    monkeypatch.setenv("PGOPTIONS", f"-c search_path={SCHEMA},public")
+    monkeypatch.setattr(settings, "DATABASE_URL", TEST_POSTGRES_URL)
+    config = Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
+    config.set_main_option("script_location", str(Path(__file__).resolve().parents[1] / "alembic"))
+
+    yield config, engine
+
+    monkeypatch.delenv("PGOPTIONS")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    engine.dispose()
+
+
+def _insert_legacy_invoices(conn):
+    conn.execute(text("INSERT INTO guests (id, full_name, document_id) VALUES (1, 'Ana Pérez', 'V123')"))
+    conn.execute(
+        text(
+            """
+            INSERT INTO invoices (
+                id, guest_id, invoice_number, issue_date, due_date, subtotal, tax_amount,
+                total, paid_amount, remaining_balance, status, created_at, updated_at
+            ) VALUES
+                (1, 1, 'FAC-0001', '2024-03-01 10:00', '2024-03-31', 100, 16, 116, 116, 0, 'paid', now(), now()),
+                (2, 1, 'FAC-0002', '2024-03-02 10:00', '2024-04-01', 50, 8, 58, 20, 38, 'partially_paid', now(), now()),
+                (3, 1, 'FAC-0003', '2024-03-03 10:00', '2024-04-02', 10, 1.6, 11.6, 0, 11.6, 'draft', now(), now()),
+                (4, 1, 'FAC-0004', '2024-03-04 10:00', '2024-04-03', 10, 1.6, 11.6, 0, 11.6, 'refunded', now(), now())
+            """
+        )
+    )
+    conn.execute(
+        text(
+            """
+            INSERT INTO invoice_line_items (invoice_id, description, quantity, unit_price, total_price, created_at)
+            VALUES (1, 'Noche', 2, 50, 100, now()), (1, 'Desayuno', 1, 0, 0, now())
+            """
+        )
+    )
+    conn.execute(
+        text(
+            """
+            INSERT INTO invoice_payments (invoice_id, amount_paid, payment_date, payment_method, created_at)
+            VALUES (1, 116, '2024-03-05', 'cash', now())
+            """
+        )
+    )
+
+
+def test_upgrade_to_head_from_phase1_schema(alembic_config):
+    config, engine = alembic_config
+    command.upgrade(config, "01884bd090e7")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"SET LOCAL search_path TO {SCHEMA},public")
+        _insert_legacy_invoices(conn)
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"SET search_path TO {SCHEMA},public")
+        rows = conn.execute(
+            text(
+                "SELECT id, invoice_number, invoice_series, status, payment_status::text, "
+                "issued_at IS NOT NULL, internal_reference, remaining_balance "
+                "FROM invoices ORDER BY id"
+            )
+        ).all()
+        lines = conn.execute(text("SELECT line_order, line_total FROM invoice_lines ORDER BY line_order")).all()
+        payment = conn.execute(text("SELECT amount FROM invoice_payments")).scalar_one()
+
+    # Códigos SMALLINT: 0 draft, 1 issued, 2 cancelled, 3 paid
+    assert [(r[0], r[1], r[2], r[3], r[4], r[5]) for r in rows] == [
+        (1, 1, "A", 3, "completed", True),
+        (2, 2, "A", 1, "partial", True),
+        (3, 3, "A", 0, "pending", False),
+        (4, 4, "A", 2, "pending", True),
+    ]
+    assert [r[6] for r in rows] == ["FAC-0001", "FAC-0002", "FAC-0003", "FAC-0004"]
+    assert [float(r[7]) for r in rows] == [0.0, 38.0, 11.6, 11.6]
+    assert [(order, float(total)) for order, total in lines] == [(0, 100.0), (1, 0.0)]
+    assert float(payment) == 116.0
+
+    # El retorno al diseño anterior restaura el número y los estados originales
+    command.downgrade(config, "01884bd090e7")
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"SET search_path TO {SCHEMA},public")
+        restored = conn.execute(text("SELECT invoice_number, status::text FROM invoices ORDER BY id")).all()
+    assert restored == [
+        ("FAC-0001", "paid"),
+        ("FAC-0002", "partially_paid"),
+        ("FAC-0003", "draft"),
+        ("FAC-0004", "refunded"),
+    ]
@@ -0,0 +1,48 @@
+"""
+Tests de la numeración secuencial de facturas por serie.
+"""
+from datetime import date
+
+from app.models.invoice import Invoice, InvoiceConfiguration
+from app.routers.invoices import get_next_invoice_number
+
+
+def _config(db, series: str = "A", next_number: int = 1) -> InvoiceConfiguration:
+    config = InvoiceConfiguration(
+        company_name="Hostal", company_rif=f"J{series}12345678", address="Calle 1",
+        city="Caracas", state="DC", invoice_series=series, next_invoice_number=next_number,
+    )
+    db.add(config)
+    db.flush()
+    return config
+
+
+def _invoice(db, number: int, series: str = "A") -> None:
+    db.add(Invoice(
+        control_number=f"{series}{number:09d}", invoice_number=number, invoice_series=series,
+        client_name="Cliente", subtotal=100, taxable_amount=100, tax_amount=16, total=116,
+        invoice_date=date(2026, 1, 1),
+    ))
+    db.flush()
+
+
+def test_numbers_follow_configured_counter(db_session):
+    config = _config(db_session, next_number=100)
+    assert get_next_invoice_number(db_session, config) == 100
+    assert get_next_invoice_number(db_session, config) == 101
+    assert config.next_invoice_number == 102
+
+
+def test_skips_numbers_already_issued_in_series(db_session):
+    # Facturas con número explícito, como las del generador de datos de prueba
+    config = _config(db_session)
+    for number in (1, 2, 3):
+        _invoice(db_session, number)
+    assert get_next_invoice_number(db_session, config) == 4
+    assert config.next_invoice_number == 5
+
+
+def test_series_are_numbered_independently(db_session):
+    _invoice(db_session, 50, series="A")
+    config_b = _config(db_session, series="B", next_number=7)
+    assert get_next_invoice_number(db_session, config_b) == 7
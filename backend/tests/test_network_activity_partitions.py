@@ -0,0 +1,116 @@
+"""
+Tests del mantenimiento de particiones de network_activities.
+El caso real necesita PostgreSQL: defina TEST_POSTGRES_URL para ejecutarlo.
+"""
+import os
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services import network_activity_partitions as partitions
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+class _RecordingSession:
+    """Sesión falsa de PostgreSQL: registra el SQL y simula filas del mes en la DEFAULT."""
+
+    def __init__(self, rows_in_default: int):
+        self.rows_in_default = rows_in_default
+        self.statements = []
+
+    def get_bind(self):
+        return self
+
+    @property
+    def dialect(self):
+        return self
+
+    name = "postgresql"
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "pg_inherits" in sql:
+            return [(partitions.DEFAULT_PARTITION,)]
+        if sql.startswith("SELECT count(*)"):
+            return _Scalar(self.rows_in_default)
+        return None
+
+    def commit(self):
+        self.statements.append("COMMIT")
+
+
+class _Scalar:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+def _position(statements, prefix):
+    return next(i for i, sql in enumerate(statements) if sql.startswith(prefix))
+
+
+def test_rows_in_default_are_moved_before_creating_partition():
+    db = _RecordingSession(rows_in_default=5)
+    created = partitions.ensure_partitions(db, months_ahead=0)
+
+    assert created == [partitions._partition_name(date.today().replace(day=1))]
+    statements = db.statements
+    assert _position(statements, "LOCK TABLE") < _position(statements, "WITH moved AS (DELETE")
+    assert _position(statements, "WITH moved AS (DELETE") < _position(statements, "CREATE TABLE")
+    assert _position(statements, "CREATE TABLE") < _position(statements, "INSERT INTO network_activities")
+    # total_bytes es generada: no se copia
+    assert "total_bytes" not in statements[_position(statements, "INSERT INTO network_activities")]
+
+
+def test_empty_default_only_creates_partition():
+    db = _RecordingSession(rows_in_default=0)
+    partitions.ensure_partitions(db, months_ahead=0)
+
+    assert not any(sql.startswith(("WITH moved", "INSERT", "CREATE TEMP")) for sql in db.statements)
+
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="requiere PostgreSQL (TEST_POSTGRES_URL)")
+def test_partition_created_when_default_has_rows_in_range():
+    engine = create_engine(TEST_POSTGRES_URL)
+    with engine.connect() as conn:
+        trans = conn.begin()
+        conn.exec_driver_sql("CREATE SCHEMA partition_test")
+        conn.exec_driver_sql("SET LOCAL search_path TO partition_test")
+        conn.exec_driver_sql(
+            """
+            CREATE TABLE network_activities (
+                id bigint NOT NULL, device_id integer NOT NULL, guest_id integer NOT NULL,
+                activity_type varchar(14) NOT NULL, timestamp timestamp NOT NULL,
+                ip_address varchar(45), bytes_downloaded bigint, bytes_uploaded bigint,
+                total_bytes bigint GENERATED ALWAYS AS (COALESCE(bytes_downloaded, 0) + COALESCE(bytes_uploaded, 0)) STORED,
+                session_duration_seconds integer, initiated_by_system boolean, notes varchar(500),
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp)
+            """
+        )
+        conn.exec_driver_sql("CREATE TABLE network_activities_default PARTITION OF network_activities DEFAULT")
+        month = date.today().replace(day=1)
+        conn.execute(
+            text(
+                "INSERT INTO network_activities "
+                "(id, device_id, guest_id, activity_type, timestamp, bytes_downloaded, bytes_uploaded) "
+                "VALUES (1, 1, 1, 'DATA_USAGE', :ts, 10, 5)"
+            ),
+            {"ts": datetime(month.year, month.month, 2)},
+        )
+
+        with Session(bind=conn, join_transaction_mode="create_savepoint") as db:
+            created = partitions.ensure_partitions(db, months_ahead=0)
+
+        name = partitions._partition_name(month)
+        assert created == [name]
+        assert conn.exec_driver_sql("SELECT count(*) FROM network_activities_default").scalar() == 0
+        assert conn.exec_driver_sql(f'SELECT total_bytes FROM "{name}"').scalar() == 15
+        trans.rollback()
+    engine.dispose()
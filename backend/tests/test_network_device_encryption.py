@@ -0,0 +1,89 @@
+"""
+Tests del cifrado con pgcrypto de las credenciales de dispositivos de red.
+El ida y vuelta real necesita PostgreSQL: defina TEST_POSTGRES_URL para ejecutarlo.
+"""
+import os
+
+import pytest
+from sqlalchemy import String, create_engine, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import install_encryption_key
+from app.models.network_device import AuthType, DeviceBrand, DeviceType, NetworkDevice
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+def _device(**fields) -> NetworkDevice:
+    return NetworkDevice(
+        name="Core switch",
+        brand=DeviceBrand.MIKROTIK,
+        device_type=DeviceType.SWITCH,
+        ip_address="10.0.0.2",
+        auth_type=AuthType.USERNAME_PASSWORD,
+        username="admin",
+        **fields,
+    )
+
+
+def test_encrypt_binds_text_and_reads_key_from_session():
+    compiled = insert(NetworkDevice).compile(
+        dialect=postgresql.dialect(), column_keys=["name", "api_key"]
+    )
+    sql = str(compiled)
+    assert "pgp_sym_encrypt(%(api_key)s, current_setting(" in sql
+    # Se envía como text: pgp_sym_encrypt no acepta bytea como primer argumento
+    assert isinstance(compiled.binds["api_key"].type, String)
+    assert (settings.DB_ENCRYPTION_KEY or settings.SECRET_KEY) not in sql
+    assert "app.encryption_key" in compiled.construct_params({"name": "sw", "api_key": "x"}).values()
+
+
+def test_decrypt_on_select():
+    sql = str(select(NetworkDevice.password).compile(dialect=postgresql.dialect()))
+    assert "pgp_sym_decrypt(network_devices.password, current_setting(" in sql
+    assert (settings.DB_ENCRYPTION_KEY or settings.SECRET_KEY) not in sql
+
+
+def test_sqlite_stores_plain_text(db_session):
+    device = _device(password="s3cret")
+    db_session.add(device)
+    db_session.flush()
+    db_session.expire(device)
+    assert device.password == "s3cret"
+
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="requiere PostgreSQL con pgcrypto (TEST_POSTGRES_URL)")
+def test_pgcrypto_round_trip():
+    engine = create_engine(TEST_POSTGRES_URL)
+    install_encryption_key(engine)
+    with engine.connect() as conn:
+        trans = conn.begin()
+        conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+        NetworkDevice.__table__.create(conn, checkfirst=True)
+        with Session(bind=conn) as db:
+            device = _device(password="s3cret", api_key="k" * 400)
+            db.add(device)
+            db.flush()
+            raw = conn.exec_driver_sql(
+                "SELECT password FROM network_devices WHERE id = %s", (device.id,)
+            ).scalar_one()
+            assert b"s3cret" not in bytes(raw)
+
+            db.expire(device)
+            assert device.password == "s3cret"
+            assert device.api_key == "k" * 400
+
+            device.password = "changed"
+            db.flush()
+            db.expire(device)
+            assert device.password == "changed"
+        trans.rollback()
+
+        # La clave es local a la transacción: no queda en la conexión (PgBouncer)
+        cursor = conn.connection.dbapi_connection.cursor()
+        cursor.execute("SELECT current_setting('app.encryption_key', true)")
+        assert cursor.fetchone()[0] in (None, "")
+        cursor.close()
+    engine.dispose()
@@ -0,0 +1,55 @@
+"""
+Tests del resumen de ocupación: con el agregado diario materializado los días
+cerrados salen de mv_daily_occupancy y el día en curso de occupancies.
+"""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.models.occupancy import Occupancy
+from app.routers import occupancy as occupancy_router
+
+
+def _occupancy(check_in: datetime, bs: float, usd: float, check_out: datetime | None = None) -> Occupancy:
+    return Occupancy(
+        room_id=1, guest_id=1, check_in=check_in, check_out=check_out, amount_paid_bs=bs, amount_paid_usd=usd
+    )
+
+
+def test_stats_without_rollups_sum_all_occupancies(db_session):
+    yesterday = datetime.combine(date.today() - timedelta(days=1), datetime.min.time())
+    db_session.add_all([
+        _occupancy(yesterday, 100, 10, check_out=yesterday + timedelta(hours=5)),
+        _occupancy(datetime.now(), 50, 5),
+    ])
+    db_session.flush()
+
+    stats = occupancy_router.get_occupancy_stats(db=db_session)
+
+    assert stats["total_occupancies"] == 2
+    assert stats["active_occupancies"] == 1
+    assert stats["revenue"] == {"total_bs": 150.0, "total_usd": 15.0}
+
+
+def test_stats_read_closed_days_from_rollup(db_session, monkeypatch):
+    monkeypatch.setattr(occupancy_router, "rollups_available", lambda db: True)
+    db_session.execute(
+        text(
+            "CREATE TEMP TABLE mv_daily_occupancy "
+            "(day DATE, check_ins INTEGER, rooms_occupied INTEGER, total_paid_bs FLOAT, total_paid_usd FLOAT)"
+        )
+    )
+    db_session.execute(
+        text("INSERT INTO mv_daily_occupancy VALUES (:day, 3, 2, 300.0, 30.0)"),
+        {"day": date.today() - timedelta(days=1)},
+    )
+    # Fila de un día cerrado que el agregado ya incluye: no se vuelve a sumar
+    yesterday = datetime.combine(date.today() - timedelta(days=1), datetime.min.time())
+    db_session.add_all([_occupancy(yesterday, 999, 99), _occupancy(datetime.now(), 50, 5)])
+    db_session.flush()
+
+    stats = occupancy_router.get_occupancy_stats(db=db_session)
+
+    assert stats["total_occupancies"] == 4
+    assert stats["revenue"] == {"total_bs": 350.0, "total_usd": 35.0}
+    db_session.execute(text("DROP TABLE mv_daily_occupancy"))
@@ -0,0 +1,77 @@
+"""
+Tests de la restricción res_no_overlap (reservas solapadas en la misma habitación).
+La restricción real necesita PostgreSQL con btree_gist: defina TEST_POSTGRES_URL.
+"""
+import os
+from collections import defaultdict
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import AddConstraint
+
+from app.core.db import Base
+from app.models.reservation import Period, Reservation, ReservationStatus
+from app.services.backup import BackupService
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+BLOCKING = (ReservationStatus.pending, ReservationStatus.active)
+
+
+def test_exclusion_constraint_ddl():
+    constraint = next(c for c in Reservation.__table__.constraints if c.name == "res_no_overlap")
+    ddl = str(AddConstraint(constraint).compile(dialect=postgresql.dialect()))
+    assert "EXCLUDE USING gist (room_id WITH =, daterange(start_date, end_date, '[)') WITH &&)" in ddl
+    assert "WHERE (status IN ('pending', 'active'))" in ddl
+
+
+def test_generated_reservations_do_not_overlap(db_session):
+    BackupService.generate_test_data(db_session, 20)
+    ranges = defaultdict(list)
+    for res in db_session.query(Reservation).filter(Reservation.status.in_(BLOCKING)):
+        ranges[res.room_id].append((res.start_date, res.end_date))
+    assert ranges
+    for room_ranges in ranges.values():
+        room_ranges.sort()
+        for (_, end), (next_start, _) in zip(room_ranges, room_ranges[1:]):
+            assert end <= next_start
+
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="requiere PostgreSQL con btree_gist (TEST_POSTGRES_URL)")
+def test_overlapping_reservation_rejected():
+    engine = create_engine(TEST_POSTGRES_URL)
+    with engine.connect() as conn:
+        trans = conn.begin()
+        conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        Base.metadata.create_all(conn)
+        with Session(bind=conn) as db:
+            BackupService.generate_test_data(db, 5)
+            # La que termina más tarde: nada vigente empieza después en su habitación
+            existing = (
+                db.query(Reservation)
+                .filter(Reservation.status.in_(BLOCKING))
+                .order_by(Reservation.end_date.desc())
+                .first()
+            )
+
+            def clone(start: date, end: date, status=ReservationStatus.pending) -> Reservation:
+                return Reservation(
+                    guest_id=existing.guest_id, room_id=existing.room_id, start_date=start,
+                    end_date=end, period=Period.day, periods_count=1, price_bs=100, status=status,
+                )
+
+            # Salida y entrada el mismo día, o reservas canceladas: permitidas
+            db.add(clone(existing.end_date, existing.end_date.replace(year=existing.end_date.year + 1)))
+            db.add(clone(existing.start_date, existing.end_date, ReservationStatus.cancelled))
+            db.flush()
+
+            db.add(clone(existing.start_date, existing.end_date))
+            with pytest.raises(IntegrityError) as exc:
+                db.flush()
+            assert exc.value.orig.diag.constraint_name == "res_no_overlap"
+        trans.rollback()
+    engine.dispose()
@@ -0,0 +1,55 @@
+"""
+Tests del webhook de Stripe: cada event_id se registra una sola vez y los
+reintentos de Stripe responden duplicate.
+"""
+import hashlib
+import hmac
+import json
+import time
+
+from app.core.config import settings
+from app.models.stripe_webhook_event import StripeWebhookEvent, StripeWebhookLog
+
+SECRET = "whsec_test"
+
+
+def _post_event(client, event: dict):
+    payload = json.dumps(event).encode()
+    timestamp = str(int(time.time()))
+    signature = hmac.new(SECRET.encode(), timestamp.encode() + b"." + payload, hashlib.sha256).hexdigest()
+    return client.post(
+        "/api/v1/webhooks/stripe",
+        content=payload,
+        headers={"Stripe-Signature": f"t={timestamp},v1={signature}", "Content-Type": "application/json"},
+    )
+
+
+def test_duplicate_delivery_is_stored_once(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "STRIPE_WEBHOOK_SECRET", SECRET)
+    event = {
+        "id": "evt_test_1",
+        "type": "payment_intent.succeeded",
+        "created": int(time.time()),
+        "data": {"object": {"id": "pi_123", "amount": 5000, "currency": "usd"}},
+    }
+
+    first = _post_event(client, event)
+    assert first.status_code == 200, first.text
+    assert "id" in first.json()
+
+    second = _post_event(client, event)
+    assert second.status_code == 200, second.text
+    assert second.json() == {"received": True, "duplicate": True}
+
+    stored = db_session.query(StripeWebhookEvent).filter_by(event_id="evt_test_1").one()
+    assert stored.payment_intent_id == "pi_123" and stored.currency == "USD"
+    # Las trazas solo se escriben con la primera entrega
+    assert db_session.query(StripeWebhookLog).filter_by(webhook_event_id=stored.id).count() == 3
+
+
+def test_invalid_signature_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(settings, "STRIPE_WEBHOOK_SECRET", SECRET)
+    r = client.post(
+        "/api/v1/webhooks/stripe", content=b"{}", headers={"Stripe-Signature": "t=1,v1=bad"}
+    )
+    assert r.status_code == 400